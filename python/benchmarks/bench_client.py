@@ -0,0 +1,316 @@
+"""
+End-to-end benchmark of Earth2Client against a local mock Earth2 API.
+
+Starts benchmarks/mock_server.py in a subprocess (so the server doesn't
+compete with the client for the GIL) and replays one mixed workload of
+property, marketplace, resources, leaderboard and user lookups in each
+mode:
+
+    raw       plain httpx.Client GETs of the same URLs (the baseline)
+    sync      one Earth2Client, one call at a time
+    threaded  one Earth2Client shared by --threads worker threads
+    async     one AsyncEarth2Client with --concurrency calls in flight
+
+A share of the calls (--repeat-ratio) repeat an earlier one, so the
+wrapper's cache is exercised. Rate limits are raised out of the way; 429s
+injected by the server (--error-rate) are retried with a short backoff.
+Each mode reports throughput, p50 / p99 call latency, cache hit rate,
+retries and failures, and peak traced memory (from a second, traced run).
+Results are printed and written as JSON for regression tracking:
+
+    python benchmarks/bench_client.py --requests 2000 --latency 0.005 --output results.json
+"""
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import re
+import subprocess
+import sys
+import time
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+import httpx
+
+from common import unthrottled_limiter
+from earth2_api_wrapper import AsyncEarth2Client, Earth2Client
+from earth2_api_wrapper.retry import RetryPolicy
+from mock_server import AsyncRewriteTransport, RewriteTransport
+
+MODES = ("raw", "sync", "threaded", "async")
+
+# Client method, its keyword arguments and the URL the call requests
+Call = Tuple[str, Dict[str, Any], str]
+
+
+def _property_call(rng: random.Random) -> Call:
+    property_id = f"prop-{rng.randint(1, 1_000_000)}"
+    return "get_property", {"property_id": property_id}, f"https://r.earth2.io/landfields/{property_id}"
+
+
+def _market_call(rng: random.Random) -> Call:
+    country, page = rng.choice(("AU", "US", "GB", "DE")), rng.randint(1, 20)
+    return (
+        "search_market",
+        {"country": country, "page": page},
+        f"https://r.earth2.io/marketplace?country={country}&page={page}&items=100",
+    )
+
+
+def _resources_call(rng: random.Random) -> Call:
+    property_id = f"prop-{rng.randint(1, 1_000_000)}"
+    return (
+        "get_resources",
+        {"property_id": property_id},
+        f"https://resources.earth2.io/v1/landfields/{property_id}/resources",
+    )
+
+
+def _leaderboard_call(rng: random.Random) -> Call:
+    page = rng.randint(1, 50)
+    return "get_leaderboard_players", {"page": page}, f"https://r.earth2.io/leaderboards/players?page={page}"
+
+
+def _user_call(rng: random.Random) -> Call:
+    user_id = f"user-{rng.randint(1, 1_000_000)}"
+    return "get_user_info", {"user_id": user_id}, f"https://app.earth2.io/api/v2/user_info/{user_id}"
+
+
+CALL_MIX: List[Tuple[int, Callable[[random.Random], Call]]] = [
+    (40, _property_call),
+    (25, _market_call),
+    (15, _resources_call),
+    (10, _leaderboard_call),
+    (10, _user_call),
+]
+
+
+def workload(requests: int, repeat_ratio: float, seed: int) -> List[Call]:
+    """requests calls drawn from CALL_MIX; repeat_ratio of them repeat an earlier call."""
+    rng = random.Random(seed)
+    weights = [weight for weight, _ in CALL_MIX]
+    makers = [maker for _, maker in CALL_MIX]
+    calls: List[Call] = []
+    for _ in range(requests):
+        if calls and rng.random() < repeat_ratio:
+            calls.append(rng.choice(calls))
+        else:
+            calls.append(rng.choices(makers, weights)[0](rng))
+    return calls
+
+
+def _retry_policy() -> RetryPolicy:
+    # Short backoff so injected 429s measure the retry path, not sleep time
+    return RetryPolicy(max_attempts=5, base_delay=0.005, max_delay=0.05, budget=10)
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(fraction * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+def _timed(call: Callable[[], Any], latencies: List[float]) -> bool:
+    start = time.perf_counter()
+    try:
+        call()
+        return True
+    except Exception:
+        return False
+    finally:
+        latencies.append(time.perf_counter() - start)
+
+
+def _run_raw(base_url: str, calls: List[Call], options: argparse.Namespace) -> Tuple[List[float], int, Dict]:
+    latencies: List[float] = []
+    failures = 0
+    with httpx.Client(transport=RewriteTransport(base_url, httpx.HTTPTransport())) as client:
+        for _, _, url in calls:
+            ok = _timed(lambda: client.get(url).raise_for_status().json(), latencies)
+            failures += not ok
+    return latencies, failures, {}
+
+
+def _run_sync(base_url: str, calls: List[Call], options: argparse.Namespace) -> Tuple[List[float], int, Dict]:
+    limiter = unthrottled_limiter(len(calls))
+    http_client = httpx.Client(transport=RewriteTransport(base_url, httpx.HTTPTransport()))
+    latencies: List[float] = []
+    failures = 0
+    with Earth2Client(client=http_client, rate_limiter=limiter, retry_policy=_retry_policy()) as client:
+        for method, kwargs, _ in calls:
+            ok = _timed(lambda: getattr(client, method)(**kwargs), latencies)
+            failures += not ok
+        return latencies, failures, client.get_rate_limit_stats()
+
+
+def _run_threaded(base_url: str, calls: List[Call], options: argparse.Namespace) -> Tuple[List[float], int, Dict]:
+    limiter = unthrottled_limiter(len(calls))
+    transport = RewriteTransport(base_url, httpx.HTTPTransport(limits=httpx.Limits(max_connections=options.threads)))
+    latencies: List[float] = []
+
+    with Earth2Client(client=httpx.Client(transport=transport), rate_limiter=limiter,
+                      retry_policy=_retry_policy()) as client:
+        def run(call: Call) -> bool:
+            method, kwargs, _ = call
+            return _timed(lambda: getattr(client, method)(**kwargs), latencies)
+
+        with ThreadPoolExecutor(max_workers=options.threads) as executor:
+            outcomes = list(executor.map(run, calls))
+        return latencies, outcomes.count(False), client.get_rate_limit_stats()
+
+
+def _run_async(base_url: str, calls: List[Call], options: argparse.Namespace) -> Tuple[List[float], int, Dict]:
+    async def main() -> Tuple[List[float], int, Dict]:
+        limiter = unthrottled_limiter(len(calls))
+        transport = AsyncRewriteTransport(
+            base_url, httpx.AsyncHTTPTransport(limits=httpx.Limits(max_connections=options.concurrency))
+        )
+        client = AsyncEarth2Client(
+            client=httpx.AsyncClient(transport=transport), rate_limiter=limiter, retry_policy=_retry_policy()
+        )
+        semaphore = asyncio.Semaphore(options.concurrency)
+        latencies: List[float] = []
+
+        async def run(call: Call) -> bool:
+            method, kwargs, _ = call
+            async with semaphore:
+                start = time.perf_counter()
+                try:
+                    await getattr(client, method)(**kwargs)
+                    return True
+                except Exception:
+                    return False
+                finally:
+                    latencies.append(time.perf_counter() - start)
+
+        try:
+            outcomes = await asyncio.gather(*(run(call) for call in calls))
+        finally:
+            await client.aclose()
+        return latencies, outcomes.count(False), client.get_rate_limit_stats()
+
+    return asyncio.run(main())
+
+
+RUNNERS = {
+    "raw": _run_raw,
+    "sync": _run_sync,
+    "threaded": _run_threaded,
+    "async": _run_async,
+}
+
+
+def run_mode(mode: str, base_url: str, calls: List[Call], options: argparse.Namespace) -> Dict[str, Any]:
+    runner = RUNNERS[mode]
+    start = time.perf_counter()
+    latencies, failures, stats = runner(base_url, calls, options)
+    elapsed = time.perf_counter() - start
+
+    # Memory is measured on a separate run so tracing doesn't skew the timings
+    tracemalloc.start()
+    runner(base_url, calls, options)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    hits, misses = stats.get("cache_hits", 0), stats.get("cache_misses", 0)
+    return {
+        "mode": mode,
+        "requests": len(calls),
+        "seconds": elapsed,
+        "calls_per_sec": len(calls) / elapsed,
+        "p50_ms": _percentile(latencies, 0.50) * 1000,
+        "p99_ms": _percentile(latencies, 0.99) * 1000,
+        "cache_hit_rate": hits / (hits + misses) if hits + misses else None,
+        "network_requests": stats.get("total_requests", len(calls)),
+        "retried_requests": stats.get("retried_requests", 0),
+        "failures": failures,
+        "peak_kib": peak / 1024,
+    }
+
+
+def start_server(options: argparse.Namespace) -> Tuple[subprocess.Popen, str]:
+    """Run mock_server.py in a subprocess on a free port; returns it and its base URL."""
+    process = subprocess.Popen(
+        [
+            sys.executable, str(Path(__file__).with_name("mock_server.py")),
+            "--port", "0",
+            "--latency", str(options.latency),
+            "--market-items", str(options.market_items),
+            "--error-rate", str(options.error_rate),
+        ],
+        stdout=subprocess.PIPE,
+        text=True,
+    )
+    assert process.stdout is not None
+    match = re.search(r"http://[\d.]+:\d+", process.stdout.readline())
+    if match is None:
+        process.kill()
+        raise RuntimeError("mock server failed to start")
+    return process, match.group(0)
+
+
+def _package_version() -> str:
+    try:
+        return version("earth2-api-wrapper")
+    except PackageNotFoundError:
+        return "unknown"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--requests", type=int, default=2_000, help="calls per mode")
+    parser.add_argument("--threads", type=int, default=16, help="worker threads in threaded mode")
+    parser.add_argument("--concurrency", type=int, default=32, help="calls in flight in async mode")
+    parser.add_argument("--repeat-ratio", type=float, default=0.3, help="share of calls repeating an earlier one")
+    parser.add_argument("--latency", type=float, default=0.002, help="server delay per response (seconds)")
+    parser.add_argument("--market-items", type=int, default=100, help="listings per marketplace page")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of responses that are 429s")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--output", type=Path, default=Path("bench_client.json"), help="JSON results file")
+    options = parser.parse_args()
+
+    calls = workload(options.requests, options.repeat_ratio, options.seed)
+    process, base_url = start_server(options)
+    try:
+        results = []
+        print(
+            f"{'mode':<10}{'calls/sec':>11}{'p50 ms':>9}{'p99 ms':>9}{'cache hit':>11}"
+            f"{'network':>9}{'retried':>9}{'failed':>8}{'peak KiB':>11}"
+        )
+        for mode in options.modes:
+            result = run_mode(mode, base_url, calls, options)
+            results.append(result)
+            hit_rate = "-" if result["cache_hit_rate"] is None else f"{result['cache_hit_rate']:.0%}"
+            print(
+                f"{mode:<10}{result['calls_per_sec']:>11,.0f}{result['p50_ms']:>9.2f}{result['p99_ms']:>9.2f}"
+                f"{hit_rate:>11}{result['network_requests']:>9,}{result['retried_requests']:>9,}"
+                f"{result['failures']:>8,}{result['peak_kib']:>11,.0f}"
+            )
+    finally:
+        process.terminate()
+        process.wait()
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "package_version": _package_version(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "options": {key: str(value) if isinstance(value, Path) else value for key, value in vars(options).items()},
+        "results": results,
+    }
+    options.output.write_text(json.dumps(report, indent=2))
+    print(f"\nResults written to {options.output}")
+
+
+if __name__ == "__main__":
+    main()
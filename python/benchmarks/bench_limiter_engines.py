@@ -0,0 +1,63 @@
+"""
+Micro-benchmark of the RateLimiter engines.
+
+Runs check + record cycles against one endpoint with limits raised high enough
+that nothing is blocked, so every request stays inside the 60 second window.
+The sliding window engine keeps one timestamp per request in that window while
+GCRA keeps a single float per key.
+
+    python benchmarks/bench_limiter_engines.py [--requests 1000 10000 100000]
+"""
+
+import argparse
+import time
+import tracemalloc
+from typing import Dict
+
+from common import unthrottled_limiter
+from earth2_api_wrapper.limiter_engines import ENGINES
+
+URL = "https://r.earth2.io/landfields/00000000-0000-0000-0000-000000000000"
+
+
+def run(engine: str, requests: int) -> Dict[str, float]:
+    limiter = unthrottled_limiter(requests, engine=engine)
+    start = time.perf_counter()
+    for _ in range(requests):
+        limiter.time_until_available(URL)
+        limiter.record_request(URL)
+    elapsed = time.perf_counter() - start
+
+    # Memory is measured on a separate run so tracing doesn't skew the timings
+    limiter = unthrottled_limiter(requests, engine=engine)
+    tracemalloc.start()
+    for _ in range(requests):
+        limiter.time_until_available(URL)
+        limiter.record_request(URL)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        "ops_per_sec": requests / elapsed,
+        "us_per_op": elapsed / requests * 1e6,
+        "peak_kib": peak / 1024,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    args = parser.parse_args()
+
+    print(f"{'engine':<16}{'requests':>10}{'ops/sec':>14}{'us/op':>10}{'peak KiB':>12}")
+    for requests in args.requests:
+        for engine in ENGINES:
+            result = run(engine, requests)
+            print(
+                f"{engine:<16}{requests:>10,}{result['ops_per_sec']:>14,.0f}"
+                f"{result['us_per_op']:>10.2f}{result['peak_kib']:>12,.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
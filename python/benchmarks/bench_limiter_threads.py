@@ -0,0 +1,248 @@
+"""
+Multi-threaded benchmark of RateLimiter lock contention.
+
+Each worker thread runs the clients' request path: a cache lookup, then
+reserve(), the circuit check and commit() (or release() for a share of
+the reservations, as for a request that never connected). Limits are raised high enough that nothing is blocked, and a
+share of the lookups hit a cached response. A share of the threads
+(--hot-share) hammer one hot endpoint category ('search'); the others spread
+over the remaining categories. Every limiter lock is wrapped to time how long
+callers block acquiring it, so besides throughput the table shows the lock
+wait per operation of hot and cold threads and the share of contended
+acquisitions.
+
+Under the GIL, pure-Python critical sections never run in parallel, so lock
+granularity only matters when a thread blocks while holding a limiter lock.
+--engine-latency adds a GIL-releasing sleep to every engine round trip
+(one per wait_time / record / release / try_record call), the way an engine
+backed by a network store behaves. reserve() makes two: the endpoint window
+under its category lock, then burst/global under the global lock. With one
+limiter-wide lock around both, every thread queues behind both round trips;
+sharded, threads on different categories overlap their endpoint round trips
+and only meet on the global one. That row is the one to compare between
+versions. The lock wrappers add overhead to every acquisition, so compare
+the relative columns rather than absolute ops/sec with the other benchmarks.
+
+    python benchmarks/bench_limiter_threads.py [--threads 1 2 4 8 16 32] [--ops 20000] [--engine gcra]
+        [--engine-latency 0 0.00005] [--release-ratio 0.1]
+"""
+
+import argparse
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from common import unthrottled_limiter
+from earth2_api_wrapper.limiter_engines import ENGINES, LimiterEngine, Limits, create_engine
+from earth2_api_wrapper.rate_limiter import RateLimiter
+
+HOT_URL = "https://r.earth2.io/marketplace?country=AU&page={}"
+COLD_URLS = [
+    "https://r.earth2.io/landfields/{}",
+    "https://app.earth2.io/api/v2/user_info/{}",
+    "https://r.earth2.io/leaderboards/players?page={}",
+    "https://resources.earth2.io/v1/landfields/{}/resources",
+    "https://r.earth2.io/landing/metrics?v={}",
+]
+
+
+class _TimedLock:
+    """Wraps a lock, adding up per thread the time spent blocked acquiring it."""
+
+    def __init__(self, lock: Any):
+        self._lock = lock
+        self.waited: Dict[int, float] = defaultdict(float)
+        self.acquisitions = 0
+        self.contended = 0
+
+    def acquire(self, blocking: bool = True, timeout: float = -1) -> bool:
+        if self._lock.acquire(False):
+            self.acquisitions += 1
+            return True
+        if not blocking:
+            return False
+        start = time.perf_counter()
+        if not self._lock.acquire(True, timeout):
+            return False
+        # Counters are only updated while holding the lock
+        self.waited[threading.get_ident()] += time.perf_counter() - start
+        self.acquisitions += 1
+        self.contended += 1
+        return True
+
+    def release(self):
+        self._lock.release()
+
+    def __enter__(self) -> "_TimedLock":
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        self.release()
+
+
+class _RemoteEngine(LimiterEngine):
+    """
+    Delegates to another engine after sleeping `latency` seconds per call,
+    like an engine backed by a network store; the sleep releases the GIL
+    while the caller holds its limiter lock.
+    """
+
+    def __init__(self, engine: LimiterEngine, latency: float):
+        self.engine = engine
+        self.latency = latency
+        self.name = f"{engine.name}+{latency * 1e6:g}us"
+
+    def wait_time(self, key: str, limit: int, window: float, now: float) -> float:
+        time.sleep(self.latency)
+        return self.engine.wait_time(key, limit, window, now)
+
+    def record(self, key: str, limit: int, window: float, now: float) -> None:
+        time.sleep(self.latency)
+        self.engine.record(key, limit, window, now)
+
+    def release(self, key: str, limit: int, window: float, stamp: float, now: float) -> None:
+        time.sleep(self.latency)
+        self.engine.release(key, limit, window, stamp, now)
+
+    def try_record(self, limits: Limits, now: float) -> Tuple[float, ...]:
+        time.sleep(self.latency)
+        return self.engine.try_record(limits, now)
+
+    def count(self, key: str, limit: int, window: float, now: float) -> int:
+        return self.engine.count(key, limit, window, now)
+
+
+def _instrument(limiter: RateLimiter) -> List[_TimedLock]:
+    """Replace every lock the limiter has (one or several, depending on the version) with a timed one."""
+    locks: List[_TimedLock] = []
+
+    def timed(lock: Any) -> _TimedLock:
+        locks.append(_TimedLock(lock))
+        return locks[-1]
+
+    limiter._lock = timed(limiter._lock)
+    if hasattr(limiter, "_category_locks"):
+        limiter._category_locks = {category: timed(lock) for category, lock in limiter._category_locks.items()}
+    if hasattr(limiter, "_circuit_lock"):
+        limiter._circuit_lock = timed(limiter._circuit_lock)
+    return locks
+
+
+def run(
+    engine: str,
+    threads: int,
+    ops: int,
+    hot_share: float,
+    cache_hit_ratio: float,
+    engine_latency: float = 0.0,
+    release_ratio: float = 0.0
+) -> Dict[str, Optional[float]]:
+    """Throughput, lock wait per operation (us) of hot and cold threads, and contended acquisitions (%)."""
+    limiter = unthrottled_limiter(
+        ops, engine=_RemoteEngine(create_engine(engine), engine_latency) if engine_latency else engine
+    )
+    locks = _instrument(limiter)
+    per_thread = ops // threads
+    hot_threads = max(1, round(threads * hot_share))
+    cached_every = round(1 / cache_hit_ratio) if cache_hit_ratio else 0
+    released_every = round(1 / release_ratio) if release_ratio else 0
+    # Cached URLs are shared by all threads; fetched URLs are distinct per thread
+    cached = [template.format("cached") for template in [HOT_URL, *COLD_URLS]]
+    for url in cached:
+        limiter.cache_response(url, 'GET', {"cached": True})
+
+    work: List[List[str]] = []
+    for worker in range(threads):
+        urls = []
+        for i in range(per_thread):
+            if cached_every and i % cached_every == 0:
+                urls.append(cached[0] if worker < hot_threads else cached[1 + (worker + i) % len(COLD_URLS)])
+            elif worker < hot_threads:
+                urls.append(HOT_URL.format(f"{worker}-{i}"))
+            else:
+                urls.append(COLD_URLS[(worker + i) % len(COLD_URLS)].format(f"{worker}-{i}"))
+        work.append(urls)
+
+    barrier = threading.Barrier(threads + 1)
+    hot_idents: List[int] = []
+    cold_idents: List[int] = []
+
+    def worker(index: int, urls: List[str]):
+        (hot_idents if index < hot_threads else cold_idents).append(threading.get_ident())
+        barrier.wait()
+        for i, url in enumerate(urls):
+            if limiter.get_cached_response(url) is not None:
+                continue
+            reservation = limiter.reserve(url)
+            limiter.check_circuit(url)
+            if released_every and i % released_every == 1:
+                limiter.release(reservation)
+            else:
+                limiter.commit(reservation)
+
+    pool = [threading.Thread(target=worker, args=(index, urls)) for index, urls in enumerate(work)]
+    for thread in pool:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in pool:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    def wait_per_op(idents: List[int]) -> Optional[float]:
+        if not idents:
+            return None
+        waited = sum(lock.waited.get(ident, 0.0) for lock in locks for ident in idents)
+        return waited / (len(idents) * per_thread) * 1e6
+
+    acquisitions = sum(lock.acquisitions for lock in locks)
+    return {
+        "ops_per_sec": per_thread * threads / elapsed,
+        "hot_wait_us": wait_per_op(hot_idents),
+        "cold_wait_us": wait_per_op(cold_idents),
+        "contended_pct": sum(lock.contended for lock in locks) / max(1, acquisitions) * 100,
+    }
+
+
+def _cell(value: Optional[float], width: int, spec: str) -> str:
+    return f"{'-':>{width}}" if value is None else f"{value:>{width}{spec}}"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16, 32])
+    parser.add_argument("--ops", type=int, default=20_000, help="requests per run")
+    parser.add_argument("--engine", choices=list(ENGINES), nargs="+", default=["sliding_window", "gcra"])
+    parser.add_argument("--hot-share", type=float, default=0.5, help="share of threads on the hot category")
+    parser.add_argument("--cache-hit-ratio", type=float, default=0.25)
+    parser.add_argument("--release-ratio", type=float, default=0.1, help="share of reservations released")
+    parser.add_argument(
+        "--engine-latency", type=float, nargs="+", default=[0.0, 50e-6],
+        help="seconds slept per engine call (0: in-memory engine as is)"
+    )
+    args = parser.parse_args()
+
+    print(
+        f"{'engine':<16}{'latency us':>11}{'threads':>8}{'ops/sec':>12}{'vs 1 thread':>13}"
+        f"{'hot wait us/op':>16}{'cold wait us/op':>17}{'contended':>11}"
+    )
+    for engine in args.engine:
+        for latency in args.engine_latency:
+            # A remote engine does ~100x less work per second; keep its runs short
+            ops = args.ops if not latency else max(args.threads) * 100
+            baseline = None
+            for threads in args.threads:
+                result = run(engine, threads, ops, args.hot_share, args.cache_hit_ratio, latency, args.release_ratio)
+                ops_per_sec = result['ops_per_sec'] or 0.0
+                baseline = baseline or ops_per_sec
+                print(
+                    f"{engine:<16}{latency * 1e6:>11g}{threads:>8}{ops_per_sec:>12,.0f}{ops_per_sec / baseline:>12.2f}x"
+                    f"{_cell(result['hot_wait_us'], 16, '.2f')}{_cell(result['cold_wait_us'], 17, '.2f')}"
+                    f"{_cell(result['contended_pct'], 10, '.2f')}%"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,19 @@
+"""Helpers shared by the benchmark scripts."""
+
+from typing import Any
+
+from earth2_api_wrapper.rate_limiter import RateLimiter
+
+
+def unthrottled_limiter(requests: int, **kwargs: Any) -> RateLimiter:
+    """
+    A RateLimiter (kwargs go to its constructor) whose burst, global and
+    endpoint limits and cache are large enough that `requests` requests are
+    never blocked or evicted, so benchmarks time the bookkeeping only.
+    """
+    kwargs.setdefault("cache_max_entries", requests * 2)
+    limiter = RateLimiter(**kwargs)
+    limiter._global_limit = requests * 2
+    limiter._burst_limit = requests * 2
+    limiter._endpoint_limits = {category: requests * 2 for category in limiter._endpoint_limits}
+    return limiter
@@ -0,0 +1,259 @@
+"""
+Local stand-in for the Earth2 API used by the benchmarks.
+
+MockEarth2Server serves the marketplace, landfields, resources, leaderboard
+and user_info endpoints from a ThreadingHTTPServer on localhost, with a
+configurable delay per response, marketplace page size and share of requests
+answered with 429 Too Many Requests. RewriteTransport / AsyncRewriteTransport
+send every request a client makes (to r.earth2.io, resources.earth2.io, ...)
+to that server instead, so Earth2Client runs unmodified against it:
+
+    with MockEarth2Server(latency=0.02) as server:
+        client = Earth2Client(client=httpx.Client(transport=server.transport()))
+        client.search_market(country="AU")
+
+Run it on its own to poke at it with curl:
+
+    python benchmarks/mock_server.py --port 8000 --latency 0.05
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+import httpx
+
+COUNTRIES = ("AU", "US", "GB", "DE", "FR", "BR", "JP", "CA")
+
+
+def _landfield(index: int) -> Dict[str, Any]:
+    rng = random.Random(index)
+    tile_count = rng.randint(1, 750)
+    return {
+        "id": f"{index:08x}-0000-4000-8000-{index:012x}",
+        "description": f"Property {index}",
+        "location": f"{rng.uniform(-180, 180):.5f}, {rng.uniform(-90, 90):.5f}",
+        "country": rng.choice(COUNTRIES),
+        "price": round(rng.uniform(5, 5000), 2),
+        "tileCount": tile_count,
+        "tier": rng.choice((1, 1, 2, 3)),
+        "tileClass": rng.choice((1, 2, 3, 4, 5, None)),
+        "forSale": True,
+        "owner": {"id": f"user-{rng.randint(1, 50_000)}", "username": f"player{rng.randint(1, 50_000)}"},
+    }
+
+
+class _Server(ThreadingHTTPServer):
+    # The default backlog of 5 drops connections when many clients connect at once
+    request_queue_size = 128
+
+
+class MockEarth2Server:
+    """
+    Threaded HTTP server emulating the Earth2 endpoints the clients use.
+
+    latency is the delay (seconds) before each response. market_items caps
+    the listings per marketplace page (the request's items parameter is
+    honoured up to it). error_rate is the share of requests answered with
+    429 and a Retry-After of retry_after seconds. Responses carry an ETag
+    and honour If-None-Match, like the real API.
+    """
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        market_items: int = 100,
+        error_rate: float = 0.0,
+        retry_after: float = 0.0,
+        seed: int = 0
+    ):
+        self.latency = latency
+        self.market_items = market_items
+        self.error_rate = error_rate
+        self.retry_after = retry_after
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.throttled = 0
+        self._httpd = _Server((host, port), self._handler_class())
+        self._httpd.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "MockEarth2Server":
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="mock-earth2", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+
+    def __enter__(self) -> "MockEarth2Server":
+        return self.start()
+
+    def __exit__(self, *exc_info: Any):
+        self.stop()
+
+    def transport(self, **kwargs: Any) -> "RewriteTransport":
+        """A transport sending every request to this server (kwargs go to httpx.HTTPTransport)."""
+        return RewriteTransport(self.base_url, httpx.HTTPTransport(**kwargs))
+
+    def async_transport(self, **kwargs: Any) -> "AsyncRewriteTransport":
+        """Async version of transport()."""
+        return AsyncRewriteTransport(self.base_url, httpx.AsyncHTTPTransport(**kwargs))
+
+    def _throttle(self) -> bool:
+        with self._lock:
+            self.requests += 1
+            if self.error_rate and self._random.random() < self.error_rate:
+                self.throttled += 1
+                return True
+            return False
+
+    def respond(self, path: str, query: Dict[str, str]) -> Tuple[int, Any]:
+        """Status and JSON body for a GET of path."""
+        parts = [part for part in path.split("/") if part]
+        if parts[:1] == ["marketplace"]:
+            page = max(1, int(query.get("page", 1)))
+            items = min(self.market_items, max(1, int(query.get("items", 100))))
+            total = items * 20
+            start = (page - 1) * items
+            rows = [_landfield(index) for index in range(start, min(start + items, total))]
+            return 200, {"count": total, "landfields": rows}
+        if parts[:2] == ["v1", "landfields"] and parts[-1:] == ["resources"]:
+            rng = random.Random(parts[2])
+            return 200, {"data": [
+                {"id": f"{parts[2]}-{i}", "type": rng.choice(("ore", "wood", "crystal")), "amount": rng.randint(1, 99)}
+                for i in range(rng.randint(1, 8))
+            ]}
+        if parts[:1] == ["landfields"] and len(parts) == 2:
+            landfield = _landfield(sum(map(ord, parts[1])))
+            landfield["id"] = parts[1]
+            return 200, {"data": {"id": parts[1], "type": "landfield", "attributes": landfield}}
+        if parts[:1] == ["leaderboards"]:
+            return 200, {"data": [
+                {"id": f"user-{rank}", "rank": rank, "username": f"player{rank}", "tilesCount": 100_000 // rank}
+                for rank in range(1, 101)
+            ]}
+        if parts[:3] == ["api", "v2", "user_info"] and len(parts) == 4:
+            return 200, {"data": {"id": parts[3], "type": "user", "attributes": {"username": f"player-{parts[3]}"}}}
+        if parts[:1] == ["landing"]:
+            return 200, {"data": {"path": path}}
+        return 404, {"error": f"unknown endpoint {path}"}
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body are separate writes; don't let Nagle hold the body for an ACK
+            disable_nagle_algorithm = True
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                if server._throttle():
+                    self._send(429, {"error": "Too Many Requests"}, {"Retry-After": f"{server.retry_after:g}"})
+                    return
+                url = urlsplit(self.path)
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                status, body = server.respond(url.path, query)
+                self._send(status, body)
+
+            def _send(self, status: int, body: Any, headers: Optional[Dict[str, str]] = None):
+                payload = json.dumps(body, separators=(",", ":")).encode()
+                etag = f'"{zlib.crc32(payload):08x}"'
+                if status == 200 and self.headers.get("If-None-Match") == etag:
+                    status, payload = 304, b""
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(payload)))
+                if status in (200, 304):
+                    self.send_header("ETag", etag)
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format: str, *args: Any):
+                pass
+
+        return Handler
+
+
+def _rewrite(base: httpx.URL, request: httpx.Request):
+    request.url = request.url.copy_with(scheme=base.scheme, host=base.host, port=base.port)
+
+
+class RewriteTransport(httpx.BaseTransport):
+    """Sends requests for any host to base_url, keeping their path and query."""
+
+    def __init__(self, base_url: str, transport: httpx.BaseTransport):
+        self.base = httpx.URL(base_url)
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        _rewrite(self.base, request)
+        return self.transport.handle_request(request)
+
+    def close(self):
+        self.transport.close()
+
+
+class AsyncRewriteTransport(httpx.AsyncBaseTransport):
+    """Async version of RewriteTransport."""
+
+    def __init__(self, base_url: str, transport: httpx.AsyncBaseTransport):
+        self.base = httpx.URL(base_url)
+        self.transport = transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        _rewrite(self.base, request)
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self):
+        await self.transport.aclose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8000, help="0 picks a free port")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds before each response")
+    parser.add_argument("--market-items", type=int, default=100, help="max listings per marketplace page")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with 429")
+    parser.add_argument("--retry-after", type=float, default=0.0, help="Retry-After sent with 429s (seconds)")
+    args = parser.parse_args()
+
+    server = MockEarth2Server(
+        port=args.port,
+        latency=args.latency,
+        market_items=args.market_items,
+        error_rate=args.error_rate,
+        retry_after=args.retry_after
+    )
+    print(f"Mock Earth2 API on {server.base_url} (Ctrl+C to stop)", flush=True)
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,6 @@
+from .async_client import AsyncEarth2Client
+from .circuit_breaker import CircuitOpenError
 from .client import Earth2Client
+from .rate_limiter import RateLimitExceeded
 
-__all__ = ["Earth2Client"]
+__all__ = ["AsyncEarth2Client", "CircuitOpenError", "Earth2Client", "RateLimitExceeded"]
@@ -0,0 +1,171 @@
+"""
+Adaptive per-category rate limits.
+
+AdaptiveController replaces the static requests-per-minute limit of each
+endpoint category with one that follows the server's behaviour, AIMD style
+(additive increase, multiplicative decrease, as in TCP congestion control):
+every healthy response raises the category's limit by increase / limit, so
+a minute of traffic at the limit adds `increase` requests per minute, while
+a 429 or 503, a timeout, an exhausted rate-limit header or a latency spike
+multiplies it by `decrease`. Limits stay between min_limit and the
+category's ceiling and start at the configured static limit. Controllers
+are not thread-safe on their own; RateLimiter serializes access to each
+category's state.
+"""
+
+from typing import Any, Dict, Mapping, Optional
+
+# Statuses that mean the server is shedding load
+OVERLOAD_STATUSES = (429, 503)
+
+# Rate limit headers as sent by common gateways (IETF draft, then legacy X- names)
+_REMAINING_HEADERS = ("RateLimit-Remaining", "X-RateLimit-Remaining")
+_LIMIT_HEADERS = ("RateLimit-Limit", "X-RateLimit-Limit")
+
+
+def _header_int(headers: Mapping[str, str], names) -> Optional[int]:
+    for name in names:
+        value = headers.get(name)
+        if value is None:
+            continue
+        try:
+            # "RateLimit-Limit: 100, 100;w=60" style values lead with the number
+            return int(value.split(",")[0].split(";")[0].strip())
+        except ValueError:
+            return None
+    return None
+
+
+class _CategoryState:
+    __slots__ = ('limit', 'latency', 'samples', 'last_decrease', 'increases', 'decreases')
+
+    def __init__(self, limit: float):
+        self.limit = limit
+        self.latency = 0.0
+        self.samples = 0
+        self.last_decrease = 0.0
+        self.increases = 0
+        self.decreases = 0
+
+
+class AdaptiveController:
+    """
+    AIMD requests-per-minute limits per endpoint category.
+
+    ceilings caps individual categories (e.g. {'search': 60}); the others may
+    grow to ceiling_factor times their configured limit. After a decrease
+    the limit is not cut again for cooldown seconds, so one burst of 429s
+    halves it once rather than collapsing it to min_limit. A response slower
+    than latency_factor times the category's average latency (once
+    warmup responses have been seen) counts as a spike; latency_factor=None
+    ignores latency. The server-reported remaining quota stops increases when
+    it drops below 10% of the reported limit and forces a decrease at 0.
+    """
+
+    def __init__(
+        self,
+        ceilings: Optional[Dict[str, int]] = None,
+        ceiling_factor: float = 2.0,
+        min_limit: float = 1.0,
+        increase: float = 5.0,
+        decrease: float = 0.5,
+        latency_factor: Optional[float] = 3.0,
+        cooldown: float = 5.0,
+        warmup: int = 5
+    ):
+        if not 0 < decrease < 1:
+            raise ValueError("decrease must be between 0 and 1")
+        self.ceilings = dict(ceilings or {})
+        self.ceiling_factor = ceiling_factor
+        self.min_limit = min_limit
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_factor = latency_factor
+        self.cooldown = cooldown
+        self.warmup = warmup
+        self._states: Dict[str, _CategoryState] = {}
+        self._configured: Dict[str, int] = {}
+
+    def ceiling(self, category: str, configured: int) -> float:
+        """Highest limit category may reach."""
+        return self.ceilings.get(category, configured * self.ceiling_factor)
+
+    def _state(self, category: str, configured: int) -> _CategoryState:
+        state = self._states.get(category)
+        if state is None:
+            state = self._states[category] = _CategoryState(
+                min(float(configured), self.ceiling(category, configured))
+            )
+            self._configured[category] = configured
+        return state
+
+    def limit(self, category: str, configured: int) -> int:
+        """Current requests-per-minute limit for category (configured is its static limit)."""
+        state = self._states.get(category)
+        if state is None:
+            return int(min(configured, self.ceiling(category, configured)))
+        return max(1, int(state.limit))
+
+    def _cut(self, state: _CategoryState, now: float):
+        if now - state.last_decrease < self.cooldown:
+            return
+        state.limit = max(self.min_limit, state.limit * self.decrease)
+        state.last_decrease = now
+        state.decreases += 1
+
+    def observe(
+        self,
+        category: str,
+        configured: int,
+        now: float,
+        status_code: Optional[int] = None,
+        latency: Optional[float] = None,
+        headers: Optional[Mapping[str, str]] = None
+    ):
+        """
+        Adjust category's limit after a response (status_code None means
+        the request timed out).
+        """
+        state = self._state(category, configured)
+        if status_code is None or status_code in OVERLOAD_STATUSES:
+            self._cut(state, now)
+            return
+
+        remaining = limit = None
+        if headers is not None:
+            remaining = _header_int(headers, _REMAINING_HEADERS)
+            limit = _header_int(headers, _LIMIT_HEADERS)
+        if remaining is not None and remaining <= 0:
+            self._cut(state, now)
+            return
+
+        if latency is not None and self.latency_factor is not None:
+            if state.samples >= self.warmup and latency > state.latency * self.latency_factor:
+                self._cut(state, now)
+                return
+            # Exponentially weighted moving average of healthy latencies
+            state.latency = latency if state.samples == 0 else state.latency * 0.8 + latency * 0.2
+            state.samples += 1
+
+        if status_code >= 400:
+            # The request was rejected, but not for load: no signal either way
+            return
+        if remaining is not None and limit and remaining < limit * 0.1:
+            return
+        ceiling = self.ceiling(category, configured)
+        if state.limit < ceiling:
+            state.limit = min(ceiling, state.limit + self.increase / max(state.limit, 1.0))
+            state.increases += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, Any]]:
+        """Current limit, ceiling, average latency and adjustment counts per category."""
+        return {
+            category: {
+                'limit': max(1, int(state.limit)),
+                'ceiling': self.ceiling(category, self._configured[category]),
+                'latency': state.latency,
+                'increases': state.increases,
+                'decreases': state.decreases,
+            }
+            for category, state in list(self._states.items())
+        }
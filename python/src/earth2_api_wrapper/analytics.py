@@ -0,0 +1,205 @@
+"""
+Vectorized analytics over batches of marketplace landfields.
+
+A MarketBatch converts listings into NumPy arrays once; price-per-tile
+statistics, percentiles, outlier flags and floors per country/tier/tileClass
+are then computed with array operations instead of Python loops. NumPy is an
+optional dependency (`pip install earth2-api-wrapper[analytics]`).
+"""
+
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .export import market_columns
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without the extra
+    np = None  # type: ignore[assignment]
+
+# Stored in integer columns when a listing has no tier / tileClass
+MISSING = -1
+
+GROUP_COLUMNS = ("country", "tier", "tileClass")
+
+
+def _require_numpy():
+    if np is None:
+        raise ImportError(
+            "Market analytics requires numpy. Install it with: pip install earth2-api-wrapper[analytics]"
+        )
+
+
+def _parse_range(value: Any) -> Tuple[float, float]:
+    """Parse a tileCount filter such as '5', '5-50' or '750-' into (low, high)."""
+    text = str(value).strip()
+    if "-" in text:
+        low, _, high = text.partition("-")
+        return float(low or 0), float(high) if high else float("inf")
+    return float(text), float(text)
+
+
+class MarketBatch:
+    """
+    Column arrays for a batch of marketplace landfields.
+
+    Attributes: price, tile_count, price_per_tile (NaN where tileCount is 0),
+    tier and tile_class (MISSING when absent), country_code (index into
+    country_labels, where '' means absent) and landfields (the original rows,
+    for returning listings).
+    """
+
+    def __init__(self, landfields: Sequence[Dict[str, Any]]):
+        _require_numpy()
+        self.landfields = list(landfields)
+        columns = market_columns(self.landfields)
+
+        self.price = np.asarray(columns["price"], dtype=np.float64)
+        self.tile_count = np.asarray(columns["tileCount"], dtype=np.int64)
+        self.tier = np.asarray([MISSING if v is None else v for v in columns["tier"]], dtype=np.int16)
+        self.tile_class = np.asarray([MISSING if v is None else v for v in columns["tileClass"]], dtype=np.int16)
+        # Countries are dictionary-encoded so grouping works on integers
+        labels: Dict[str, int] = {}
+        self.country_code = np.asarray(
+            [labels.setdefault(v or "", len(labels)) for v in columns["country"]], dtype=np.int32
+        )
+        self.country_labels = list(labels)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.price_per_tile = np.where(self.tile_count > 0, self.price / self.tile_count, np.nan)
+
+    @classmethod
+    def from_landfields(cls, landfields: Iterable[Dict[str, Any]]) -> "MarketBatch":
+        """Build a batch from any iterable of landfields (e.g. Earth2Client.iter_market)."""
+        return cls(list(landfields))
+
+    def __len__(self) -> int:
+        return len(self.landfields)
+
+    def mask(
+        self,
+        country: Optional[str] = None,
+        tier: Optional[Any] = None,
+        tile_class: Optional[Any] = None,
+        tile_count: Optional[Any] = None
+    ) -> "np.ndarray":
+        """Boolean mask of listings matching the given filters (None means any)."""
+        selected = np.ones(len(self), dtype=bool)
+        if country:
+            if country not in self.country_labels:
+                return np.zeros(len(self), dtype=bool)
+            selected &= self.country_code == self.country_labels.index(country)
+        if tier not in (None, ""):
+            selected &= self.tier == int(tier)
+        if tile_class not in (None, ""):
+            selected &= self.tile_class == int(tile_class)
+        if tile_count not in (None, ""):
+            low, high = _parse_range(tile_count)
+            selected &= (self.tile_count >= low) & (self.tile_count <= high)
+        return selected
+
+    def _valid_ppt(self, mask: Optional["np.ndarray"]) -> "np.ndarray":
+        values = self.price_per_tile if mask is None else self.price_per_tile[mask]
+        return values[~np.isnan(values)]
+
+    def percentiles(
+        self,
+        q: Sequence[float] = (5, 25, 50, 75, 95),
+        mask: Optional["np.ndarray"] = None
+    ) -> Dict[float, float]:
+        """Price-per-tile percentiles, optionally within a mask."""
+        values = self._valid_ppt(mask)
+        if not len(values):
+            return {p: float("nan") for p in q}
+        return dict(zip(q, (float(v) for v in np.percentile(values, q))))
+
+    def price_per_tile_stats(self, mask: Optional["np.ndarray"] = None) -> Dict[str, Any]:
+        """Count, min, max, mean, std and percentiles of price per tile."""
+        values = self._valid_ppt(mask)
+        if not len(values):
+            return {"count": 0}
+        return {
+            "count": int(len(values)),
+            "min": float(values.min()),
+            "max": float(values.max()),
+            "mean": float(values.mean()),
+            "std": float(values.std()),
+            "percentiles": self.percentiles(mask=mask),
+        }
+
+    def outliers(self, k: float = 1.5, mask: Optional["np.ndarray"] = None) -> "np.ndarray":
+        """
+        Flag listings whose log price per tile lies more than k interquartile
+        ranges outside the quartiles (Tukey fences on a log scale, since prices
+        span orders of magnitude).
+        """
+        flags = np.zeros(len(self), dtype=bool)
+        selected = ~np.isnan(self.price_per_tile) & (self.price_per_tile > 0)
+        if mask is not None:
+            selected &= mask
+        if not selected.any():
+            return flags
+        logs = np.log(self.price_per_tile[selected])
+        q1, q3 = np.percentile(logs, [25, 75])
+        spread = k * (q3 - q1)
+        flags[selected] = (logs < q1 - spread) | (logs > q3 + spread)
+        return flags
+
+    def floors(self, by: Sequence[str] = GROUP_COLUMNS) -> List[Dict[str, Any]]:
+        """
+        Lowest price per tile for every combination of the by columns
+        ('country', 'tier', 'tileClass'), with listing count and floor listing id.
+        """
+        arrays: Dict[str, Any] = {"country": self.country_code, "tier": self.tier, "tileClass": self.tile_class}
+        valid = np.flatnonzero(~np.isnan(self.price_per_tile))
+        if not len(valid):
+            return []
+
+        codes = []
+        uniques = []
+        for column in by:
+            values, inverse = np.unique(arrays[column][valid], return_inverse=True)
+            uniques.append(values)
+            codes.append(inverse)
+
+        # Sort by group then price so the first row of each group is its floor
+        order = np.lexsort([self.price_per_tile[valid]] + codes[::-1])
+        sorted_codes = np.stack([c[order] for c in codes]) if codes else np.zeros((0, len(order)), dtype=np.int64)
+        starts = np.flatnonzero(
+            np.concatenate(([True], (sorted_codes[:, 1:] != sorted_codes[:, :-1]).any(axis=0)))
+        )
+        counts = np.diff(np.append(starts, len(order)))
+
+        table = []
+        for start, count in zip(starts, counts):
+            row_index = int(valid[order[start]])
+            row: Dict[str, Any] = {}
+            for column, values, code in zip(by, uniques, sorted_codes):
+                value = values[code[start]]
+                if column == "country":
+                    row[column] = self.country_labels[value] or None
+                else:
+                    row[column] = None if value == MISSING else int(value)
+            row["floor_price_per_tile"] = float(self.price_per_tile[row_index])
+            row["count"] = int(count)
+            row["id"] = self.landfields[row_index].get("id")
+            table.append(row)
+        return table
+
+    def market_floor(self, params: Dict[str, str], items: int = 24) -> Dict[str, Any]:
+        """
+        Answer Earth2Client.get_market_floor(params) from this batch: the
+        cheapest listings per tile matching the same filters, in the same
+        {"count", "landfields"} shape as the marketplace endpoint.
+        """
+        tile_class = params.get("tileClass") if params.get("landfieldTier") == "1" else None
+        selected = self.mask(
+            country=params.get("country"),
+            tier=params.get("landfieldTier"),
+            tile_class=tile_class,
+            tile_count=params.get("tileCount"),
+        ) & ~np.isnan(self.price_per_tile)
+        indices = np.flatnonzero(selected)
+        cheapest = indices[np.argsort(self.price_per_tile[indices], kind="stable")[:items]]
+        return {
+            "count": int(len(indices)),
+            "landfields": [self.landfields[i] for i in cheapest],
+        }
@@ -0,0 +1,435 @@
+from __future__ import annotations
+
+import asyncio
+import time
+from typing import TYPE_CHECKING, Any, AsyncIterator, Dict, List, Optional
+
+import httpx
+
+from .client import Earth2Client, _Earth2ClientBase
+from .circuit_breaker import CircuitOpenError
+from .rate_limiter import RateLimiter
+from .retry import RetryPolicy
+from .singleflight import AsyncSingleFlight
+from .transport import ConnectionSettings
+
+if TYPE_CHECKING:
+    from .analytics import MarketBatch
+
+
+class AsyncEarth2Client(_Earth2ClientBase):
+    """
+    asyncio counterpart of Earth2Client built on httpx.AsyncClient.
+
+    Every network method is a coroutine with the same name, arguments and
+    return value as its Earth2Client equivalent. Rate limiting and caching go
+    through the same shared RateLimiter, called directly on the event loop.
+    With the in-memory engines and cache that is only short in-memory
+    bookkeeping. With engine='shared' or a persistent SQLiteCache
+    (use_persistent_cache(), E2_CACHE_DIR) reservations and cache reads and
+    writes run synchronous SQLite statements on the loop: usually well under
+    a millisecond, but up to the 10s busy timeout while another process
+    holds the database's write lock.
+    """
+
+    def __init__(
+        self,
+        cookie_jar: Optional[str] = None,
+        csrf_token: Optional[str] = None,
+        client: Optional[httpx.AsyncClient] = None,
+        respect_rate_limits: bool = True,
+        wait_for_rate_limit: bool = False,
+        max_rate_limit_wait: Optional[float] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        coalesce_requests: bool = True,
+        connection: Optional[ConnectionSettings] = None,
+        retry_requests: bool = True,
+        retry_policy: Optional[RetryPolicy] = None
+    ):
+        """
+        connection sets the pool limits, timeouts and HTTP/2 for the HTTP
+        client created here (ignored when client is given). To share one
+        connection pool between several async clients on the same event loop,
+        pass them the same httpx.AsyncClient. Retries work as in Earth2Client.
+        """
+        super().__init__(
+            cookie_jar,
+            csrf_token,
+            respect_rate_limits,
+            wait_for_rate_limit,
+            max_rate_limit_wait,
+            rate_limiter,
+            retry_requests,
+            retry_policy
+        )
+        # Concurrent identical GETs share one network call
+        self._single_flight: Optional[AsyncSingleFlight] = AsyncSingleFlight() if coalesce_requests else None
+        # Kept for the sync client authenticate() runs the login flow with
+        self._connection = connection or ConnectionSettings()
+        self._client = client or self._connection.create_async_client()
+
+    async def __aenter__(self) -> "AsyncEarth2Client":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+    async def aclose(self) -> None:
+        """Close the underlying HTTP client"""
+        await self._client.aclose()
+
+    async def authenticate(self, email: str, password: str) -> Dict[str, Any]:
+        """
+        Authenticate with email/password using Earth2's Kinde OAuth flow.
+
+        The redirect-heavy OAuth flow is run by Earth2Client in a worker thread
+        so the event loop stays free; the resulting cookies are copied onto this
+        client. It uses this client's rate limiter and connection settings,
+        so login attempts count against the same budget. The same 2FA/TOTP
+        limitation applies.
+        """
+        sync_client = Earth2Client(
+            respect_rate_limits=self._rate_limiter is not None,
+            rate_limiter=self._rate_limiter,
+            connection=self._connection
+        )
+        try:
+            result = await asyncio.to_thread(sync_client.authenticate, email, password)
+        finally:
+            sync_client.close()
+
+        if result.get("success"):
+            self.cookie_jar = sync_client.cookie_jar
+        return result
+
+    async def check_session_validity(self) -> Dict[str, Any]:
+        """Check if the current session cookies are still valid"""
+        try:
+            response = await self._client.get(
+                "https://app.earth2.io/api/v1/avatar_sales",
+                headers=self._headers(),
+                follow_redirects=False
+            )
+
+            if response.status_code == 200:
+                return {"isValid": True, "needsReauth": False}
+
+            return {
+                "isValid": False,
+                "needsReauth": True,
+                "status": response.status_code
+            }
+
+        except Exception:
+            return {
+                "isValid": False,
+                "needsReauth": True,
+                "error": "Network error"
+            }
+
+    async def _get_json(
+        self,
+        url: str,
+        wait: Optional[bool] = None,
+        cache_ttl: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Helper method to get JSON from an API endpoint with rate limiting.
+
+        Concurrent calls for the same URL are coalesced into one request whose
+        result (or error) they all share.
+        """
+        if self._single_flight is None:
+            return await self._fetch_with_retry(url, wait, cache_ttl)
+        return await self._single_flight.do(
+            self._flight_key(url, wait), lambda: self._fetch_with_retry(url, wait, cache_ttl)
+        )
+
+    async def _fetch_with_retry(
+        self,
+        url: str,
+        wait: Optional[bool] = None,
+        cache_ttl: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """_fetch_json, retrying retryable failures after the retry policy's delay"""
+        started = time.monotonic()
+        attempt = 1
+        delay = 0.0
+        while True:
+            try:
+                return await self._fetch_json(url, wait, cache_ttl)
+            except Exception as error:
+                next_delay = self._retry_delay(error, attempt, delay, started)
+                if next_delay is None:
+                    raise
+                delay = next_delay
+            await asyncio.sleep(delay)
+            attempt += 1
+
+    async def _fetch_json(
+        self,
+        url: str,
+        wait: Optional[bool] = None,
+        cache_ttl: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch JSON from an API endpoint with rate limiting.
+
+        With wait=True (default: the client's wait_for_rate_limit setting) a
+        rate-limited request awaits a free slot, queued behind waiting
+        requests of equal or higher priority (see scheduler.scheduling),
+        instead of raising RateLimitExceeded.
+
+        cache_ttl overrides the endpoint's cache TTL for this call: cached
+        responses older than it are ignored and the fresh response is cached
+        for that long.
+        """
+        reservation = None
+        if self._rate_limiter:
+            if wait is None:
+                wait = self._wait_for_rate_limit
+            cached_response = self._rate_limiter.get_cached_response(url, max_age=cache_ttl)
+            if cached_response is not None:
+                return cached_response
+
+            # Fail fast while the endpoint's circuit breaker is open, before taking or queueing for a slot
+            self._rate_limiter.check_circuit(url, admit=False)
+
+            # Take the slot up front so concurrent requests can't all slip past the limits
+            reservation = await self._rate_limiter.reserve_async(url, wait=wait, timeout=self._max_rate_limit_wait)
+
+            # Admit the request (a probe if half-open); the circuit may have opened while it waited
+            try:
+                self._rate_limiter.check_circuit(url)
+            except CircuitOpenError:
+                self._rate_limiter.release(reservation)
+                raise
+
+        revalidation = self._rate_limiter.get_revalidation(url) if self._rate_limiter else None
+        headers = self._headers()
+        if revalidation is not None:
+            headers.update(revalidation[1])
+
+        try:
+            response = await self._client.get(url, headers=headers, follow_redirects=True)
+            return self._handle_response(url, response, revalidation, cache_ttl, reservation)
+
+        except Exception as e:
+            self._record_failure(url, e, reservation)
+            raise
+
+    async def get_landing_metrics(self, cache_ttl: Optional[int] = None) -> Dict[str, Any]:
+        """Get landing page metrics"""
+        return await self._get_json("https://r.earth2.io/landing/metrics", cache_ttl=cache_ttl)
+
+    async def get_trending_places(self, days: int = 30, cache_ttl: Optional[int] = None) -> Dict[str, Any]:
+        """Get trending places"""
+        return await self._get_json("https://r.earth2.io/landing/trending_places", cache_ttl=cache_ttl)
+
+    async def get_territory_release_winners(self, cache_ttl: Optional[int] = None) -> Dict[str, Any]:
+        """Get territory release winners"""
+        return await self._get_json("https://r.earth2.io/landing/territory_release_winners", cache_ttl=cache_ttl)
+
+    async def get_property(self, property_id: str, cache_ttl: Optional[int] = None) -> Dict[str, Any]:
+        """Get property details by ID"""
+        return await self._get_json(f"https://r.earth2.io/landfields/{property_id}", cache_ttl=cache_ttl)
+
+    async def search_market(
+        self,
+        country: Optional[str] = None,
+        landfieldTier: Optional[str] = None,
+        tileClass: Optional[str] = None,
+        tileCount: Optional[str] = None,
+        page: int = 1,
+        items: int = 100,
+        search: str = "",
+        searchTerms: Optional[List[str]] = None,
+        cache_ttl: Optional[int] = None,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Search marketplace"""
+        full_url = self._market_url(
+            country=country,
+            landfieldTier=landfieldTier,
+            tileClass=tileClass,
+            tileCount=tileCount,
+            page=page,
+            items=items,
+            search=search,
+            searchTerms=searchTerms,
+            **kwargs
+        )
+        return await self._get_json(full_url, cache_ttl=cache_ttl)
+
+    async def iter_market(
+        self,
+        country: Optional[str] = None,
+        landfieldTier: Optional[str] = None,
+        tileClass: Optional[str] = None,
+        tileCount: Optional[str] = None,
+        search: str = "",
+        searchTerms: Optional[List[str]] = None,
+        page_size: int = 100,
+        start_page: int = 1,
+        limit: Optional[int] = None,
+        prefetch: bool = False,
+        cache_ttl: Optional[int] = None,
+        **kwargs
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Lazily yield marketplace landfields across all result pages.
+
+        Async counterpart of Earth2Client.iter_market; with prefetch=True the
+        next page is requested in a background task once the caller moves past
+        the current page's first landfield. The prefetch task is only
+        cancelled when the generator is closed, and Python closes async
+        generators on aclose() or garbage collection rather than when the
+        loop exits. Callers that stop early should therefore close it
+        explicitly, e.g. with contextlib.aclosing() (Python 3.10+):
+
+            async with aclosing(client.iter_market(country="AU", prefetch=True)) as listings:
+                async for landfield in listings:
+                    ...
+        """
+        async def fetch(page: int) -> Dict[str, Any]:
+            url = self._market_url(
+                country=country,
+                landfieldTier=landfieldTier,
+                tileClass=tileClass,
+                tileCount=tileCount,
+                page=page,
+                items=page_size,
+                search=search,
+                searchTerms=searchTerms,
+                **kwargs
+            )
+            return await self._get_json(url, wait=True, cache_ttl=cache_ttl)
+
+        pending: Optional["asyncio.Task[Dict[str, Any]]"] = None
+        page = start_page
+        fetched = 0
+        yielded = 0
+        try:
+            result = await fetch(page)
+            while True:
+                landfields = result.get("landfields") or []
+                fetched += len(landfields)
+                last = self._is_last_market_page(result, page_size, fetched) or (
+                    limit is not None and fetched >= limit
+                )
+                for landfield in landfields:
+                    if limit is not None and yielded >= limit:
+                        return
+                    yield landfield
+                    yielded += 1
+                    if prefetch and not last and pending is None:
+                        # The caller has moved into this page: fetch the next one meanwhile
+                        pending = asyncio.ensure_future(fetch(page + 1))
+
+                if last:
+                    return
+                page += 1
+                if pending is not None:
+                    result, pending = await pending, None
+                else:
+                    result = await fetch(page)
+        finally:
+            if pending is not None:
+                pending.cancel()
+
+    async def get_market_floor(
+        self,
+        params: Dict[str, str],
+        cache_ttl: Optional[int] = None,
+        scan: Optional[MarketBatch] = None
+    ) -> Dict[str, Any]:
+        """
+        Get market floor price per tile.
+
+        With scan (an analytics.MarketBatch from one bulk market scan) the
+        floor is computed locally from the scanned listings without a request.
+        """
+        if scan is not None:
+            return scan.market_floor(params)
+        return await self._get_json(self._market_floor_url(params), cache_ttl=cache_ttl)
+
+    async def get_market_floors(
+        self,
+        segments: List[Dict[str, Any]],
+        max_concurrency: int = 4,
+        cache_ttl: Optional[int] = None,
+        scan: Optional[MarketBatch] = None
+    ) -> Dict[str, Any]:
+        """
+        Get floor prices for many segments at once.
+
+        Same de-duplication, caching, ordering and result shape as
+        Earth2Client.get_market_floors, with up to max_concurrency lookups in
+        flight at a time.
+        """
+        unique = self._unique_floor_segments(segments)
+        if scan is not None:
+            return self._floors_result(unique, [scan.market_floor(params) for params in unique])
+
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def fetch(params: Dict[str, str]) -> Dict[str, Any]:
+            async with semaphore:
+                return await self._get_json(self._market_floor_url(params), wait=True, cache_ttl=cache_ttl)
+
+        outcomes = await asyncio.gather(*(fetch(params) for params in unique), return_exceptions=True)
+        return self._floors_result(unique, outcomes)
+
+    async def get_leaderboard_players(self, cache_ttl: Optional[int] = None, **params) -> Dict[str, Any]:
+        """Get players leaderboard"""
+        url = self._query_url("https://r.earth2.io/leaderboards/players", params)
+        return await self._get_json(url, cache_ttl=cache_ttl)
+
+    async def get_leaderboard_countries(self, cache_ttl: Optional[int] = None, **params) -> Dict[str, Any]:
+        """Get countries leaderboard"""
+        url = self._query_url("https://r.earth2.io/leaderboards/landfield_countries", params)
+        return await self._get_json(url, cache_ttl=cache_ttl)
+
+    async def get_leaderboard_player_countries(self, cache_ttl: Optional[int] = None, **params) -> Dict[str, Any]:
+        """Get player countries leaderboard"""
+        url = self._query_url("https://r.earth2.io/leaderboards/player_countries", params)
+        return await self._get_json(url, cache_ttl=cache_ttl)
+
+    async def get_avatar_sales(self, cache_ttl: Optional[int] = None) -> Dict[str, Any]:
+        """Get avatar sales data"""
+        return await self._get_json("https://r.earth2.io/avatar_sales", cache_ttl=cache_ttl)
+
+    async def get_user_info(self, user_id: str, cache_ttl: Optional[int] = None) -> Dict[str, Any]:
+        """Get user information by ID"""
+        return await self._get_json(f"https://app.earth2.io/api/v2/user_info/{user_id}", cache_ttl=cache_ttl)
+
+    async def get_users(
+        self,
+        user_ids: List[str],
+        max_concurrency: int = 8,
+        cache_ttl: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Get multiple users by IDs (aggregate single-user endpoint).
+
+        Duplicate IDs are fetched once and up to max_concurrency lookups are
+        in flight at a time, waiting for the 'user' rate limit budget instead
+        of failing. "data" holds the users in input order; IDs that could not
+        be fetched are reported in "errors" as {user_id: message}.
+        """
+        unique_ids = list(dict.fromkeys(user_ids))
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+
+        async def fetch(uid: str) -> Dict[str, Any]:
+            async with semaphore:
+                url = f"https://app.earth2.io/api/v2/user_info/{uid}"
+                return await self._get_json(url, wait=True, cache_ttl=cache_ttl)
+
+        outcomes = await asyncio.gather(*(fetch(uid) for uid in unique_ids), return_exceptions=True)
+        return self._bulk_result(unique_ids, outcomes)
+
+    async def get_resources(self, property_id: str, cache_ttl: Optional[int] = None) -> Dict[str, Any]:
+        """Get property resources by ID"""
+        return await self._get_json(
+            f"https://resources.earth2.io/v1/landfields/{property_id}/resources", cache_ttl=cache_ttl
+        )
@@ -0,0 +1,350 @@
+"""
+Response cache backends for the Earth2 API wrapper.
+
+LRUCache is the in-process cache used by RateLimiter. SQLiteCache persists
+responses on disk so separate processes (for example repeated `e2` CLI runs
+from cron) can reuse each other's results.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple, Union
+
+from .decoding import RawJSON, dumps, loads
+
+
+def default_cache_dir() -> str:
+    """Per-user cache directory (honours XDG_CACHE_HOME)."""
+    base = os.getenv("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "earth2-api-wrapper")
+
+
+class CacheEntry:
+    """
+    A cached response with its storage time, optional TTL, size in bytes and
+    HTTP validators (ETag / Last-Modified) for conditional revalidation.
+    """
+
+    __slots__ = ('value', 'stored_at', 'ttl', 'size', 'validators')
+
+    def __init__(
+        self,
+        value: Any,
+        stored_at: float,
+        ttl: Optional[float],
+        size: int,
+        validators: Optional[Dict[str, str]] = None
+    ):
+        self.value = value
+        self.stored_at = stored_at
+        self.ttl = ttl
+        self.size = size
+        self.validators = validators
+
+
+class LRUCache:
+    """
+    Thread-safe LRU cache with per-entry TTLs.
+
+    Lookups, inserts and evictions are O(1): entries live in an OrderedDict in
+    recency order and the least recently used ones are dropped once the cache
+    exceeds max_entries or (when given) max_bytes. Entries without their own
+    TTL expire after default_ttl seconds; expired entries that carry HTTP
+    validators are kept (until evicted) so they can be revalidated. The cache
+    has its own lock, so cache traffic never waits on rate limiter bookkeeping.
+    """
+
+    def __init__(self, max_entries: int = 1000, max_bytes: Optional[int] = None, default_ttl: float = 300):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: str, max_age: Optional[float] = None) -> Optional[Any]:
+        """
+        Return the value for key if present and fresh, marking it most recently used.
+
+        max_age, when given, replaces the entry's TTL for this lookup.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            ttl = max_age if max_age is not None else (self.default_ttl if entry.ttl is None else entry.ttl)
+            if time.time() - entry.stored_at >= ttl:
+                if not entry.validators:
+                    self._remove(key)
+                    self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry.value
+
+    def set(
+        self,
+        key: str,
+        value: Any,
+        ttl: Optional[float] = None,
+        size: int = 0,
+        stored_at: Optional[float] = None,
+        validators: Optional[Dict[str, str]] = None
+    ):
+        """Insert or replace a value, evicting least recently used entries if over bounds."""
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = CacheEntry(
+                value, time.time() if stored_at is None else stored_at, ttl, size, validators
+            )
+            self._bytes += size
+            while self._entries and (
+                len(self._entries) > self.max_entries
+                or (self.max_bytes is not None and self._bytes > self.max_bytes)
+            ):
+                _, evicted = self._entries.popitem(last=False)
+                self._bytes -= evicted.size
+                self.evictions += 1
+
+    def get_stale(self, key: str) -> Optional[CacheEntry]:
+        """Return the entry for key regardless of age if it can be revalidated."""
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry if entry is not None and entry.validators else None
+
+    def refresh(self, key: str, ttl: Optional[float] = None) -> bool:
+        """Mark an entry fresh again (after a 304 Not Modified). Returns False if it is gone."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return False
+            entry.stored_at = time.time()
+            if ttl is not None:
+                entry.ttl = ttl
+            self._entries.move_to_end(key)
+            return True
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def clear(self):
+        """Remove all entries (counters are kept)."""
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, int]:
+        """Entry count, size and hit/miss/eviction counters."""
+        with self._lock:
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+
+class SQLiteCache:
+    """
+    Persistent response cache stored in a SQLite database.
+
+    Entries are keyed like RateLimiter._get_cache_key and checked against the
+    caller's TTL when read; expired entries with HTTP validators are kept for
+    revalidation. Once the cache holds more than max_entries entries or
+    max_bytes of serialized JSON, the oldest entries are evicted; triggers
+    keep both totals in the database, so checking them doesn't scan the
+    table. Bodies are stored as UTF-8 bytes and encoded and decoded with
+    the active decoding backend. Small settings such as the cache TTL are
+    stored alongside so they survive between processes.
+    """
+
+    def __init__(self, path: str, max_entries: int = 5000, max_bytes: int = 50 * 1024 * 1024):
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self.path = path
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=10, check_same_thread=False, isolation_level=None)
+        # WAL lets concurrent CLI runs read while another one writes
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        # One transaction, so concurrent processes don't both seed the totals
+        self._conn.execute("BEGIN IMMEDIATE")
+        try:
+            self._create_schema()
+            self._conn.execute("COMMIT")
+        except BaseException:
+            self._conn.execute("ROLLBACK")
+            raise
+
+    def _create_schema(self):
+        conn = self._conn
+        # Bodies are stored as the UTF-8 bytes received (databases from older versions may hold TEXT)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "key TEXT PRIMARY KEY, stored_at REAL NOT NULL, size INTEGER NOT NULL, body BLOB NOT NULL)"
+        )
+        columns = {row[1] for row in conn.execute("PRAGMA table_info(responses)")}
+        if 'validators' not in columns:
+            conn.execute("ALTER TABLE responses ADD COLUMN validators TEXT")
+        conn.execute("CREATE INDEX IF NOT EXISTS responses_stored_at ON responses (stored_at)")
+        conn.execute("CREATE TABLE IF NOT EXISTS settings (name TEXT PRIMARY KEY, value TEXT NOT NULL)")
+
+        # Entry count and byte total kept up to date by triggers, so eviction checks are O(1)
+        # in every process sharing the file
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS totals ("
+            "id INTEGER PRIMARY KEY CHECK (id = 0), entries INTEGER NOT NULL, bytes INTEGER NOT NULL)"
+        )
+        conn.execute(
+            "INSERT OR IGNORE INTO totals (id, entries, bytes) "
+            "SELECT 0, COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+        )
+        conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS responses_insert AFTER INSERT ON responses BEGIN "
+            "UPDATE totals SET entries = entries + 1, bytes = bytes + new.size WHERE id = 0; END"
+        )
+        conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS responses_delete AFTER DELETE ON responses BEGIN "
+            "UPDATE totals SET entries = entries - 1, bytes = bytes - old.size WHERE id = 0; END"
+        )
+        conn.execute(
+            "CREATE TRIGGER IF NOT EXISTS responses_resize AFTER UPDATE OF size ON responses BEGIN "
+            "UPDATE totals SET bytes = bytes + new.size - old.size WHERE id = 0; END"
+        )
+
+    @classmethod
+    def in_directory(cls, directory: Optional[str] = None, **kwargs: Any) -> "SQLiteCache":
+        """Open the cache database inside directory (default: default_cache_dir())."""
+        return cls(os.path.join(directory or default_cache_dir(), "responses.sqlite3"), **kwargs)
+
+    def get(self, key: str, ttl: float, raw: bool = False) -> Optional[Tuple[float, Any]]:
+        """
+        Return (stored_at, response) for key if it is younger than ttl seconds.
+
+        With raw=True the response is returned undecoded, as a RawJSON.
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT stored_at, body, validators FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            stored_at, body, validators = row
+            if time.time() - stored_at >= ttl:
+                if not validators:
+                    self._conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                return None
+        return stored_at, RawJSON(body) if raw else loads(body)
+
+    def get_stale(self, key: str) -> Optional[Tuple[Any, Dict[str, str]]]:
+        """Return (response, validators) for key regardless of age if it can be revalidated."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, validators FROM responses WHERE key = ? AND validators IS NOT NULL", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        return loads(row[0]), json.loads(row[1])
+
+    def set(
+        self,
+        key: str,
+        response: Any,
+        validators: Optional[Dict[str, str]] = None,
+        body: Optional[Union[bytes, str]] = None
+    ):
+        """
+        Store a response, evicting the oldest entries when over the size bounds.
+
+        body, when given, is the response's JSON as received and is stored
+        as-is instead of re-encoding response.
+        """
+        if body is None:
+            body = dumps(response)
+        elif isinstance(body, str):
+            body = body.encode()
+        with self._lock:
+            # An upsert rather than INSERT OR REPLACE, whose implicit delete wouldn't fire the totals trigger
+            self._conn.execute(
+                "INSERT INTO responses (key, stored_at, size, body, validators) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET stored_at = excluded.stored_at, size = excluded.size, "
+                "body = excluded.body, validators = excluded.validators",
+                (key, time.time(), len(body), body, json.dumps(validators) if validators else None)
+            )
+            self._evict()
+
+    def touch(self, key: str):
+        """Mark an entry fresh again (after a 304 Not Modified)."""
+        with self._lock:
+            self._conn.execute("UPDATE responses SET stored_at = ? WHERE key = ?", (time.time(), key))
+
+    def _evict(self):
+        """Delete oldest entries until both the entry and byte bounds hold."""
+        count, total = self._conn.execute("SELECT entries, bytes FROM totals WHERE id = 0").fetchone()
+        if count <= self.max_entries and total <= self.max_bytes:
+            return
+
+        excess = max(0, count - self.max_entries)
+        cursor = self._conn.execute("SELECT key, size FROM responses ORDER BY stored_at")
+        doomed = []
+        for key, size in cursor:
+            if excess <= 0 and total <= self.max_bytes:
+                break
+            doomed.append((key,))
+            excess -= 1
+            total -= size
+        cursor.close()
+        self._conn.executemany("DELETE FROM responses WHERE key = ?", doomed)
+
+    def get_setting(self, name: str) -> Optional[str]:
+        """Read a persisted setting."""
+        with self._lock:
+            row = self._conn.execute("SELECT value FROM settings WHERE name = ?", (name,)).fetchone()
+        return row[0] if row else None
+
+    def get_settings(self, prefix: str) -> Dict[str, str]:
+        """Read all persisted settings whose name starts with prefix."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT name, value FROM settings WHERE substr(name, 1, ?) = ?", (len(prefix), prefix)
+            ).fetchall()
+        return dict(rows)
+
+    def set_setting(self, name: str, value: str):
+        """Persist a setting for later processes."""
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO settings (name, value) VALUES (?, ?)", (name, value))
+
+    def clear(self):
+        """Remove all cached responses (settings are kept)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT entries FROM totals WHERE id = 0").fetchone()[0]
+
+    def close(self):
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
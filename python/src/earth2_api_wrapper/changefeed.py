@@ -0,0 +1,127 @@
+"""
+Incremental change detection for marketplace scans.
+
+MarketChangeFeed remembers a compact index of the last scan (listing id ->
+CRC32 of its price) and reports only listings that were added, removed or
+repriced since then, instead of handing every listing back on every poll.
+The index can be persisted to a JSON file so successive runs (for example a
+cron job) pick up where the previous one stopped.
+"""
+
+import json
+import os
+import time
+import zlib
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+from .cache import default_cache_dir
+from .conversions import to_float
+
+if TYPE_CHECKING:
+    from .client import Earth2Client
+
+
+def price_hash(landfield: Dict[str, Any]) -> int:
+    """CRC32 of a listing's normalized price."""
+    return zlib.crc32(repr(to_float(landfield.get("price"))).encode())
+
+
+def default_index_path(filters: Dict[str, Any]) -> str:
+    """Index file for a set of search filters inside default_cache_dir()."""
+    key = json.dumps(filters, sort_keys=True, default=str)
+    return os.path.join(default_cache_dir(), f"market-changes-{zlib.crc32(key.encode()):08x}.json")
+
+
+class MarketChangeFeed:
+    """
+    Diff successive marketplace scans for one set of search filters.
+
+    filters are the Earth2Client.iter_market arguments (country,
+    landfieldTier, tileClass, tileCount, search, searchTerms). With
+    index_path the index is loaded from and saved to that JSON file (written
+    atomically); without it the feed only lives in memory. The first scan
+    reports every listing as added.
+    """
+
+    def __init__(
+        self,
+        client: "Earth2Client",
+        index_path: Optional[str] = None,
+        page_size: int = 100,
+        **filters: Any
+    ):
+        self.client = client
+        self.index_path = index_path
+        self.page_size = page_size
+        self.filters = {key: value for key, value in filters.items() if value not in (None, "", [])}
+        self.index: Dict[str, int] = {}
+        self.scanned_at: Optional[float] = None
+        if index_path and os.path.exists(index_path):
+            self._load(index_path)
+
+    def _load(self, path: str):
+        with open(path, "r", encoding="utf-8") as fh:
+            state = json.load(fh)
+        if state.get("filters") != json.loads(json.dumps(self.filters, default=str)):
+            # Index belongs to a different search; diffing against it would be meaningless
+            return
+        self.index = {str(key): int(value) for key, value in state.get("index", {}).items()}
+        self.scanned_at = state.get("scanned_at")
+
+    def save(self):
+        """Write the index to index_path via a temporary file and atomic rename."""
+        if not self.index_path:
+            return
+        directory = os.path.dirname(os.path.abspath(self.index_path))
+        os.makedirs(directory, exist_ok=True)
+        temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+        state = {"filters": self.filters, "scanned_at": self.scanned_at, "index": self.index}
+        with open(temp_path, "w", encoding="utf-8") as fh:
+            json.dump(state, fh, separators=(",", ":"), default=str)
+        os.replace(temp_path, self.index_path)
+
+    def diff(self, landfields: Iterable[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Compare a complete scan against the index and make it the new index.
+
+        landfields is consumed lazily and only changed listings are kept, so
+        memory grows with the size of the delta rather than the scan.
+        Returns {"added": [...], "repriced": [...], "removed": [ids],
+        "scanned": n}; added and repriced hold the current listings.
+        """
+        added: List[Dict[str, Any]] = []
+        repriced: List[Dict[str, Any]] = []
+        index: Dict[str, int] = {}
+        for landfield in landfields:
+            if landfield.get("id") is None:
+                continue
+            listing_id = str(landfield["id"])
+            if listing_id in index:
+                # Listings can shift between pages mid-scan; count each once
+                continue
+            digest = index[listing_id] = price_hash(landfield)
+            previous = self.index.get(listing_id)
+            if previous is None:
+                added.append(landfield)
+            elif previous != digest:
+                repriced.append(landfield)
+
+        removed = [listing_id for listing_id in self.index if listing_id not in index]
+        self.index = index
+        self.scanned_at = time.time()
+        return {"added": added, "repriced": repriced, "removed": removed, "scanned": len(index)}
+
+    def scan(self, cache_ttl: int = 0) -> Dict[str, Any]:
+        """
+        Scan every matching marketplace page, return the changes since the
+        previous scan and persist the new index.
+
+        cache_ttl defaults to 0 so pages are fetched (or revalidated) rather
+        than answered from the response cache. If the scan fails part way the
+        index is left untouched, so a partial scan never reports removals.
+        """
+        changes = self.diff(self.client.iter_market(
+            page_size=self.page_size, prefetch=True, cache_ttl=cache_ttl, **self.filters
+        ))
+        self.save()
+        return changes
@@ -0,0 +1,107 @@
+"""
+Circuit breakers for failing Earth2 endpoints.
+
+A breaker counts consecutive outage failures (timeouts, connection errors,
+5xx) for one endpoint category or host. After failure_threshold of them it
+opens and requests fail immediately with CircuitOpenError instead of each
+waiting for its own timeout. Once recovery_timeout has passed it half-opens
+and lets a limited number of probe requests through: a success closes it
+again, a failure re-opens it. Breakers are not thread-safe on their own;
+RateLimiter serializes access to them.
+"""
+
+from typing import Any, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    """Raised when a request is refused because its endpoint's circuit is open."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open state for one key.
+
+    half_open_probes limits concurrent probes while half-open. A probe that
+    never reports back (e.g. a cancelled task) stops blocking further probes
+    after recovery_timeout.
+    """
+
+    __slots__ = (
+        'failure_threshold', 'recovery_timeout', 'half_open_probes',
+        'state', 'failures', 'opened_at', 'probes', 'probe_started', 'times_opened'
+    )
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0, half_open_probes: int = 1):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_probes = half_open_probes
+        self.state = CLOSED
+        self.failures = 0
+        self.opened_at = 0.0
+        self.probes = 0
+        self.probe_started = 0.0
+        self.times_opened = 0
+
+    def wait(self, now: float) -> float:
+        """Seconds until the circuit will accept a request (0.0 if it would now), without taking a probe."""
+        if self.state == OPEN:
+            remaining = self.opened_at + self.recovery_timeout - now
+            if remaining > 0:
+                return remaining
+            return 0.0
+        if self.state == HALF_OPEN and self.probes >= self.half_open_probes:
+            return max(0.0, self.probe_started + self.recovery_timeout - now)
+        return 0.0
+
+    def allow(self, now: float) -> float:
+        """
+        Admit a request (0.0) or return the seconds until the circuit will
+        accept one. Admitting while half-open counts as a probe.
+        """
+        if self.state == CLOSED:
+            return 0.0
+        if self.state == OPEN:
+            remaining = self.opened_at + self.recovery_timeout - now
+            if remaining > 0:
+                return remaining
+            self.state = HALF_OPEN
+            self.probes = 0
+        if self.probes >= self.half_open_probes and now - self.probe_started < self.recovery_timeout:
+            return self.probe_started + self.recovery_timeout - now
+        self.probes += 1
+        self.probe_started = now
+        return 0.0
+
+    def record_success(self):
+        """The endpoint answered: close the circuit and reset the failure count."""
+        self.state = CLOSED
+        self.failures = 0
+        self.probes = 0
+
+    def record_failure(self, now: float):
+        """Count an outage failure, opening the circuit at the threshold or on a failed probe."""
+        self.failures += 1
+        if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+            if self.state != OPEN:
+                self.times_opened += 1
+            self.state = OPEN
+            self.opened_at = now
+            self.probes = 0
+
+    def snapshot(self, now: float) -> Dict[str, Any]:
+        """State, consecutive failures, times opened and seconds until the next probe."""
+        retry_in = max(0.0, self.opened_at + self.recovery_timeout - now) if self.state == OPEN else 0.0
+        return {
+            'state': self.state,
+            'failures': self.failures,
+            'times_opened': self.times_opened,
+            'retry_in': retry_in,
+        }
@@ -2,41 +2,14 @@ import json
 import os
 import typer
 import httpx
-from typing import Any, List, Optional
+from typing import List, Optional
 from rich.console import Console
 from rich.table import Table
 
+from .cache import SQLiteCache
 from .client import Earth2Client
-
-
-def _to_int(value: Any) -> int:
-    try:
-        if value is None or value == "":
-            return 0
-        if isinstance(value, bool):
-            return int(value)
-        if isinstance(value, (int, float)):
-            return int(value)
-        if isinstance(value, str):
-            return int(value)
-        return 0
-    except Exception:
-        return 0
-
-
-def _to_float(value: Any) -> float:
-    try:
-        if value is None or value == "":
-            return 0.0
-        if isinstance(value, bool):
-            return float(value)
-        if isinstance(value, (int, float)):
-            return float(value)
-        if isinstance(value, str):
-            return float(value)
-        return 0.0
-    except Exception:
-        return 0.0
+from .models import Landfield, TrendingPlace
+from .rate_limiter import get_rate_limiter
 
 
 app = typer.Typer(help="Earth2 API CLI (Python)")
@@ -44,6 +17,10 @@ console = Console()
 
 
 def _client_from_env() -> Earth2Client:
+    # E2_CACHE_DIR enables an on-disk response cache shared between CLI runs
+    cache_dir = os.getenv("E2_CACHE_DIR")
+    if cache_dir:
+        get_rate_limiter().use_persistent_cache(SQLiteCache.in_directory(cache_dir))
     return Earth2Client(cookie_jar=os.getenv("E2_COOKIE"), csrf_token=os.getenv("E2_CSRF"))
 
 
@@ -145,7 +122,8 @@ def trending(json_output: bool = typer.Option(False, "--json", help="Output raw
 
     console.print("\n🌍 [bold blue]Trending Places[/bold blue]\n")
 
-    if not res["data"]:
+    places = TrendingPlace.wrap(res["data"])
+    if not places:
         log_info("No trending places found")
         return
 
@@ -157,15 +135,14 @@ def trending(json_output: bool = typer.Option(False, "--json", help="Output raw
     table.add_column("Tile Price")
     table.add_column("Days")
 
-    for place in res["data"]:
-        attrs = place.get("attributes", {})
+    for place in places:
         table.add_row(
-            attrs.get("placeName") or "N/A",
-            attrs.get("country") or "N/A",
-            f"T{attrs['landfieldTier']}" if attrs.get("landfieldTier") else "N/A",
-            format_number(attrs["tilesSold"]) if attrs.get("tilesSold") else "N/A",
-            format_price(attrs["tilePrice"]) if attrs.get("tilePrice") else "N/A",
-            format_number(attrs["timeframeDays"]) if attrs.get("timeframeDays") else "N/A"
+            place.place_name or "N/A",
+            place.country or "N/A",
+            f"T{place.tier}" if place.tier else "N/A",
+            format_number(place.tiles_sold) if place.tiles_sold else "N/A",
+            format_price(place.tile_price) if place.tile_price else "N/A",
+            format_number(place.timeframe_days) if place.timeframe_days else "N/A"
         )
 
     console.print(table)
@@ -217,7 +194,7 @@ def market(
     console.print("\n🏪 [bold blue]Marketplace Search Results[/bold blue]\n")
     log_info(f"Found {format_number(res['count'])} total properties")
 
-    landfields = res.get("landfields", [])
+    landfields = Landfield.wrap(res.get("landfields"))
     if not landfields:
         log_info("No properties match your search criteria")
         return
@@ -234,27 +211,22 @@ def market(
     items_limit = int(items)
 
     for item in landfields[:items_limit]:  # Show requested number of items
-        description = (item.get("description") or "N/A")
+        description = item.description or "N/A"
         if len(description) > 30:
             description = description[:27] + "..."
 
-        location = (item.get("location") or "N/A")
+        location = item.location or "N/A"
         if len(location) > 25:
             location = location[:22] + "..."
 
-        # Calculate price per tile with safe numeric parsing
-        price_value = _to_float(item.get("price"))
-        tile_count_value = _to_int(item.get("tileCount"))
-        ppt_value = price_value / tile_count_value if tile_count_value > 0 else 0.0
-
         table.add_row(
             description,
             location,
-            item.get("country") or "N/A",
-            f"T{item['tier']}" if item.get("tier") else "N/A",
-            format_number(item["tileCount"]) if item.get("tileCount") else "N/A",
-            format_price(item["price"]) if item.get("price") else "N/A",
-            format_price(ppt_value) if ppt_value > 0 else "N/A"
+            item.country or "N/A",
+            f"T{item.tier}" if item.tier else "N/A",
+            format_number(item.tile_count) if item.tile_count else "N/A",
+            format_price(item.price) if item.price else "N/A",
+            format_price(item.price_per_tile) if item.price_per_tile else "N/A"
         )
 
     console.print(table)
@@ -263,6 +235,169 @@ def market(
         log_info(f"Showing first {items_limit} of {len(landfields)} results. Use --json to see all.")
 
 
+@app.command()
+def market_export(
+    output: str = typer.Argument(..., help="Output file (.parquet, or .arrow for Arrow IPC)"),
+    country: str = typer.Option(None),
+    tier: str = typer.Option(None),
+    tile_class: str = typer.Option(None),
+    tile_count: str = typer.Option(None),
+    search: str = typer.Option(""),
+    term: List[str] = typer.Option(None),
+    page_size: int = typer.Option(100, help="Listings requested per marketplace page"),
+    limit: Optional[int] = typer.Option(None, help="Stop after this many listings"),
+    file_format: Optional[str] = typer.Option(None, "--format", help="parquet or arrow (default: from extension)")
+):
+    """Stream all marketplace pages into a columnar Parquet/Arrow file"""
+    from .export import export_market
+
+    client = _client_from_env()
+    log_info("Streaming marketplace pages (waiting for rate limit slots as needed)...")
+    try:
+        rows = export_market(
+            client,
+            output,
+            format=file_format,
+            page_size=page_size,
+            limit=limit,
+            country=country,
+            landfieldTier=tier,
+            tileClass=tile_class,
+            tileCount=tile_count,
+            search=search,
+            searchTerms=term or [],
+        )
+    except (ImportError, ValueError) as e:
+        log_error(str(e))
+        raise typer.Exit(1)
+
+    log_success(f"Exported {format_number(rows)} listings to {output}")
+
+
+@app.command()
+def market_floors(
+    country: List[str] = typer.Option(None, help="Country code (repeat for several; default: all countries)"),
+    tier: List[str] = typer.Option(["1", "2"], help="Landfield tier (repeatable)"),
+    tile_class: List[str] = typer.Option(["1", "2", "3", "4", "5"], help="Tile class for tier 1 (repeatable)"),
+    tile_count: List[str] = typer.Option(None, help="Tile count range such as 5-50 (repeatable)"),
+    workers: int = typer.Option(4, help="Concurrent floor lookups"),
+    json_output: bool = typer.Option(False, "--json", help="Output raw JSON")
+):
+    """Floor price per tile for every country x tier x tile class segment"""
+    client = _client_from_env()
+    segments = client.market_floor_grid(country or [None], tier, tile_class, tile_count or [None])
+    if not json_output:
+        log_info(f"Fetching {len(segments)} segments (waiting for rate limit slots as needed)...")
+    res = client.get_market_floors(segments, max_workers=workers)
+
+    if json_output:
+        typer.echo(json.dumps(res, indent=2))
+        return
+
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("Country")
+    table.add_column("Tier")
+    table.add_column("Class")
+    table.add_column("Tiles")
+    table.add_column("Listings")
+    table.add_column("Floor/Tile")
+    table.add_column("Floor Listing")
+
+    for row in res["data"]:
+        floor = row["floor_price_per_tile"]
+        table.add_row(
+            row["country"] or "All",
+            f"T{row['landfieldTier']}" if row["landfieldTier"] else "All",
+            row["tileClass"] or "-",
+            row["tileCount"] or "Any",
+            format_number(row["count"]) if isinstance(row["count"], int) else "N/A",
+            format_price(floor) if floor is not None else "N/A",
+            row["id"] or "N/A"
+        )
+
+    console.print(table)
+    for segment, message in res["errors"].items():
+        log_error(f"{segment}: {message}")
+
+
+@app.command()
+def market_changes(
+    country: str = typer.Option(None),
+    tier: str = typer.Option(None),
+    tile_class: str = typer.Option(None),
+    tile_count: str = typer.Option(None),
+    search: str = typer.Option(""),
+    term: List[str] = typer.Option(None),
+    index_file: Optional[str] = typer.Option(
+        None, "--index", help="Index file (default: per-filter file in E2_CACHE_DIR or ~/.cache/earth2-api-wrapper)"
+    ),
+    page_size: int = typer.Option(100, help="Listings requested per marketplace page"),
+    json_output: bool = typer.Option(False, "--json", help="Output raw JSON")
+):
+    """Show listings added, removed or repriced since the previous scan"""
+    from .changefeed import MarketChangeFeed, default_index_path
+
+    filters = {
+        "country": country,
+        "landfieldTier": tier,
+        "tileClass": tile_class,
+        "tileCount": tile_count,
+        "search": search,
+        "searchTerms": term or [],
+    }
+    if index_file is None:
+        index_file = default_index_path({k: v for k, v in filters.items() if v not in (None, "", [])})
+        cache_dir = os.getenv("E2_CACHE_DIR")
+        if cache_dir:
+            index_file = os.path.join(cache_dir, os.path.basename(index_file))
+
+    client = _client_from_env()
+    feed = MarketChangeFeed(client, index_path=index_file, page_size=page_size, **filters)
+    first_scan = feed.scanned_at is None
+    if not json_output:
+        log_info("Scanning marketplace pages (waiting for rate limit slots as needed)...")
+    changes = feed.scan()
+
+    if json_output:
+        typer.echo(json.dumps(changes, indent=2))
+        return
+
+    if first_scan:
+        log_success(f"Indexed {format_number(changes['scanned'])} listings; later runs will show changes")
+        return
+
+    log_info(
+        f"{format_number(changes['scanned'])} listings: {len(changes['added'])} new, "
+        f"{len(changes['repriced'])} repriced, {len(changes['removed'])} removed"
+    )
+    if not changes["added"] and not changes["repriced"] and not changes["removed"]:
+        return
+
+    table = Table(show_header=True, header_style="bold cyan")
+    table.add_column("Change")
+    table.add_column("ID")
+    table.add_column("Description", max_width=30)
+    table.add_column("Tiles")
+    table.add_column("Price")
+
+    for change, rows in (("new", changes["added"]), ("repriced", changes["repriced"])):
+        for item in Landfield.wrap(rows):
+            description = item.description or "N/A"
+            if len(description) > 30:
+                description = description[:27] + "..."
+            table.add_row(
+                change,
+                str(item.id),
+                description,
+                format_number(item.tile_count) if item.tile_count else "N/A",
+                format_price(item.price) if item.price else "N/A"
+            )
+    for listing_id in changes["removed"]:
+        table.add_row("removed", listing_id, "", "", "")
+
+    console.print(table)
+
+
 @app.command()
 def leaderboard_players(**params):
     """Get players leaderboard"""
@@ -345,8 +480,13 @@ def stats():
 
     table.add_row("Total Requests", format_number(stats.get("total_requests", 0)))
     table.add_row("Blocked Requests", format_number(stats.get("blocked_requests", 0)))
+    table.add_row("Retried Requests", format_number(stats.get("retried_requests", 0)))
     table.add_row("Current RPM", format_number(stats.get("current_rpm", 0)))
     table.add_row("Cache Size", format_number(stats.get("cache_size", 0)))
+    table.add_row("Cache Hits", format_number(stats.get("cache_hits", 0)))
+    table.add_row("Cache Misses", format_number(stats.get("cache_misses", 0)))
+    table.add_row("Cache Evictions", format_number(stats.get("cache_evictions", 0)))
+    table.add_row("JSON Backend", str(stats.get("json_backend", "json")))
     table.add_row("Efficiency", f"{stats.get('efficiency', 0):.1f}%")
 
     console.print(table)
@@ -364,6 +504,50 @@ def stats():
 
         console.print(error_table)
 
+    circuits = stats.get("circuits", {})
+    if circuits:
+        console.print("\n🔌 [bold yellow]Circuit Breakers[/bold yellow]\n")
+        circuit_table = Table(show_header=True, header_style="bold yellow")
+        circuit_table.add_column("Endpoint")
+        circuit_table.add_column("State")
+        circuit_table.add_column("Consecutive Failures")
+        circuit_table.add_column("Times Opened")
+        circuit_table.add_column("Retry In")
+
+        for endpoint, circuit in circuits.items():
+            circuit_table.add_row(
+                endpoint,
+                circuit["state"],
+                format_number(circuit["failures"]),
+                format_number(circuit["times_opened"]),
+                f"{circuit['retry_in']:.1f}s" if circuit["retry_in"] else "-"
+            )
+
+        console.print(circuit_table)
+
+    adaptive_limits = stats.get("adaptive_limits", {})
+    if adaptive_limits:
+        console.print("\n📈 [bold yellow]Adaptive Limits[/bold yellow]\n")
+        adaptive_table = Table(show_header=True, header_style="bold yellow")
+        adaptive_table.add_column("Endpoint Category")
+        adaptive_table.add_column("Limit (per min)")
+        adaptive_table.add_column("Ceiling")
+        adaptive_table.add_column("Avg Latency")
+        adaptive_table.add_column("Increases")
+        adaptive_table.add_column("Decreases")
+
+        for endpoint, adaptive in adaptive_limits.items():
+            adaptive_table.add_row(
+                endpoint,
+                format_number(adaptive["limit"]),
+                format_number(int(adaptive["ceiling"])),
+                f"{adaptive['latency'] * 1000:.0f}ms",
+                format_number(adaptive["increases"]),
+                format_number(adaptive["decreases"])
+            )
+
+        console.print(adaptive_table)
+
 
 @app.command()
 def clear_cache():
@@ -374,15 +558,28 @@ def clear_cache():
 
 
 @app.command()
-def set_cache_ttl(seconds: int = typer.Argument(..., help="Cache TTL in seconds")):
+def set_cache_ttl(
+    seconds: int = typer.Argument(..., help="Cache TTL in seconds"),
+    category: Optional[str] = typer.Option(
+        None, "--category", "-c", help="Only set the TTL for this endpoint category (e.g. property, search)"
+    )
+):
     """Set cache time-to-live in seconds"""
     if seconds < 0:
         log_error("Cache TTL must be non-negative")
         raise typer.Exit(1)
 
+    categories = get_rate_limiter()._endpoint_limits
+    if category is not None and category not in categories:
+        log_error(f"Unknown endpoint category '{category}'. Choose from: {', '.join(categories)}")
+        raise typer.Exit(1)
+
     client = _client_from_env()
-    client.set_cache_ttl(seconds)
-    log_success(f"Cache TTL set to {seconds} seconds")
+    client.set_cache_ttl(seconds, category)
+    if category:
+        log_success(f"Cache TTL for {category} set to {seconds} seconds")
+    else:
+        log_success(f"Cache TTL set to {seconds} seconds")
 
 
 if __name__ == "__main__":
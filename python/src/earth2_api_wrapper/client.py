@@ -1,24 +1,54 @@
 from __future__ import annotations
 
 import re
-from typing import Any, Dict, List, Optional
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
 
 import httpx
-from .rate_limiter import get_rate_limiter
+from .conversions import to_float, to_int
+from .decoding import loads
+from .circuit_breaker import CircuitOpenError
+from .rate_limiter import RateLimitExceeded, RateLimiter, Reservation, get_rate_limiter
+from .retry import RetryPolicy
+from .scheduler import propagate
+from .singleflight import AsyncSingleFlight, SingleFlight
+from .transport import ConnectionSettings, shared_transport
 
+if TYPE_CHECKING:
+    from .analytics import MarketBatch
+
+# Filters that identify a market floor segment (the get_market_floor params)
+FLOOR_SEGMENT_KEYS = ("country", "tileCount", "landfieldTier", "tileClass")
+
+
+class _Earth2ClientBase:
+    """Transport-independent pieces shared by the sync and async clients."""
+
+    _rate_limiter: Optional[RateLimiter]
+    _single_flight: Optional[Union[SingleFlight, AsyncSingleFlight]] = None
 
-class Earth2Client:
     def __init__(
         self,
         cookie_jar: Optional[str] = None,
         csrf_token: Optional[str] = None,
-        client: Optional[httpx.Client] = None,
-        respect_rate_limits: bool = True
+        respect_rate_limits: bool = True,
+        wait_for_rate_limit: bool = False,
+        max_rate_limit_wait: Optional[float] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        retry_requests: bool = True,
+        retry_policy: Optional[RetryPolicy] = None
     ):
         self.cookie_jar = cookie_jar
         self.csrf_token = csrf_token
-        self._client = client or httpx.Client(timeout=30)
-        self._rate_limiter = get_rate_limiter() if respect_rate_limits else None
+        # A dedicated limiter (e.g. a different engine) can be supplied; the shared global one is the default
+        self._rate_limiter = (rate_limiter or get_rate_limiter()) if respect_rate_limits else None
+        # When enabled, rate-limited requests sleep until a slot frees up instead of raising
+        self._wait_for_rate_limit = wait_for_rate_limit
+        self._max_rate_limit_wait = max_rate_limit_wait
+        # Retryable failures are retried per request with jittered backoff (see retry.RetryPolicy)
+        self._retry_policy = (retry_policy or RetryPolicy()) if retry_requests else None
+        self._retried_requests = 0
 
     def _headers(self) -> Dict[str, str]:
         headers = {
@@ -44,6 +74,355 @@ class Earth2Client:
         url = url.replace('psid:', 'psid=')
         return url
 
+    @staticmethod
+    def _query_url(url: str, params: Dict[str, Any]) -> str:
+        """Append non-empty query parameters to a URL"""
+        query_string = "&".join(f"{k}={v}" for k, v in params.items() if v is not None)
+        return f"{url}?{query_string}" if query_string else url
+
+    def _market_url(
+        self,
+        country: Optional[str] = None,
+        landfieldTier: Optional[str] = None,
+        tileClass: Optional[str] = None,
+        tileCount: Optional[str] = None,
+        page: int = 1,
+        items: int = 100,
+        search: str = "",
+        searchTerms: Optional[List[str]] = None,
+        **kwargs
+    ) -> str:
+        """Build the marketplace search URL"""
+        params: Dict[str, Any] = {
+            "page": page,
+            "items": items,
+            "search": search,
+        }
+
+        if country:
+            params["country"] = country
+        if landfieldTier:
+            params["landfieldTier"] = landfieldTier
+        if tileClass:
+            params["tileClass"] = tileClass
+        if tileCount:
+            params["tileCount"] = tileCount
+        if searchTerms:
+            params["searchTerms"] = searchTerms
+
+        params.update(kwargs)
+
+        return self._query_url("https://r.earth2.io/marketplace", params)
+
+    def _market_floor_url(self, params: Dict[str, str]) -> str:
+        """Build the marketplace URL used for floor price lookups"""
+        url = "https://r.earth2.io/marketplace"
+        query_params = {
+            "items": "24",
+            "page": "1",
+            "search": "",
+            "sorting": "price_per_tile"
+        }
+
+        if params.get("country"):
+            query_params["country"] = params["country"]
+        if params.get("tileCount"):
+            query_params["tileCount"] = params["tileCount"]
+        if params.get("landfieldTier"):
+            query_params["landfieldTier"] = params["landfieldTier"]
+        if params.get("tileClass") and params.get("landfieldTier") == "1":
+            query_params["tileClass"] = params["tileClass"]
+        query_string = "&".join(f"{k}={v}" for k, v in query_params.items())
+        return f"{url}?{query_string}"
+
+    @staticmethod
+    def market_floor_grid(
+        countries: Sequence[Optional[str]],
+        tiers: Sequence[str] = ("1", "2"),
+        tile_classes: Sequence[str] = ("1", "2", "3", "4", "5"),
+        tile_counts: Sequence[Optional[str]] = (None,)
+    ) -> List[Dict[str, str]]:
+        """
+        Build get_market_floors segments for every country x tier x tileClass
+        (x tileCount) combination. tileClass only applies to tier 1, so other
+        tiers get one segment per country and tileCount.
+        """
+        segments = []
+        for country in countries:
+            for tier in tiers:
+                for tile_count in tile_counts:
+                    for tile_class in tile_classes if str(tier) == "1" else (None,):
+                        segment = {
+                            "country": country,
+                            "tileCount": tile_count,
+                            "landfieldTier": tier,
+                            "tileClass": tile_class,
+                        }
+                        segments.append({k: str(v) for k, v in segment.items() if v not in (None, "")})
+        return segments
+
+    def _unique_floor_segments(self, segments: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+        """
+        Normalize floor segments to string params and drop the ones that map
+        to the same marketplace query, keeping the first occurrence's position
+        """
+        unique: Dict[str, Dict[str, str]] = {}
+        for segment in segments:
+            params = {key: str(segment[key]) for key in FLOOR_SEGMENT_KEYS if segment.get(key) not in (None, "")}
+            if params.get("landfieldTier") != "1":
+                params.pop("tileClass", None)
+            unique.setdefault(self._market_floor_url(params), params)
+        return list(unique.values())
+
+    @staticmethod
+    def _floor_row(params: Dict[str, str], result: Dict[str, Any]) -> Dict[str, Any]:
+        """Summarize one floor lookup as a table row with the cheapest price per tile"""
+        floor: Optional[Tuple[float, Any]] = None
+        for item in result.get("landfields") or []:
+            tile_count = to_int(item.get("tileCount"))
+            if tile_count <= 0:
+                continue
+            price_per_tile = to_float(item.get("price")) / tile_count
+            if floor is None or price_per_tile < floor[0]:
+                floor = (price_per_tile, item.get("id"))
+
+        row: Dict[str, Any] = {key: params.get(key) for key in FLOOR_SEGMENT_KEYS}
+        row["count"] = result.get("count")
+        row["floor_price_per_tile"] = floor[0] if floor else None
+        row["id"] = floor[1] if floor else None
+        return row
+
+    def _floors_result(self, unique: List[Dict[str, str]], outcomes: List[Any]) -> Dict[str, Any]:
+        """Turn per-segment outcomes into floor rows and per-segment errors"""
+        labels = ["&".join(f"{k}={v}" for k, v in params.items()) or "all" for params in unique]
+        rows = [
+            outcome if isinstance(outcome, BaseException) else self._floor_row(params, outcome)
+            for params, outcome in zip(unique, outcomes)
+        ]
+        return self._bulk_result(labels, rows)
+
+    def _flight_key(self, url: str, wait: Optional[bool] = None) -> str:
+        """
+        Key identifying identical in-flight requests: the response cache key,
+        plus whether the call waits for a rate limit slot, so a waiting
+        caller never shares a non-waiting one's RateLimitExceeded
+        """
+        key = self._rate_limiter._get_cache_key(url, 'GET') if self._rate_limiter else url
+        if wait is None:
+            wait = self._wait_for_rate_limit
+        return f"{key}#wait" if wait else key
+
+    @staticmethod
+    def _cache_validators(response: httpx.Response) -> Dict[str, str]:
+        """ETag / Last-Modified headers used to revalidate a cached response"""
+        return {name: response.headers[name] for name in ("ETag", "Last-Modified") if name in response.headers}
+
+    def _handle_response(
+        self,
+        url: str,
+        response: httpx.Response,
+        revalidation: Optional[Tuple[Any, Dict[str, str]]],
+        cache_ttl: Optional[float],
+        reservation: Optional[Reservation] = None
+    ) -> Dict[str, Any]:
+        """Turn an HTTP response into JSON, recording and caching it"""
+        if self._rate_limiter:
+            self._rate_limiter.observe_response(
+                url, response.status_code, self._elapsed(response), response.headers
+            )
+
+        if revalidation is not None and response.status_code == 304:
+            # Cached copy is still current: refresh it without a full fetch
+            cached_response, conditional_headers = revalidation
+            validators = self._cache_validators(response) or {
+                "ETag": conditional_headers.get("If-None-Match", ""),
+                "Last-Modified": conditional_headers.get("If-Modified-Since", ""),
+            }
+            if self._rate_limiter:
+                self._commit(url, reservation, full_fetch=False)
+                self._rate_limiter.refresh_cached_response(
+                    url, cached_response, ttl=cache_ttl, validators={k: v for k, v in validators.items() if v}
+                )
+            return cached_response
+
+        response.raise_for_status()
+        content = response.content
+        result = loads(content)
+
+        if self._rate_limiter:
+            self._commit(url, reservation)
+            self._rate_limiter.cache_response(
+                url,
+                'GET',
+                result,
+                size=len(content),
+                ttl=cache_ttl,
+                validators=self._cache_validators(response),
+                raw=content
+            )
+
+        return result
+
+    def _commit(self, url: str, reservation: Optional[Reservation], full_fetch: bool = True):
+        """Count a successful request against its reservation (or record it if it had none)"""
+        assert self._rate_limiter is not None
+        if reservation is not None:
+            self._rate_limiter.commit(reservation, full_fetch)
+        else:
+            self._rate_limiter.record_request(url, 'GET', full_fetch=full_fetch)
+
+    @staticmethod
+    def _elapsed(response: httpx.Response) -> Optional[float]:
+        """Seconds from sending the request to reading the response, if httpx measured it"""
+        try:
+            return response.elapsed.total_seconds()
+        except RuntimeError:
+            return None
+
+    def _record_failure(self, url: str, error: Exception, reservation: Optional[Reservation] = None):
+        """
+        Feed a failed request into the rate limiter. Outages (transport
+        errors, 5xx) count toward the endpoint's circuit breaker. Without
+        retries this is also the category-wide error backoff; with retries
+        the backoff belongs to the failing request and only a server-sent
+        Retry-After pauses the whole category. Timeouts also lower an
+        adaptive limiter's endpoint limit. A request that never reached the
+        server gives its reserved slot back.
+        """
+        if not self._rate_limiter:
+            return
+        if reservation is not None and isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)):
+            self._rate_limiter.release(reservation)
+        if isinstance(error, httpx.TimeoutException):
+            self._rate_limiter.observe_response(url, None)
+        if self._is_outage(error):
+            self._rate_limiter.record_circuit_failure(url)
+        else:
+            self._rate_limiter.record_circuit_success(url)
+        if self._retry_policy is None:
+            status_code = None
+            if hasattr(error, 'response') and hasattr(error.response, 'status_code'):
+                status_code = error.response.status_code
+            self._rate_limiter.record_error(url, status_code)
+            return
+        retry_after = self._retry_policy.retry_after(error)
+        if retry_after:
+            self._rate_limiter.record_retry_after(url, retry_after)
+
+    @staticmethod
+    def _is_outage(error: Exception) -> bool:
+        """Whether a failure means the endpoint is unavailable (rather than rejecting this request)"""
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code >= 500
+        return isinstance(error, httpx.TransportError)
+
+    def _retry_delay(self, error: Exception, attempt: int, previous_delay: float, started: float) -> Optional[float]:
+        """Seconds to sleep before retrying a failed request, or None to re-raise"""
+        if self._retry_policy is None:
+            return None
+        delay = self._retry_policy.next_delay(error, attempt, previous_delay, time.monotonic() - started)
+        if delay is not None:
+            self._retried_requests += 1
+        return delay
+
+    @staticmethod
+    def _is_last_market_page(result: Dict[str, Any], page_size: int, fetched: int) -> bool:
+        """Whether a marketplace page is the final one, given the listings fetched so far"""
+        landfields = result.get("landfields") or []
+        if len(landfields) < page_size:
+            return True
+        count = result.get("count")
+        return isinstance(count, int) and fetched >= count
+
+    @staticmethod
+    def _bulk_result(unique_ids: List[str], outcomes: List[Any]) -> Dict[str, Any]:
+        """Split per-ID outcomes into ordered results and per-ID errors"""
+        data: List[Dict[str, Any]] = []
+        errors: Dict[str, str] = {}
+        for uid, outcome in zip(unique_ids, outcomes):
+            if isinstance(outcome, BaseException):
+                errors[uid] = str(outcome) or type(outcome).__name__
+            else:
+                data.append(outcome)
+        return {"data": data, "errors": errors}
+
+    def get_rate_limit_stats(self) -> Dict[str, Any]:
+        """Get rate limiting statistics and usage information"""
+        if not self._rate_limiter:
+            return {"rate_limiting": "disabled"}
+        stats = self._rate_limiter.get_stats()
+        stats["coalesced_requests"] = self._single_flight.shared if self._single_flight is not None else 0
+        stats["retried_requests"] = self._retried_requests
+        return stats
+
+    def clear_cache(self):
+        """Clear the response cache"""
+        if self._rate_limiter:
+            self._rate_limiter.clear_cache()
+
+    def set_cache_ttl(self, seconds: int, endpoint_category: Optional[str] = None):
+        """
+        Set cache time-to-live in seconds, optionally only for one endpoint
+        category ('search', 'property', 'leaderboard', 'user', 'resources', ...)
+        """
+        if self._rate_limiter:
+            self._rate_limiter.set_cache_ttl(seconds, endpoint_category)
+
+
+class Earth2Client(_Earth2ClientBase):
+    def __init__(
+        self,
+        cookie_jar: Optional[str] = None,
+        csrf_token: Optional[str] = None,
+        client: Optional[httpx.Client] = None,
+        respect_rate_limits: bool = True,
+        wait_for_rate_limit: bool = False,
+        max_rate_limit_wait: Optional[float] = None,
+        rate_limiter: Optional[RateLimiter] = None,
+        coalesce_requests: bool = True,
+        connection: Optional[ConnectionSettings] = None,
+        share_connections: bool = False,
+        retry_requests: bool = True,
+        retry_policy: Optional[RetryPolicy] = None
+    ):
+        """
+        connection sets the pool limits, timeouts and HTTP/2 for the HTTP
+        client created here (ignored when client is given). With
+        share_connections=True the client uses the process-wide pooled
+        transport for those settings, so many Earth2Client instances reuse
+        the same connections while keeping their own cookies.
+
+        Timeouts, network errors, 429 and 5xx responses are retried according
+        to retry_policy (default RetryPolicy()); retry_requests=False disables
+        retries and restores category-wide error backoff.
+        """
+        super().__init__(
+            cookie_jar,
+            csrf_token,
+            respect_rate_limits,
+            wait_for_rate_limit,
+            max_rate_limit_wait,
+            rate_limiter,
+            retry_requests,
+            retry_policy
+        )
+        # Concurrent identical GETs share one network call
+        self._single_flight: Optional[SingleFlight] = SingleFlight() if coalesce_requests else None
+        if client is None:
+            settings = connection or ConnectionSettings()
+            client = settings.create_client(shared_transport(settings) if share_connections else None)
+        self._client = client
+
+    def __enter__(self) -> "Earth2Client":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Close the underlying HTTP client (a shared transport stays open for other clients)"""
+        self._client.close()
+
     def authenticate(self, email: str, password: str) -> Dict[str, Any]:
         """
         Authenticate with email/password using Earth2's Kinde OAuth flow.
@@ -52,13 +431,15 @@ class Earth2Client:
         If your account has 2FA enabled, this will fail. Use manual cookie
         extraction instead (see documentation).
         """
-        # Rate limit authentication attempts to prevent abuse
+        # Rate limit authentication attempts to prevent abuse; the slot is taken before logging in
+        reservation = None
         if self._rate_limiter:
-            can_proceed, reason, _ = self._rate_limiter.can_make_request('https://app.earth2.io/login', 'POST')
-            if not can_proceed:
+            try:
+                reservation = self._rate_limiter.reserve('https://app.earth2.io/login')
+            except RateLimitExceeded as error:
                 return {
                     "success": False,
-                    "message": f"Authentication rate limited: {reason}"
+                    "message": f"Authentication rate limited: {error}"
                 }
 
         try:
@@ -279,8 +660,8 @@ class Earth2Client:
             # Store cookies
             self.cookie_jar = "; ".join(all_cookies)
 
-            if self._rate_limiter:
-                self._rate_limiter.record_request('https://app.earth2.io/login', 'POST')
+            if self._rate_limiter and reservation is not None:
+                self._rate_limiter.commit(reservation)
 
             return {
                 "success": True,
@@ -289,6 +670,10 @@ class Earth2Client:
 
         except Exception as error:
             if self._rate_limiter:
+                # Failed attempts keep their slot unless the login page was never reached
+                unsent = isinstance(error, (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout))
+                if reservation is not None and unsent:
+                    self._rate_limiter.release(reservation)
                 self._rate_limiter.record_error('https://app.earth2.io/login')
 
             return {
@@ -325,51 +710,112 @@ class Earth2Client:
                 "error": "Network error"
             }
 
-    def _get_json(self, url: str) -> Dict[str, Any]:
-        """Helper method to get JSON from an API endpoint with rate limiting"""
-        if self._rate_limiter:
-            can_proceed, reason, cached_response = self._rate_limiter.can_make_request(url, 'GET')
+    def _get_json(
+        self,
+        url: str,
+        wait: Optional[bool] = None,
+        cache_ttl: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Helper method to get JSON from an API endpoint with rate limiting.
+
+        Concurrent calls for the same URL are coalesced into one request whose
+        result (or error) they all share.
+        """
+        if self._single_flight is None:
+            return self._fetch_with_retry(url, wait, cache_ttl)
+        return self._single_flight.do(
+            self._flight_key(url, wait), lambda: self._fetch_with_retry(url, wait, cache_ttl)
+        )
+
+    def _fetch_with_retry(
+        self,
+        url: str,
+        wait: Optional[bool] = None,
+        cache_ttl: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """_fetch_json, retrying retryable failures after the retry policy's delay"""
+        started = time.monotonic()
+        attempt = 1
+        delay = 0.0
+        while True:
+            try:
+                return self._fetch_json(url, wait, cache_ttl)
+            except Exception as error:
+                next_delay = self._retry_delay(error, attempt, delay, started)
+                if next_delay is None:
+                    raise
+                delay = next_delay
+            time.sleep(delay)
+            attempt += 1
+
+    def _fetch_json(
+        self,
+        url: str,
+        wait: Optional[bool] = None,
+        cache_ttl: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """
+        Fetch JSON from an API endpoint with rate limiting.
+
+        With wait=True (default: the client's wait_for_rate_limit setting) a
+        rate-limited request sleeps until the limiter has room, queued behind
+        waiting requests of equal or higher priority (see
+        scheduler.scheduling), instead of raising RateLimitExceeded.
 
+        cache_ttl overrides the endpoint's cache TTL for this call: cached
+        responses older than it are ignored and the fresh response is cached
+        for that long.
+        """
+        reservation = None
+        if self._rate_limiter:
+            if wait is None:
+                wait = self._wait_for_rate_limit
+            cached_response = self._rate_limiter.get_cached_response(url, max_age=cache_ttl)
             if cached_response is not None:
                 return cached_response
 
-            if not can_proceed:
-                raise Exception(f"Rate limit exceeded: {reason}")
+            # Fail fast while the endpoint's circuit breaker is open, before taking or queueing for a slot
+            self._rate_limiter.check_circuit(url, admit=False)
 
-        try:
-            response = self._client.get(url, headers=self._headers(), follow_redirects=True)
-            response.raise_for_status()
-            result = response.json()
+            # Take the slot up front so concurrent requests can't all slip past the limits
+            reservation = self._rate_limiter.reserve(url, wait=wait, timeout=self._max_rate_limit_wait)
 
-            if self._rate_limiter:
-                self._rate_limiter.record_request(url, 'GET')
-                self._rate_limiter.cache_response(url, 'GET', result)
+            # Admit the request (a probe if half-open); the circuit may have opened while it waited
+            try:
+                self._rate_limiter.check_circuit(url)
+            except CircuitOpenError:
+                self._rate_limiter.release(reservation)
+                raise
+
+        revalidation = self._rate_limiter.get_revalidation(url) if self._rate_limiter else None
+        headers = self._headers()
+        if revalidation is not None:
+            headers.update(revalidation[1])
 
-            return result
+        try:
+            response = self._client.get(url, headers=headers, follow_redirects=True)
+            return self._handle_response(url, response, revalidation, cache_ttl, reservation)
 
         except Exception as e:
-            if self._rate_limiter:
-                status_code = None
-                if hasattr(e, 'response') and hasattr(e.response, 'status_code'):
-                    status_code = e.response.status_code
-                self._rate_limiter.record_error(url, status_code)
+            self._record_failure(url, e, reservation)
             raise
 
-    def get_landing_metrics(self) -> Dict[str, Any]:
+    def get_landing_metrics(self, cache_ttl: Optional[int] = None) -> Dict[str, Any]:
         """Get landing page metrics"""
-        return self._get_json("https://r.earth2.io/landing/metrics")
+        return self._get_json("https://r.earth2.io/landing/metrics", cache_ttl=cache_ttl)
 
-    def get_trending_places(self, days: int = 30) -> Dict[str, Any]:
+    def get_trending_places(self, days: int = 30, cache_ttl: Optional[int] = None) -> Dict[str, Any]:
         """Get trending places"""
-        return self._get_json("https://r.earth2.io/landing/trending_places")
+        return self._get_json("https://r.earth2.io/landing/trending_places", cache_ttl=cache_ttl)
 
-    def get_territory_release_winners(self) -> Dict[str, Any]:
+    def get_territory_release_winners(self, cache_ttl: Optional[int] = None) -> Dict[str, Any]:
         """Get territory release winners"""
-        return self._get_json("https://r.earth2.io/landing/territory_release_winners")
+        return self._get_json("https://r.earth2.io/landing/territory_release_winners", cache_ttl=cache_ttl)
 
-    def get_property(self, property_id: str) -> Dict[str, Any]:
+    def get_property(self, property_id: str, cache_ttl: Optional[int] = None) -> Dict[str, Any]:
         """Get property details by ID"""
-        return self._get_json(f"https://r.earth2.io/landfields/{property_id}")
+        return self._get_json(f"https://r.earth2.io/landfields/{property_id}", cache_ttl=cache_ttl)
 
     def search_market(
         self,
@@ -381,108 +827,207 @@ class Earth2Client:
         items: int = 100,
         search: str = "",
         searchTerms: Optional[List[str]] = None,
+        cache_ttl: Optional[int] = None,
         **kwargs
     ) -> Dict[str, Any]:
         """Search marketplace"""
-        params = {
-            "page": page,
-            "items": items,
-            "search": search,
-        }
+        full_url = self._market_url(
+            country=country,
+            landfieldTier=landfieldTier,
+            tileClass=tileClass,
+            tileCount=tileCount,
+            page=page,
+            items=items,
+            search=search,
+            searchTerms=searchTerms,
+            **kwargs
+        )
+        return self._get_json(full_url, cache_ttl=cache_ttl)
+
+    def iter_market(
+        self,
+        country: Optional[str] = None,
+        landfieldTier: Optional[str] = None,
+        tileClass: Optional[str] = None,
+        tileCount: Optional[str] = None,
+        search: str = "",
+        searchTerms: Optional[List[str]] = None,
+        page_size: int = 100,
+        start_page: int = 1,
+        limit: Optional[int] = None,
+        prefetch: bool = False,
+        cache_ttl: Optional[int] = None,
+        **kwargs
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        Lazily yield marketplace landfields across all result pages.
+
+        Only the current page (plus the next one with prefetch=True, fetched
+        in a background thread once the caller moves past the current page's
+        first landfield) is held in memory. Pages wait for the 'search' rate
+        limit budget instead of failing. Iteration stops after limit
+        landfields, on the last page, or as soon as the caller stops
+        consuming the generator. A prefetch that has already started when
+        the generator is closed still completes, so it is cached and counts
+        against the rate limit.
+        """
+        def fetch(page: int) -> Dict[str, Any]:
+            url = self._market_url(
+                country=country,
+                landfieldTier=landfieldTier,
+                tileClass=tileClass,
+                tileCount=tileCount,
+                page=page,
+                items=page_size,
+                search=search,
+                searchTerms=searchTerms,
+                **kwargs
+            )
+            return self._get_json(url, wait=True, cache_ttl=cache_ttl)
 
-        if country:
-            params["country"] = country
-        if landfieldTier:
-            params["landfieldTier"] = landfieldTier
-        if tileClass:
-            params["tileClass"] = tileClass
-        if tileCount:
-            params["tileCount"] = tileCount
-        if searchTerms:
-            params["searchTerms"] = searchTerms
+        executor = ThreadPoolExecutor(max_workers=1) if prefetch else None
+        pending = None
+        page = start_page
+        fetched = 0
+        yielded = 0
+        try:
+            result = fetch(page)
+            while True:
+                landfields = result.get("landfields") or []
+                fetched += len(landfields)
+                last = self._is_last_market_page(result, page_size, fetched) or (
+                    limit is not None and fetched >= limit
+                )
+                for landfield in landfields:
+                    if limit is not None and yielded >= limit:
+                        return
+                    yield landfield
+                    yielded += 1
+                    if executor is not None and not last and pending is None:
+                        # The caller has moved into this page: fetch the next one meanwhile
+                        pending = executor.submit(propagate(fetch), page + 1)
+
+                if last:
+                    return
+                page += 1
+                if pending is not None:
+                    result, pending = pending.result(), None
+                else:
+                    result = fetch(page)
+        finally:
+            if pending is not None:
+                # Only stops a prefetch that hasn't started; a running one completes in the background
+                pending.cancel()
+            if executor is not None:
+                executor.shutdown(wait=False)
+
+    def get_market_floor(
+        self,
+        params: Dict[str, str],
+        cache_ttl: Optional[int] = None,
+        scan: Optional[MarketBatch] = None
+    ) -> Dict[str, Any]:
+        """
+        Get market floor price per tile.
 
-        params.update(kwargs)
+        With scan (an analytics.MarketBatch from one bulk market scan) the
+        floor is computed locally from the scanned listings without a request.
+        """
+        if scan is not None:
+            return scan.market_floor(params)
+        return self._get_json(self._market_floor_url(params), cache_ttl=cache_ttl)
 
-        url = "https://r.earth2.io/marketplace"
-        query_string = "&".join(f"{k}={v}" for k, v in params.items() if v is not None)
-        full_url = f"{url}?{query_string}"
+    def get_market_floors(
+        self,
+        segments: List[Dict[str, Any]],
+        max_workers: int = 4,
+        cache_ttl: Optional[int] = None,
+        scan: Optional[MarketBatch] = None
+    ) -> Dict[str, Any]:
+        """
+        Get floor prices for many segments (get_market_floor params, see
+        market_floor_grid) at once.
+
+        Segments that resolve to the same marketplace query are fetched once
+        and each one is cached like a single get_market_floor call. Up to
+        max_workers lookups run concurrently, dispatched in segment order so
+        list the most important segments first, and wait for the 'search'
+        rate limit budget instead of failing. "data" holds one row per unique
+        segment (its filters, count, floor_price_per_tile and the floor
+        listing id); failed segments are reported in "errors" as
+        {segment: message}. With scan every floor is computed locally.
+        """
+        unique = self._unique_floor_segments(segments)
+        if scan is not None:
+            return self._floors_result(unique, [scan.market_floor(params) for params in unique])
 
-        return self._get_json(full_url)
+        def fetch(params: Dict[str, str]) -> Any:
+            try:
+                return self._get_json(self._market_floor_url(params), wait=True, cache_ttl=cache_ttl)
+            except Exception as error:
+                return error
 
-    def get_market_floor(self, params: Dict[str, str]) -> Dict[str, Any]:
-        """Get market floor price per tile"""
-        url = "https://r.earth2.io/marketplace"
-        query_params = {
-            "items": "24",
-            "page": "1",
-            "search": "",
-            "sorting": "price_per_tile"
-        }
+        if not unique:
+            return {"data": [], "errors": {}}
 
-        if params.get("country"):
-            query_params["country"] = params["country"]
-        if params.get("tileCount"):
-            query_params["tileCount"] = params["tileCount"]
-        if params.get("landfieldTier"):
-            query_params["landfieldTier"] = params["landfieldTier"]
-        if params.get("tileClass") and params.get("landfieldTier") == "1":
-            query_params["tileClass"] = params["tileClass"]
-        query_string = "&".join(f"{k}={v}" for k, v in query_params.items())
-        return self._get_json(f"{url}?{query_string}")
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique)))) as executor:
+            outcomes = list(executor.map(propagate(fetch), unique))
+
+        return self._floors_result(unique, outcomes)
 
-    def get_leaderboard_players(self, **params) -> Dict[str, Any]:
+    def get_leaderboard_players(self, cache_ttl: Optional[int] = None, **params) -> Dict[str, Any]:
         """Get players leaderboard"""
-        query_string = "&".join(f"{k}={v}" for k, v in params.items() if v is not None)
-        url = "https://r.earth2.io/leaderboards/players"
-        return self._get_json(f"{url}?{query_string}" if query_string else url)
+        url = self._query_url("https://r.earth2.io/leaderboards/players", params)
+        return self._get_json(url, cache_ttl=cache_ttl)
 
-    def get_leaderboard_countries(self, **params) -> Dict[str, Any]:
+    def get_leaderboard_countries(self, cache_ttl: Optional[int] = None, **params) -> Dict[str, Any]:
         """Get countries leaderboard"""
-        query_string = "&".join(f"{k}={v}" for k, v in params.items() if v is not None)
-        url = "https://r.earth2.io/leaderboards/landfield_countries"
-        return self._get_json(f"{url}?{query_string}" if query_string else url)
+        url = self._query_url("https://r.earth2.io/leaderboards/landfield_countries", params)
+        return self._get_json(url, cache_ttl=cache_ttl)
 
-    def get_leaderboard_player_countries(self, **params) -> Dict[str, Any]:
+    def get_leaderboard_player_countries(self, cache_ttl: Optional[int] = None, **params) -> Dict[str, Any]:
         """Get player countries leaderboard"""
-        query_string = "&".join(f"{k}={v}" for k, v in params.items() if v is not None)
-        url = "https://r.earth2.io/leaderboards/player_countries"
-        return self._get_json(f"{url}?{query_string}" if query_string else url)
+        url = self._query_url("https://r.earth2.io/leaderboards/player_countries", params)
+        return self._get_json(url, cache_ttl=cache_ttl)
 
-    def get_avatar_sales(self) -> Dict[str, Any]:
+    def get_avatar_sales(self, cache_ttl: Optional[int] = None) -> Dict[str, Any]:
         """Get avatar sales data"""
-        return self._get_json("https://r.earth2.io/avatar_sales")
+        return self._get_json("https://r.earth2.io/avatar_sales", cache_ttl=cache_ttl)
 
-    def get_user_info(self, user_id: str) -> Dict[str, Any]:
+    def get_user_info(self, user_id: str, cache_ttl: Optional[int] = None) -> Dict[str, Any]:
         """Get user information by ID"""
-        return self._get_json(f"https://app.earth2.io/api/v2/user_info/{user_id}")
+        return self._get_json(f"https://app.earth2.io/api/v2/user_info/{user_id}", cache_ttl=cache_ttl)
+
+    def get_users(
+        self,
+        user_ids: List[str],
+        max_workers: int = 8,
+        cache_ttl: Optional[int] = None
+    ) -> Dict[str, Any]:
+        """
+        Get multiple users by IDs (aggregate single-user endpoint).
 
-    def get_users(self, user_ids: List[str]) -> Dict[str, Any]:
-        """Get multiple users by IDs (aggregate single-user endpoint)"""
-        aggregated: List[Dict[str, Any]] = []
-        for uid in user_ids:
+        Duplicate IDs are fetched once and up to max_workers lookups run
+        concurrently, waiting for the 'user' rate limit budget instead of
+        failing. "data" holds the users in input order; IDs that could not be
+        fetched are reported in "errors" as {user_id: message}.
+        """
+        unique_ids = list(dict.fromkeys(user_ids))
+
+        def fetch(uid: str) -> Any:
             try:
-                aggregated.append(self.get_user_info(uid))
-            except Exception:
-                # Skip invalid/unknown ids
-                pass
-        return {"data": aggregated}
+                return self._get_json(f"https://app.earth2.io/api/v2/user_info/{uid}", wait=True, cache_ttl=cache_ttl)
+            except Exception as error:
+                return error
 
-    def get_resources(self, property_id: str) -> Dict[str, Any]:
-        """Get property resources by ID"""
-        return self._get_json(f"https://resources.earth2.io/v1/landfields/{property_id}/resources")
+        if not unique_ids:
+            return {"data": [], "errors": {}}
 
-    def get_rate_limit_stats(self) -> Dict[str, Any]:
-        """Get rate limiting statistics and usage information"""
-        if not self._rate_limiter:
-            return {"rate_limiting": "disabled"}
-        return self._rate_limiter.get_stats()
+        with ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(unique_ids)))) as executor:
+            outcomes = list(executor.map(propagate(fetch), unique_ids))
 
-    def clear_cache(self):
-        """Clear the response cache"""
-        if self._rate_limiter:
-            self._rate_limiter.clear_cache()
+        return self._bulk_result(unique_ids, outcomes)
 
-    def set_cache_ttl(self, seconds: int):
-        """Set cache time-to-live in seconds"""
-        if self._rate_limiter:
-            self._rate_limiter._cache_ttl = seconds
+    def get_resources(self, property_id: str, cache_ttl: Optional[int] = None) -> Dict[str, Any]:
+        """Get property resources by ID"""
+        return self._get_json(f"https://resources.earth2.io/v1/landfields/{property_id}/resources", cache_ttl=cache_ttl)
@@ -0,0 +1,49 @@
+"""Lenient coercion of Earth2 API values, which mix numbers, numeric strings and nulls."""
+
+from typing import Any, Optional
+
+
+def to_int(value: Any) -> int:
+    try:
+        if value is None or value == "":
+            return 0
+        if isinstance(value, bool):
+            return int(value)
+        if isinstance(value, (int, float)):
+            return int(value)
+        if isinstance(value, str):
+            return int(value)
+        return 0
+    except Exception:
+        return 0
+
+
+def to_float(value: Any) -> float:
+    try:
+        if value is None or value == "":
+            return 0.0
+        if isinstance(value, bool):
+            return float(value)
+        if isinstance(value, (int, float)):
+            return float(value)
+        if isinstance(value, str):
+            return float(value)
+        return 0.0
+    except Exception:
+        return 0.0
+
+
+def to_optional_int(value: Any) -> Optional[int]:
+    """Like to_int, but keeps missing values (None / "") as None."""
+    return None if value is None or value == "" else to_int(value)
+
+
+def to_bool(value: Any) -> bool:
+    """True for true, non-zero numbers and "true" / "1" / "yes" (any case); False for anything else."""
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return value != 0
+    if isinstance(value, str):
+        return value.strip().lower() in ("true", "1", "yes", "y", "t")
+    return False
@@ -0,0 +1,143 @@
+"""
+JSON decoding backends.
+
+loads() / dumps() go through the fastest available backend: orjson, then
+msgspec, then the standard library json module. Install one of the fast
+decoders with `pip install earth2-api-wrapper[speedups]`, or pick a backend
+explicitly with set_backend(). RawJSON holds an undecoded response body so
+caches can keep compact bytes and decode on demand.
+"""
+
+import json
+from typing import Any, Optional, Union
+
+JSONBytes = Union[bytes, bytearray, memoryview, str]
+
+
+class JSONBackend:
+    """Interface for JSON backends."""
+
+    name = "base"
+
+    def loads(self, data: JSONBytes) -> Any:
+        """Decode a JSON document (bytes or str); raises a ValueError subclass on invalid JSON."""
+        raise NotImplementedError
+
+    def dumps(self, obj: Any) -> bytes:
+        """Encode obj as compact UTF-8 JSON."""
+        raise NotImplementedError
+
+
+class StdlibBackend(JSONBackend):
+    """The standard library json module."""
+
+    name = "json"
+
+    def loads(self, data: JSONBytes) -> Any:
+        if isinstance(data, memoryview):
+            data = data.tobytes()
+        return json.loads(data)
+
+    def dumps(self, obj: Any) -> bytes:
+        return json.dumps(obj, separators=(",", ":"), ensure_ascii=False).encode()
+
+
+class OrjsonBackend(JSONBackend):
+    """orjson (Rust); the fastest decoder for large payloads."""
+
+    name = "orjson"
+
+    def __init__(self):
+        import orjson
+        self.loads = orjson.loads  # type: ignore[assignment]
+        self.dumps = orjson.dumps  # type: ignore[assignment]
+
+
+class MsgspecBackend(JSONBackend):
+    """msgspec's JSON codec."""
+
+    name = "msgspec"
+
+    def __init__(self):
+        import msgspec
+        self._decoder = msgspec.json.Decoder()
+        self._encoder = msgspec.json.Encoder()
+        self._decode_error = msgspec.DecodeError
+
+    def loads(self, data: JSONBytes) -> Any:
+        try:
+            return self._decoder.decode(data)
+        except self._decode_error as error:
+            # msgspec errors are not ValueErrors; match json / orjson for callers
+            raise json.JSONDecodeError(str(error), "", 0) from error
+
+    def dumps(self, obj: Any) -> bytes:
+        return self._encoder.encode(obj)
+
+
+BACKENDS = {
+    OrjsonBackend.name: OrjsonBackend,
+    MsgspecBackend.name: MsgspecBackend,
+    StdlibBackend.name: StdlibBackend,
+}
+
+_backend: Optional[JSONBackend] = None
+
+
+def create_backend(backend: Union[str, JSONBackend]) -> JSONBackend:
+    """Return backend itself or a new instance of the backend registered under that name."""
+    if isinstance(backend, JSONBackend):
+        return backend
+    try:
+        factory = BACKENDS[backend]
+    except KeyError:
+        raise ValueError(f"Unknown JSON backend {backend!r} (choose from {', '.join(BACKENDS)})") from None
+    try:
+        return factory()
+    except ImportError:
+        raise ImportError(f"JSON backend {backend!r} is not installed (pip install {backend})") from None
+
+
+def get_backend() -> JSONBackend:
+    """The active backend (by default the first of orjson, msgspec, json that is installed)."""
+    global _backend
+    if _backend is None:
+        for factory in BACKENDS.values():
+            try:
+                _backend = factory()
+                break
+            except ImportError:
+                continue
+    assert _backend is not None
+    return _backend
+
+
+def set_backend(backend: Union[str, JSONBackend, None]):
+    """Use a specific backend from now on (None restores automatic selection)."""
+    global _backend
+    _backend = None if backend is None else create_backend(backend)
+
+
+def loads(data: JSONBytes) -> Any:
+    """Decode JSON with the active backend."""
+    return get_backend().loads(data)
+
+
+def dumps(obj: Any) -> bytes:
+    """Encode JSON with the active backend."""
+    return get_backend().dumps(obj)
+
+
+class RawJSON:
+    """An undecoded JSON document; decode() parses it with the active backend."""
+
+    __slots__ = ('data',)
+
+    def __init__(self, data: JSONBytes):
+        self.data = data
+
+    def decode(self) -> Any:
+        return loads(self.data)
+
+    def __len__(self) -> int:
+        return len(self.data)
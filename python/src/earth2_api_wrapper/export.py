@@ -0,0 +1,133 @@
+"""
+Streaming export of marketplace listings to columnar files.
+
+Listings are pulled page by page with Earth2Client.iter_market and each batch
+is written out before the next one is fetched, so memory use stays flat no
+matter how large the market is. Writing needs pyarrow, an optional
+dependency (`pip install earth2-api-wrapper[export]`).
+"""
+
+import os
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
+
+from .conversions import to_float, to_int, to_optional_int
+
+if TYPE_CHECKING:
+    from .client import Earth2Client
+
+# Output column -> Arrow type name
+MARKET_COLUMNS = {
+    "id": "string",
+    "description": "string",
+    "location": "string",
+    "country": "string",
+    "tier": "int8",
+    "tileClass": "int8",
+    "tileCount": "int32",
+    "price": "float64",
+    "price_per_tile": "float64",
+}
+
+FORMATS = ("parquet", "arrow")
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError(
+            "Market export requires pyarrow. Install it with: pip install earth2-api-wrapper[export]"
+        ) from None
+    return pyarrow
+
+
+def market_columns(landfields: Iterable[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """Convert a batch of marketplace landfields into typed column lists."""
+    columns: Dict[str, List[Any]] = {name: [] for name in MARKET_COLUMNS}
+    for item in landfields:
+        price = to_float(item.get("price"))
+        tile_count = to_int(item.get("tileCount"))
+        columns["id"].append(item.get("id"))
+        columns["description"].append(item.get("description"))
+        columns["location"].append(item.get("location"))
+        columns["country"].append(item.get("country"))
+        columns["tier"].append(to_optional_int(item.get("tier")))
+        columns["tileClass"].append(to_optional_int(item.get("tileClass")))
+        columns["tileCount"].append(tile_count)
+        columns["price"].append(price)
+        columns["price_per_tile"].append(price / tile_count if tile_count > 0 else None)
+    return columns
+
+
+class MarketWriter:
+    """
+    Incremental writer for marketplace batches.
+
+    format is 'parquet' (one row group per batch) or 'arrow' (Arrow IPC file,
+    one record batch per batch); by default it is taken from the file
+    extension. Use as a context manager or call close().
+    """
+
+    def __init__(self, path: str, format: Optional[str] = None):  # noqa: A002
+        pa = _require_pyarrow()
+        if format is None:
+            format = "arrow" if os.path.splitext(path)[1].lower() in (".arrow", ".feather", ".ipc") else "parquet"
+        if format not in FORMATS:
+            raise ValueError(f"Unsupported export format {format!r} (choose from {', '.join(FORMATS)})")
+
+        self.path = path
+        self.format = format
+        self.rows = 0
+        self._pa = pa
+        self.schema = pa.schema([(name, getattr(pa, type_name)()) for name, type_name in MARKET_COLUMNS.items()])
+
+        if format == "parquet":
+            import pyarrow.parquet as pq
+            self._writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+        else:
+            import pyarrow.ipc as ipc
+            self._writer = ipc.new_file(path, self.schema)
+
+    def write(self, landfields: List[Dict[str, Any]]):
+        """Convert and append one batch of landfields."""
+        if not landfields:
+            return
+        batch = self._pa.RecordBatch.from_pydict(market_columns(landfields), schema=self.schema)
+        if self.format == "parquet":
+            self._writer.write_batch(batch)
+        else:
+            self._writer.write(batch)
+        self.rows += len(landfields)
+
+    def close(self):
+        self._writer.close()
+
+    def __enter__(self) -> "MarketWriter":
+        return self
+
+    def __exit__(self, *exc_info: Any):
+        self.close()
+
+
+def export_market(
+    client: "Earth2Client",
+    path: str,
+    format: Optional[str] = None,  # noqa: A002
+    page_size: int = 100,
+    limit: Optional[int] = None,
+    **filters: Any
+) -> int:
+    """
+    Stream every marketplace page matching filters (the search_market
+    arguments) into a Parquet or Arrow file and return the number of rows.
+    Each page is written before the next is processed.
+    """
+    with MarketWriter(path, format) as writer:
+        batch: List[Dict[str, Any]] = []
+        for landfield in client.iter_market(page_size=page_size, limit=limit, prefetch=True, **filters):
+            batch.append(landfield)
+            if len(batch) >= page_size:
+                writer.write(batch)
+                batch = []
+        writer.write(batch)
+        return writer.rows
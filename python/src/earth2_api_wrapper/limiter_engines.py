@@ -0,0 +1,296 @@
+"""
+Counting engines behind RateLimiter.
+
+An engine tracks request timestamps for named keys ('burst', 'global' and one
+per endpoint category) and answers how long a key has to wait before another
+request fits within `limit` requests per `window` seconds. Engines are not
+thread-safe on their own; RateLimiter serializes access to each key (keys
+are independent, so different keys may be used from different threads).
+
+SharedEngine keeps its state in a SQLite file, so every process on a host
+that uses the same file draws from one set of budgets.
+
+try_record() checks and counts a request against several keys in one step.
+In-process engines rely on the caller holding the locks for those keys;
+SharedEngine also runs it in a single SQLite transaction, so two processes
+can't both take the last slot.
+"""
+
+import os
+import sqlite3
+import threading
+from collections import defaultdict, deque
+from typing import Deque, Dict, Optional, Sequence, Tuple, Union
+
+from .cache import default_cache_dir
+
+# (key, limit, window) triples passed to try_record()
+Limits = Sequence[Tuple[str, int, float]]
+
+
+def _gcra_wait(tat: Optional[float], limit: int, window: float, now: float) -> float:
+    """Seconds until a GCRA key with theoretical arrival time tat admits another request."""
+    if limit <= 0:
+        return window
+    if tat is None or tat <= now:
+        return 0.0
+    # A request is allowed once the TAT is within the burst tolerance
+    wait = tat - (window - window / limit) - now
+    return wait if wait > 0 else 0.0
+
+
+def _gcra_refund(limit: int, window: float, stamp: float, now: float) -> float:
+    """
+    Seconds of TAT to give back for a request recorded at stamp. Its
+    interval has been draining since stamp at the latest, so only what is
+    left of it returns; once it has passed, the slot is not held any more.
+    """
+    interval = window / (limit if limit > 0 else 1)
+    return max(0.0, min(interval, stamp + interval - now))
+
+
+class LimiterEngine:
+    """Interface for rate limiter engines."""
+
+    name = "base"
+    # Whether `limit` caps every window (True) or only the long-run average rate
+    exact = True
+
+    def wait_time(self, key: str, limit: int, window: float, now: float) -> float:
+        """Seconds until one more request for key fits in the window (0 if it fits now)."""
+        raise NotImplementedError
+
+    def record(self, key: str, limit: int, window: float, now: float) -> None:
+        """Count a request for key made at now."""
+        raise NotImplementedError
+
+    def release(self, key: str, limit: int, window: float, stamp: float, now: float) -> None:
+        """Undo a record() for key made at stamp (a reserved slot that went unused)."""
+        raise NotImplementedError
+
+    def try_record(self, limits: Limits, now: float) -> Tuple[float, ...]:
+        """
+        Count a request made at now against every (key, limit, window) in
+        limits if all of them have room, else count nothing. Returns each
+        key's wait_time(); all zero means the request was recorded.
+        """
+        waits = tuple(self.wait_time(key, limit, window, now) for key, limit, window in limits)
+        if not any(wait > 0 for wait in waits):
+            for key, limit, window in limits:
+                self.record(key, limit, window, now)
+        return waits
+
+    def count(self, key: str, limit: int, window: float, now: float) -> int:
+        """Number of requests for key currently counted against the window."""
+        raise NotImplementedError
+
+
+class SlidingWindowEngine(LimiterEngine):
+    """
+    Exact sliding windows backed by a deque of timestamps per key.
+
+    Memory and pruning work grow with the number of requests in the window.
+    """
+
+    name = "sliding_window"
+
+    def __init__(self):
+        self._requests: Dict[str, Deque[float]] = defaultdict(deque)
+
+    def _clean_old_requests(self, request_queue: Deque[float], window: float, now: float):
+        """Remove requests older than the time window."""
+        while request_queue and now - request_queue[0] > window:
+            request_queue.popleft()
+
+    def wait_time(self, key: str, limit: int, window: float, now: float) -> float:
+        request_queue = self._requests[key]
+        self._clean_old_requests(request_queue, window, now)
+        if len(request_queue) < limit:
+            return 0.0
+        # The request that has to expire is the one `limit` places from the end
+        return max(0.0, request_queue[len(request_queue) - limit] + window - now)
+
+    def record(self, key: str, limit: int, window: float, now: float) -> None:
+        self._requests[key].append(now)
+
+    def release(self, key: str, limit: int, window: float, stamp: float, now: float) -> None:
+        request_queue = self._requests[key]
+        try:
+            request_queue.remove(stamp)
+        except ValueError:
+            pass  # Already expired from the window
+
+    def count(self, key: str, limit: int, window: float, now: float) -> int:
+        request_queue = self._requests[key]
+        self._clean_old_requests(request_queue, window, now)
+        return len(request_queue)
+
+
+class GCRAEngine(LimiterEngine):
+    """
+    Generic Cell Rate Algorithm (a token bucket expressed as a single timestamp).
+
+    Each key stores only its theoretical arrival time (TAT). Requests are spaced
+    window / limit seconds apart on average and up to `limit` may arrive at
+    once, so the state and work per request are O(1) regardless of load.
+
+    `limit` is an average rate, not a cap on every window: a full burst
+    can be followed by a request every window / limit seconds, so a window
+    straddling the burst may hold up to 2 * limit - 1 requests. Use
+    SlidingWindowEngine where no window may exceed `limit`.
+    """
+
+    name = "gcra"
+    exact = False
+
+    def __init__(self):
+        self._tat: Dict[str, float] = {}
+
+    def wait_time(self, key: str, limit: int, window: float, now: float) -> float:
+        return _gcra_wait(self._tat.get(key), limit, window, now)
+
+    def record(self, key: str, limit: int, window: float, now: float) -> None:
+        tat = self._tat.get(key)
+        if tat is None or tat < now:
+            tat = now
+        self._tat[key] = tat + window / (limit if limit > 0 else 1)
+
+    def release(self, key: str, limit: int, window: float, stamp: float, now: float) -> None:
+        tat = self._tat.get(key)
+        refund = _gcra_refund(limit, window, stamp, now)
+        if tat is None or refund <= 0:
+            return
+        tat -= refund
+        if tat <= now:
+            self._tat.pop(key, None)
+        else:
+            self._tat[key] = tat
+
+    def count(self, key: str, limit: int, window: float, now: float) -> int:
+        # GCRA has no per-request history; report the bucket's fill level instead
+        if limit <= 0:
+            return 0
+        interval = window / limit
+        backlog = self._tat.get(key, now) - now
+        if backlog <= 0:
+            self._tat.pop(key, None)
+            return 0
+        return min(limit, int(-(-backlog // interval)))
+
+
+class SharedEngine(LimiterEngine):
+    """
+    GCRA with its theoretical arrival times stored in a SQLite database.
+
+    Processes that open the same file (default: $E2_RATE_LIMIT_DB, else
+    ratelimit.sqlite3 in default_cache_dir()) share every budget.
+    try_record() reads and updates all of its keys inside one BEGIN
+    IMMEDIATE transaction, which holds the database's write lock, so the
+    check and the count are atomic across processes. wait_time() on its own
+    is only a snapshot, and record() (a single UPSERT) never loses another
+    process's request but counts it whether or not it fits. The connection
+    is reopened after fork(), and statements on it are serialized since all
+    keys share it.
+    """
+
+    name = "shared"
+    exact = False  # GCRA: limits are average rates (see GCRAEngine)
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path or os.getenv("E2_RATE_LIMIT_DB") or os.path.join(default_cache_dir(), "ratelimit.sqlite3")
+        os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+        self._conn: Optional[sqlite3.Connection] = None
+        self._pid = 0
+        self._lock = threading.Lock()
+
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None or self._pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Limiter state is disposable; don't wait for fsync on every request
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute("CREATE TABLE IF NOT EXISTS gcra (key TEXT PRIMARY KEY, tat REAL NOT NULL)")
+            self._conn = conn
+            self._pid = os.getpid()
+        return self._conn
+
+    def _tat(self, key: str) -> Optional[float]:
+        with self._lock:
+            row = self._db().execute("SELECT tat FROM gcra WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def wait_time(self, key: str, limit: int, window: float, now: float) -> float:
+        return _gcra_wait(self._tat(key), limit, window, now)
+
+    def record(self, key: str, limit: int, window: float, now: float) -> None:
+        interval = window / (limit if limit > 0 else 1)
+        with self._lock:
+            self._db().execute(
+                "INSERT INTO gcra (key, tat) VALUES (?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET tat = MAX(tat, ?) + ?",
+                (key, now + interval, now, interval)
+            )
+
+    def try_record(self, limits: Limits, now: float) -> Tuple[float, ...]:
+        keys = [key for key, _, _ in limits]
+        with self._lock:
+            db = self._db()
+            # IMMEDIATE takes the write lock before reading, so no other process can record in between
+            db.execute("BEGIN IMMEDIATE")
+            try:
+                tats = dict(db.execute(
+                    f"SELECT key, tat FROM gcra WHERE key IN ({', '.join('?' * len(keys))})", keys
+                ).fetchall())
+                waits = tuple(_gcra_wait(tats.get(key), limit, window, now) for key, limit, window in limits)
+                if not any(wait > 0 for wait in waits):
+                    db.executemany(
+                        "INSERT INTO gcra (key, tat) VALUES (?, ?) ON CONFLICT(key) DO UPDATE SET tat = excluded.tat",
+                        [
+                            (key, max(tats.get(key) or now, now) + window / (limit if limit > 0 else 1))
+                            for key, limit, window in limits
+                        ]
+                    )
+                db.execute("COMMIT")
+            except BaseException:
+                db.execute("ROLLBACK")
+                raise
+        return waits
+
+    def release(self, key: str, limit: int, window: float, stamp: float, now: float) -> None:
+        refund = _gcra_refund(limit, window, stamp, now)
+        if refund <= 0:
+            return
+        with self._lock:
+            self._db().execute("UPDATE gcra SET tat = MAX(tat - ?, ?) WHERE key = ?", (refund, now, key))
+
+    def count(self, key: str, limit: int, window: float, now: float) -> int:
+        if limit <= 0:
+            return 0
+        tat = self._tat(key)
+        if tat is None or tat <= now:
+            return 0
+        return min(limit, int(-(-(tat - now) // (window / limit))))
+
+    def close(self):
+        """Close this process's database connection."""
+        with self._lock:
+            if self._conn is not None and self._pid == os.getpid():
+                self._conn.close()
+            self._conn = None
+
+
+ENGINES = {
+    SlidingWindowEngine.name: SlidingWindowEngine,
+    GCRAEngine.name: GCRAEngine,
+    SharedEngine.name: SharedEngine,
+}
+
+
+def create_engine(engine: Union[str, LimiterEngine]) -> LimiterEngine:
+    """Return engine itself or a new instance of the engine registered under that name."""
+    if isinstance(engine, LimiterEngine):
+        return engine
+    try:
+        return ENGINES[engine]()
+    except KeyError:
+        raise ValueError(f"Unknown rate limiter engine {engine!r} (choose from {', '.join(ENGINES)})") from None
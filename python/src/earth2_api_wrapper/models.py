@@ -0,0 +1,188 @@
+"""
+Typed, lazily parsed views over Earth2 API responses.
+
+Client methods keep returning plain JSON dicts; wrap them in these models
+when typed attribute access is wanted:
+
+    for landfield in Landfield.wrap(client.search_market(country="AU")["landfields"]):
+        print(landfield.price_per_tile)
+
+A model only keeps a reference to its JSON object. Each field is looked up
+and coerced the first time it is read and cached in a per-instance slot, so
+fields that are never read cost nothing and hot loops don't repeat the
+conversion. Models use __slots__, so large result sets carry no per-object
+__dict__. JSON:API style objects ({"id": ..., "attributes": {...}}) are read
+from their attributes.
+"""
+
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple, Type, TypeVar
+
+from .conversions import to_bool, to_float, to_int, to_optional_int
+
+_UNSET = object()
+
+M = TypeVar("M", bound="Model")
+
+
+class Field:
+    """
+    Model attribute read from the first present JSON key (default: the
+    attribute name) and passed through convert unless it is null.
+    """
+
+    __slots__ = ('keys', 'convert', 'index')
+
+    def __init__(self, *keys: str, convert: Optional[Callable[[Any], Any]] = None):
+        self.keys = keys
+        self.convert = convert
+        self.index = -1
+
+    def __set_name__(self, owner: type, name: str):
+        if not self.keys:
+            self.keys = (name,)
+
+    def __get__(self, instance: Optional["Model"], owner: Optional[type] = None) -> Any:
+        if instance is None:
+            return self
+        values = instance._values
+        if values is None:
+            values = instance._values = [_UNSET] * len(instance._fields)
+        value = values[self.index]
+        if value is _UNSET:
+            source = instance._source()
+            value = None
+            for key in self.keys:
+                value = source.get(key)
+                if value is not None:
+                    break
+            if value is not None and self.convert is not None:
+                value = self.convert(value)
+            values[self.index] = value
+        return value
+
+
+class Model:
+    """Base class: wraps one JSON object and resolves its Fields on demand."""
+
+    __slots__ = ('raw', '_values')
+
+    _fields: Tuple[Tuple[str, Field], ...] = ()
+
+    def __init_subclass__(cls, **kwargs: Any):
+        super().__init_subclass__(**kwargs)
+        fields = list(cls._fields)
+        for name, value in vars(cls).items():
+            if isinstance(value, Field):
+                value.index = len(fields)
+                fields.append((name, value))
+        cls._fields = tuple(fields)
+
+    def __init__(self, raw: Dict[str, Any]):
+        self.raw = raw
+        self._values: Optional[List[Any]] = None
+
+    @classmethod
+    def wrap(cls: Type[M], items: Optional[Iterable[Dict[str, Any]]]) -> List[M]:
+        """Wrap a list of JSON objects (None or non-dict entries are skipped)."""
+        return [cls(item) for item in items or () if isinstance(item, dict)]
+
+    def _source(self) -> Dict[str, Any]:
+        attributes = self.raw.get("attributes")
+        return attributes if isinstance(attributes, dict) else self.raw
+
+    @property
+    def id(self) -> Optional[str]:
+        return self.raw.get("id")
+
+    def get(self, key: str, default: Any = None) -> Any:
+        """Raw value of any JSON key, including ones without a Field."""
+        value = self._source().get(key)
+        return default if value is None else value
+
+    def to_dict(self) -> Dict[str, Any]:
+        """All fields, converted, keyed by attribute name."""
+        result = {"id": self.id}
+        result.update((name, getattr(self, name)) for name, _ in self._fields)
+        return result
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}(id={self.id!r})"
+
+
+class Landfield(Model):
+    """Marketplace listing (search_market / iter_market "landfields")."""
+
+    __slots__ = ()
+
+    description = Field()
+    location = Field()
+    country = Field()
+    tier = Field("tier", "landfieldTier", convert=to_optional_int)
+    tile_class = Field("tileClass", convert=to_optional_int)
+    tile_count = Field("tileCount", convert=to_int)
+    price = Field(convert=to_float)
+    thumbnail = Field()
+
+    @property
+    def price_per_tile(self) -> Optional[float]:
+        """Price divided by tile count, or None without tiles or price."""
+        tile_count = self.tile_count
+        price = self.price
+        return price / tile_count if tile_count and price else None
+
+
+class TrendingPlace(Model):
+    """Entry of get_trending_places()["data"]."""
+
+    __slots__ = ()
+
+    place_name = Field("placeName")
+    place_code = Field("placeCode")
+    country = Field()
+    tier = Field("landfieldTier", convert=to_optional_int)
+    tiles_sold = Field("tilesSold", convert=to_int)
+    tile_price = Field("tilePrice", convert=to_float)
+    timeframe_days = Field("timeframeDays", convert=to_int)
+    center = Field()
+
+
+class LeaderboardRow(Model):
+    """
+    Row of a players / countries / player_countries leaderboard. Leaderboards
+    differ in their columns; anything not covered here is available via get().
+    """
+
+    __slots__ = ()
+
+    rank = Field("rank", "position", convert=to_optional_int)
+    name = Field("username", "name", "countryName")
+    country = Field("countryCode", "country")
+    tiles_count = Field("tilesCount", "tiles_count", convert=to_int)
+    value = Field("value", "networth", convert=to_float)
+
+
+class UserInfo(Model):
+    """Response of get_user_info() / entries of get_users()["data"]."""
+
+    __slots__ = ()
+
+    username = Field()
+    avatar = Field()
+    country = Field()
+    created = Field()
+    properties = Field(convert=to_int)
+    followers = Field(convert=to_int)
+    following = Field(convert=to_int)
+    verified = Field(convert=to_bool)
+
+
+class Resource(Model):
+    """Entry of get_resources()["data"]."""
+
+    __slots__ = ()
+
+    category = Field()
+    size = Field(convert=to_float)
+    max = Field(convert=to_float)
+    m3 = Field(convert=to_float)
+    stats = Field()
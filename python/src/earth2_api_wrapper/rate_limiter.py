@@ -3,10 +3,45 @@ Rate limiting and abuse prevention for Earth2 API wrapper.
 Protects Earth2's bandwidth by implementing multiple safeguards.
 """
 
+import os
 import threading
-from collections import defaultdict, deque
-from typing import Dict, Optional, Tuple, Any
-import hashlib
+import time
+from collections import defaultdict
+from typing import Dict, Mapping, Optional, Tuple, Any, Union
+from urllib.parse import urlsplit
+
+from .adaptive import AdaptiveController
+from .cache import LRUCache, SQLiteCache
+from .circuit_breaker import CircuitBreaker, CircuitOpenError
+from .decoding import RawJSON, dumps, get_backend
+from .limiter_engines import LimiterEngine, create_engine
+from .scheduler import RequestScheduler
+
+
+class RateLimitExceeded(Exception):
+    """Raised when a request is blocked by the rate limiter."""
+
+    def __init__(self, message: str, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+
+class Reservation:
+    """
+    A request slot taken by RateLimiter.reserve(). commit() it once the
+    request succeeded or release() it if the request was never sent; a
+    reservation left unsettled stays counted, like a request that reached
+    the server and failed.
+    """
+
+    __slots__ = ('url', 'endpoint_category', 'endpoint_limit', 'stamp', 'settled')
+
+    def __init__(self, url: str, endpoint_category: str, endpoint_limit: int, stamp: float):
+        self.url = url
+        self.endpoint_category = endpoint_category
+        self.endpoint_limit = endpoint_limit
+        self.stamp = stamp
+        self.settled = False
 
 
 class RateLimiter:
@@ -19,9 +54,56 @@ class RateLimiter:
     - Burst protection
     - Exponential backoff on errors
     - Request caching
+
+    Request counting is delegated to a pluggable engine: 'sliding_window'
+    (exact, deque of timestamps per window), 'gcra' (O(1) state per window)
+    or 'shared' (GCRA in a SQLite file shared by every process on the host;
+    error backoff, circuit breakers and the cache stay per process). The
+    GCRA engines enforce each limit as an average rate, so a single window
+    can briefly see up to twice the limit; see GCRAEngine.
+
+    With adaptive=True (or an AdaptiveController) the per-category limits
+    below are starting points: they rise while responses are healthy and
+    fall on 429s, timeouts, latency spikes and exhausted rate-limit headers,
+    capped by the controller's ceilings (see observe_response()). The
+    global and burst limits stay fixed.
+
+    reserve() checks and counts a request against every limit before
+    returning (the engine's try_record(): first the endpoint window under
+    the category lock, then burst and global under the short global lock,
+    rolling the endpoint slot back if those refuse), so concurrent callers
+    can't all pass a check before any of them is recorded; with the
+    'shared' engine this holds across processes too. The clients reserve before sending and commit()
+    the slot on success or release() it if the request never went out.
+
+    Requests that wait for a slot are released by the scheduler in priority
+    order, fairly across tags (see scheduler.scheduling), instead of
+    first-come-first-served.
+
+    With cache_raw=True the in-memory cache keeps response bodies as the raw
+    bytes received and decodes them on every cache hit, trading a fast
+    decode for a much smaller footprint than nested dicts (and giving each
+    caller its own copy).
+
+    Circuit breakers (one per endpoint category, or per host with
+    circuit_scope='host') stop sending requests to an endpoint after
+    failure_threshold consecutive outage failures; see check_circuit().
     """
 
-    def __init__(self):
+    def __init__(
+        self,
+        engine: Union[str, LimiterEngine] = 'sliding_window',
+        cache_max_entries: int = 1000,
+        cache_max_bytes: Optional[int] = None,
+        cache_raw: bool = False,
+        failure_threshold: int = 5,
+        recovery_timeout: float = 30.0,
+        circuit_scope: str = 'category',
+        adaptive: Union[bool, AdaptiveController] = False
+    ):
+        if circuit_scope not in ('category', 'host'):
+            raise ValueError(f"circuit_scope must be 'category' or 'host', not {circuit_scope!r}")
+        # Guards the burst / global windows and the usage counters
         self._lock = threading.Lock()
 
         # Per-endpoint rate limits (requests per minute)
@@ -35,24 +117,53 @@ class RateLimiter:
             'default': 50        # Default for other endpoints
         }
 
+        # Adjusts the endpoint limits to the server's responses when enabled
+        self._adaptive: Optional[AdaptiveController] = (
+            AdaptiveController() if adaptive is True else adaptive or None
+        )
+
         # Global limits
         self._global_limit = 200  # Total requests per minute
         self._burst_limit = 10    # Max requests in 10 seconds
+        self._window = 60         # Window for global and endpoint limits (seconds)
+        self._burst_window = 10   # Window for the burst limit (seconds)
+
+        # Each category's endpoint window, error backoff, Retry-After pause and
+        # adaptive limit are guarded by its own lock, so threads working on
+        # different categories only meet briefly on self._lock
+        self._category_locks: Dict[str, threading.Lock] = {
+            category: threading.Lock() for category in self._endpoint_limits
+        }
+        self._circuit_lock = threading.Lock()
 
         # Tracking structures
-        self._endpoint_requests: Dict[str, deque] = defaultdict(lambda: deque())
-        self._global_requests: deque = deque()
-        self._burst_requests: deque = deque()
+        self._engine = create_engine(engine)
         self._error_counts: Dict[str, int] = defaultdict(int)
         self._last_error_time: Dict[str, float] = defaultdict(float)
-
-        # Simple in-memory cache for GET requests
-        self._cache: Dict[str, Tuple[float, Any]] = {}
-        self._cache_ttl = 300  # 5 minutes default TTL
+        # Categories the server asked us to pause via Retry-After (category -> time.time() to resume at)
+        self._retry_after_until: Dict[str, float] = {}
+
+        # Circuit breakers, created on first failure (category or host -> breaker)
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._failure_threshold = failure_threshold
+        self._recovery_timeout = recovery_timeout
+        self._circuit_scope = circuit_scope
+
+        # Orders requests waiting for a slot by priority class and fairness tag
+        self.scheduler = RequestScheduler()
+
+        # In-memory LRU cache for GET requests (5 minutes default TTL)
+        self._cache = LRUCache(max_entries=cache_max_entries, max_bytes=cache_max_bytes, default_ttl=300)
+        self._cache_raw = cache_raw
+        # Per-category TTL overrides, e.g. {'property': 3600}; other categories use the default TTL
+        self._cache_ttls: Dict[str, float] = {}
+        # Optional on-disk cache shared between processes (see use_persistent_cache)
+        self._persistent_cache: Optional[SQLiteCache] = None
 
         # Usage tracking
         self._total_requests = 0
         self._blocked_requests = 0
+        self._revalidated_requests = 0  # 304 Not Modified answers to conditional requests
 
     def _get_endpoint_category(self, url: str) -> str:
         """Categorize endpoint for rate limiting."""
@@ -73,147 +184,591 @@ class RateLimiter:
         else:
             return 'default'
 
-    def _clean_old_requests(self, request_queue: deque, window_seconds: int):
-        """Remove requests older than the time window."""
-        import time
-        current_time = time.time()
-        while request_queue and current_time - request_queue[0] > window_seconds:
-            request_queue.popleft()
-
-    def _get_cache_key(self, url: str, method: str = 'GET') -> str:
-        """Generate cache key for request."""
-        return hashlib.md5(f"{method}:{url}".encode()).hexdigest()
-
-    def _get_cached_response(self, cache_key: str) -> Optional[Any]:
-        """Get cached response if still valid."""
-        import time
-        if cache_key in self._cache:
-            timestamp, response = self._cache[cache_key]
-            if time.time() - timestamp < self._cache_ttl:
-                return response
-            else:
-                del self._cache[cache_key]
-        return None
-
-    def _cache_response(self, cache_key: str, response: Any):
-        """Cache response with timestamp."""
-        import time
-        # Limit cache size to prevent memory issues
-        if len(self._cache) > 1000:
-            # Remove oldest 20% of entries
-            sorted_items = sorted(self._cache.items(), key=lambda x: x[1][0])
-            for key, _ in sorted_items[:200]:
-                del self._cache[key]
-
-        self._cache[cache_key] = (time.time(), response)
+    def _endpoint_limit(self, endpoint_category: str) -> int:
+        """Requests per minute allowed for an endpoint category."""
+        configured = self._endpoint_limits.get(endpoint_category, self._endpoint_limits['default'])
+        if self._adaptive is not None:
+            return self._adaptive.limit(endpoint_category, configured)
+        return configured
+
+    def _category_lock(self, endpoint_category: str) -> threading.Lock:
+        lock = self._category_locks.get(endpoint_category)
+        if lock is None:
+            lock = self._category_locks.setdefault(endpoint_category, threading.Lock())
+        return lock
+
+    def _shared_waits(self, current_time: float) -> Tuple[float, float]:
+        """Seconds until the burst and global windows have room (call with self._lock held)."""
+        engine = self._engine
+        return (
+            engine.wait_time('burst', self._burst_limit, self._burst_window, current_time),
+            engine.wait_time('global', self._global_limit, self._window, current_time),
+        )
+
+    def _endpoint_wait(self, endpoint_category: str, current_time: float) -> float:
+        """Seconds until the category's window has room (call with its category lock held)."""
+        return self._engine.wait_time(
+            f'endpoint:{endpoint_category}',
+            self._endpoint_limit(endpoint_category),
+            self._window,
+            current_time
+        )
+
+    def _backoff_wait(self, endpoint_category: str, current_time: float) -> float:
+        """Seconds left of the category's error backoff (call with its category lock held)."""
+        error_count = self._error_counts.get(endpoint_category, 0)
+        if error_count <= 0:
+            return 0.0
+        backoff_time = min(2 ** error_count, 300)  # Max 5 minutes
+        return self._last_error_time[endpoint_category] + backoff_time - current_time
+
+    def _circuit_key(self, url: str, endpoint_category: Optional[str] = None) -> str:
+        """Circuit breaker key for url: its endpoint category or host."""
+        if self._circuit_scope == 'host':
+            return urlsplit(url).hostname or ''
+        return endpoint_category or self._get_endpoint_category(url)
+
+    @staticmethod
+    def _get_cache_key(url: str, method: str = 'GET') -> str:
+        """Generate cache key for request (the URL is already unique; hashing it only costs time)."""
+        return f"{method}:{url}"
+
+    def _count_blocked(self):
+        with self._lock:
+            self._blocked_requests += 1
+
+    @staticmethod
+    def _decoded(response: Any) -> Any:
+        """Decode a response cached as raw bytes; other responses pass through."""
+        return response.decode() if isinstance(response, RawJSON) else response
+
+    def get_cache_ttl(self, endpoint_category: Optional[str] = None) -> float:
+        """Cache TTL in seconds for an endpoint category (the default TTL if it has no override)."""
+        if endpoint_category is not None and endpoint_category in self._cache_ttls:
+            return self._cache_ttls[endpoint_category]
+        return self._cache.default_ttl
+
+    def _get_cached_response(
+        self,
+        cache_key: str,
+        endpoint_category: str,
+        max_age: Optional[float] = None
+    ) -> Optional[Any]:
+        """Get cached response if still valid (max_age overrides the entry's TTL)."""
+        response = self._cache.get(cache_key, max_age)
+        if response is None and self._persistent_cache is not None:
+            ttl = max_age if max_age is not None else self.get_cache_ttl(endpoint_category)
+            entry = self._persistent_cache.get(cache_key, ttl, raw=self._cache_raw)
+            if entry is not None:
+                # Promote to memory (keeping its age) so repeated lookups skip the disk
+                stored_at, response = entry
+                self._cache.set(
+                    cache_key,
+                    response,
+                    ttl=self._cache_ttls.get(endpoint_category),
+                    size=len(response) if isinstance(response, RawJSON) else 0,
+                    stored_at=stored_at
+                )
+        return self._decoded(response)
+
+    def use_persistent_cache(self, cache: Optional[SQLiteCache]):
+        """
+        Back the in-memory cache with a persistent one (None to detach).
 
-    def can_make_request(self, url: str, method: str = 'GET') -> Tuple[bool, Optional[str], Optional[Any]]:
+        A cache TTL previously saved with set_cache_ttl() is restored from it.
+        """
+        with self._lock:
+            self._persistent_cache = cache
+            if cache is not None:
+                saved_ttl = cache.get_setting('cache_ttl')
+                if saved_ttl is not None:
+                    self._cache.default_ttl = float(saved_ttl)
+                for name, value in cache.get_settings('cache_ttl:').items():
+                    self._cache_ttls[name[len('cache_ttl:'):]] = float(value)
+
+    def set_cache_ttl(self, seconds: float, endpoint_category: Optional[str] = None):
+        """
+        Set cache time-to-live in seconds, for one endpoint category or (by
+        default) for every category without its own TTL. Persisted when a
+        persistent cache is attached.
+        """
+        if endpoint_category is None:
+            self._cache.default_ttl = seconds
+            setting = 'cache_ttl'
+        else:
+            self._cache_ttls[endpoint_category] = seconds
+            setting = f'cache_ttl:{endpoint_category}'
+        if self._persistent_cache is not None:
+            self._persistent_cache.set_setting(setting, str(seconds))
+
+    def can_make_request(
+        self,
+        url: str,
+        method: str = 'GET',
+        max_age: Optional[float] = None
+    ) -> Tuple[bool, Optional[str], Optional[Any]]:
         """
         Check if request can be made and return cached response if available.
 
+        max_age overrides the cache TTL when deciding whether a cached
+        response is still fresh.
+
         Returns:
             (can_proceed, reason_if_blocked, cached_response)
         """
-        import time
+        # Check cache first for GET requests; the cache has its own lock
+        if method.upper() == 'GET':
+            cached_response = self.get_cached_response(url, method, max_age)
+            if cached_response is not None:
+                return True, None, cached_response
+
+        endpoint_category = self._get_endpoint_category(url)
+        current_time = time.time()
+        with self._category_lock(endpoint_category):
+            category_waits = self._category_waits(endpoint_category, current_time)
         with self._lock:
-            current_time = time.time()
-            endpoint_category = self._get_endpoint_category(url)
-
-            # Check cache first for GET requests
-            cached_response = None
-            if method.upper() == 'GET':
-                cache_key = self._get_cache_key(url, method)
-                cached_response = self._get_cached_response(cache_key)
-                if cached_response is not None:
-                    return True, None, cached_response
-
-            # Clean old requests
-            self._clean_old_requests(self._global_requests, 60)
-            self._clean_old_requests(self._burst_requests, 10)
-            self._clean_old_requests(self._endpoint_requests[endpoint_category], 60)
-
-            # Check for exponential backoff on errors
-            if endpoint_category in self._last_error_time:
-                error_count = self._error_counts[endpoint_category]
-                if error_count > 0:
-                    backoff_time = min(2 ** error_count, 300)  # Max 5 minutes
-                    if current_time - self._last_error_time[endpoint_category] < backoff_time:
-                        self._blocked_requests += 1
-                        return False, f"Backing off due to errors (wait {int(backoff_time)}s)", None
-
-            # Check burst limit
-            if len(self._burst_requests) >= self._burst_limit:
-                self._blocked_requests += 1
-                return False, "Burst limit exceeded (max 10 requests per 10 seconds)", None
-
-            # Check global rate limit
-            if len(self._global_requests) >= self._global_limit:
-                self._blocked_requests += 1
-                msg = f"Global rate limit exceeded (max {self._global_limit} requests per minute)"
-                return False, msg, None
-
-            # Check endpoint-specific rate limit
-            endpoint_limit = self._endpoint_limits.get(endpoint_category, self._endpoint_limits['default'])
-            if len(self._endpoint_requests[endpoint_category]) >= endpoint_limit:
-                self._blocked_requests += 1
-                msg = f"Endpoint rate limit exceeded (max {endpoint_limit} requests per minute for {endpoint_category})"
-                return False, msg, None
-
-            return True, None, cached_response
-
-    def record_request(self, url: str, method: str = 'GET'):
-        """Record a successful request."""
-        import time
+            shared_waits = self._shared_waits(current_time)
+
+        reason = self._blocked_reason(endpoint_category, category_waits, shared_waits)
+        if reason is not None:
+            self._count_blocked()
+            return False, reason, None
+        return True, None, None
+
+    def get_cached_response(self, url: str, method: str = 'GET', max_age: Optional[float] = None) -> Optional[Any]:
+        """The cached response for url if still fresh (max_age overrides the TTL), else None."""
+        return self._get_cached_response(
+            self._get_cache_key(url, method), self._get_endpoint_category(url), max_age
+        )
+
+    def _category_waits(self, endpoint_category: str, current_time: float) -> Tuple[float, float, float]:
+        """Error backoff, Retry-After and endpoint window waits (call with the category lock held)."""
+        return (
+            self._backoff_wait(endpoint_category, current_time),
+            self._retry_after_until.get(endpoint_category, 0.0) - current_time,
+            self._endpoint_wait(endpoint_category, current_time),
+        )
+
+    def _blocked_reason(
+        self,
+        endpoint_category: str,
+        category_waits: Tuple[float, float, float],
+        shared_waits: Tuple[float, float]
+    ) -> Optional[str]:
+        """Why a request is blocked given its waits, or None if it may go."""
+        backoff_wait, retry_wait, endpoint_wait = category_waits
+        burst_wait, global_wait = shared_waits
+
+        # Check for exponential backoff on errors
+        if backoff_wait > 0:
+            backoff_time = min(2 ** self._error_counts.get(endpoint_category, 0), 300)
+            return f"Backing off due to errors (wait {int(backoff_time)}s)"
+
+        # Honour a server-sent Retry-After for the whole category
+        if retry_wait > 0:
+            return f"Server asked to retry after {retry_wait:.1f}s"
+
+        # Check burst limit
+        if burst_wait > 0:
+            return f"Burst limit exceeded ({self._limit_text(self._burst_limit, f'{self._burst_window} seconds')})"
+
+        # Check global rate limit
+        if global_wait > 0:
+            return f"Global rate limit exceeded ({self._limit_text(self._global_limit, 'minute')})"
+
+        # Check endpoint-specific rate limit
+        if endpoint_wait > 0:
+            endpoint_limit = self._endpoint_limit(endpoint_category)
+            return (
+                f"Endpoint rate limit exceeded ({self._limit_text(endpoint_limit, 'minute')} for {endpoint_category})"
+            )
+
+        return None
+
+    def _limit_text(self, limit: int, per: str) -> str:
+        """'max 10 requests per minute', or 'average ...' for engines that only cap the long-run rate."""
+        return f"{'max' if self._engine.exact else 'average'} {limit} requests per {per}"
+
+    def time_until_available(self, url: str) -> float:
+        """
+        Seconds until a request to url would pass the burst, global and
+        endpoint limits, any active error backoff and any Retry-After pause
+        (0 if it can go now).
+        """
+        return self._category_wait(self._get_endpoint_category(url))
+
+    def _category_wait(self, endpoint_category: str) -> float:
+        """time_until_available() for any URL in endpoint_category."""
+        current_time = time.time()
+        with self._category_lock(endpoint_category):
+            category_waits = self._category_waits(endpoint_category, current_time)
         with self._lock:
+            shared_waits = self._shared_waits(current_time)
+        return max(0.0, *category_waits, *shared_waits)
+
+    def _try_reserve(self, url: str) -> Tuple[Optional[Reservation], Optional[str], float]:
+        """
+        Atomically check every limit for url and, if it fits, count the
+        request in the burst, global and endpoint windows. Returns
+        (reservation, None, 0.0) or (None, reason, seconds until it fits).
+        """
+        endpoint_category = self._get_endpoint_category(url)
+        # Lock order: category, then global
+        with self._category_lock(endpoint_category):
             current_time = time.time()
-            endpoint_category = self._get_endpoint_category(url)
+            backoff_wait = self._backoff_wait(endpoint_category, current_time)
+            retry_wait = self._retry_after_until.get(endpoint_category, 0.0) - current_time
+            if backoff_wait > 0 or retry_wait > 0:
+                reason = self._blocked_reason(endpoint_category, (backoff_wait, retry_wait, 0.0), (0.0, 0.0))
+                return None, reason, max(backoff_wait, retry_wait)
+
+            # Take the endpoint slot under the category lock only, so categories don't queue on each other
+            endpoint_key = f'endpoint:{endpoint_category}'
+            endpoint_limit = self._endpoint_limit(endpoint_category)
+            (endpoint_wait,) = self._engine.try_record(((endpoint_key, endpoint_limit, self._window),), current_time)
+            if endpoint_wait > 0:
+                reason = self._blocked_reason(endpoint_category, (0.0, 0.0, endpoint_wait), (0.0, 0.0))
+                return None, reason, endpoint_wait
+
+            # The global lock covers just the burst/global check-and-count (one transaction for 'shared')
+            with self._lock:
+                burst_wait, global_wait = self._engine.try_record((
+                    ('burst', self._burst_limit, self._burst_window),
+                    ('global', self._global_limit, self._window),
+                ), current_time)
+            if burst_wait > 0 or global_wait > 0:
+                # Give the endpoint slot back; it was never used
+                self._engine.release(endpoint_key, endpoint_limit, self._window, current_time, current_time)
+                reason = self._blocked_reason(endpoint_category, (0.0, 0.0, 0.0), (burst_wait, global_wait))
+                return None, reason, max(burst_wait, global_wait)
+            return Reservation(url, endpoint_category, endpoint_limit, current_time), None, 0.0
+
+    def _record_endpoint(self, url: str, endpoint_category: str, current_time: float) -> Reservation:
+        """Count a request in its endpoint window (call with the category lock held)."""
+        endpoint_limit = self._endpoint_limit(endpoint_category)
+        self._engine.record(f'endpoint:{endpoint_category}', endpoint_limit, self._window, current_time)
+        return Reservation(url, endpoint_category, endpoint_limit, current_time)
+
+    def reserve(self, url: str, wait: bool = False, timeout: Optional[float] = None) -> Reservation:
+        """
+        Take a slot for a request to url, counted against every limit at
+        once so concurrent callers can never overshoot them.
 
-            self._global_requests.append(current_time)
-            self._burst_requests.append(current_time)
-            self._endpoint_requests[endpoint_category].append(current_time)
-            self._total_requests += 1
+        Without wait, raises RateLimitExceeded if no slot is free or requests
+        of equal or higher priority are queued for one. With wait, queues
+        like acquire() (raising after timeout seconds). Settle the returned
+        reservation with commit() or release().
+        """
+        if wait:
+            reservation = self.scheduler.wait_turn(self, url, timeout, reserve=True)
+            assert reservation is not None
+            return reservation
+        return self._reserve_now(url)
+
+    async def reserve_async(self, url: str, wait: bool = False, timeout: Optional[float] = None) -> Reservation:
+        """Awaitable version of reserve()."""
+        if wait:
+            reservation = await self.scheduler.wait_turn_async(self, url, timeout, reserve=True)
+            assert reservation is not None
+            return reservation
+        return self._reserve_now(url)
+
+    def _reserve_now(self, url: str) -> Reservation:
+        if self.must_queue():
+            self._count_blocked()
+            raise RateLimitExceeded("Rate limit exceeded: higher-priority requests are waiting")
+        reservation, reason, delay = self._try_reserve(url)
+        if reservation is None:
+            self._count_blocked()
+            raise RateLimitExceeded(f"Rate limit exceeded: {reason}", retry_after=delay or None)
+        return reservation
+
+    def commit(self, reservation: Reservation, full_fetch: bool = True):
+        """
+        Settle a reservation whose request succeeded: tally it, reset the
+        category's error backoff and close its circuit. full_fetch=False
+        tallies a 304 Not Modified revalidation.
+        """
+        if reservation.settled:
+            return
+        reservation.settled = True
+        endpoint_category = reservation.endpoint_category
+        with self._lock:
+            if full_fetch:
+                self._total_requests += 1
+            else:
+                self._revalidated_requests += 1
 
+        with self._category_lock(endpoint_category):
             # Reset error count on successful request
             if endpoint_category in self._error_counts:
                 self._error_counts[endpoint_category] = 0
 
-    def record_error(self, url: str, status_code: Optional[int] = None):
-        """Record a failed request for backoff calculation."""
-        import time
+        if self._breakers:
+            self._record_circuit_success(self._circuit_key(reservation.url, endpoint_category))
+
+    def release(self, reservation: Reservation):
+        """Give back the slot of a reservation whose request was never sent."""
+        if reservation.settled:
+            return
+        reservation.settled = True
+        endpoint_category = reservation.endpoint_category
+        current_time = time.time()
+        with self._category_lock(endpoint_category):
+            self._engine.release(
+                f'endpoint:{endpoint_category}', reservation.endpoint_limit, self._window,
+                reservation.stamp, current_time
+            )
+            with self._lock:
+                self._engine.release('burst', self._burst_limit, self._burst_window, reservation.stamp, current_time)
+                self._engine.release('global', self._global_limit, self._window, reservation.stamp, current_time)
+
+    def acquire(self, url: str, timeout: Optional[float] = None):
+        """
+        Block until a request to url fits within every limit and no
+        higher-priority waiter (see scheduler.scheduling) is ahead of it.
+
+        Sleeps exactly as long as the tightest of the burst, global, endpoint
+        and error backoff windows requires, so callers run at the maximum
+        allowed rate without polling. Raises RateLimitExceeded if the wait
+        would exceed timeout seconds.
+        """
+        self.scheduler.wait_turn(self, url, timeout)
+
+    async def acquire_async(self, url: str, timeout: Optional[float] = None):
+        """Awaitable version of acquire() that sleeps without blocking the event loop."""
+        await self.scheduler.wait_turn_async(self, url, timeout)
+
+    def must_queue(self) -> bool:
+        """Whether a request from the current context must queue behind waiting ones of equal or higher priority."""
+        return self.scheduler.outranked(self)
+
+    def record_request(self, url: str, method: str = 'GET', full_fetch: bool = True):
+        """
+        Record a successful request made without a reservation (it is
+        counted even if the limits are already used up).
+
+        full_fetch=False records a conditional request answered with 304 Not
+        Modified: it still counts against the rate limits but is tallied as a
+        revalidation rather than a full fetch.
+        """
+        current_time = time.time()
+        endpoint_category = self._get_endpoint_category(url)
         with self._lock:
-            endpoint_category = self._get_endpoint_category(url)
+            self._engine.record('burst', self._burst_limit, self._burst_window, current_time)
+            self._engine.record('global', self._global_limit, self._window, current_time)
+        with self._category_lock(endpoint_category):
+            reservation = self._record_endpoint(url, endpoint_category, current_time)
+        self.commit(reservation, full_fetch)
+
+    def check_circuit(self, url: str, admit: bool = True):
+        """
+        Raise CircuitOpenError (with retry_after) if url's circuit is open.
+
+        While the circuit is half-open the call admits a limited number of
+        probe requests, whose outcome must be reported with record_request()
+        / record_circuit_success() or record_circuit_failure(). With
+        admit=False it only checks, without taking a probe (e.g. before
+        waiting for a rate limit slot).
+        """
+        if not self._breakers:
+            return
+        key = self._circuit_key(url)
+        with self._circuit_lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                return
+            now = time.time()
+            wait = breaker.allow(now) if admit else breaker.wait(now)
+        if wait > 0:
+            self._count_blocked()
+            raise CircuitOpenError(f"Circuit open for {key} (retry in {wait:.1f}s)", retry_after=wait)
+
+    def _record_circuit_success(self, key: str):
+        with self._circuit_lock:
+            breaker = self._breakers.get(key)
+            if breaker is not None:
+                breaker.record_success()
+
+    def record_circuit_success(self, url: str):
+        """Report that url's endpoint answered, even if with a client error (4xx)."""
+        if self._breakers:
+            self._record_circuit_success(self._circuit_key(url))
+
+    def record_circuit_failure(self, url: str):
+        """Report an outage failure (timeout, connection error, 5xx) for url's endpoint."""
+        key = self._circuit_key(url)
+        with self._circuit_lock:
+            breaker = self._breakers.get(key)
+            if breaker is None:
+                breaker = self._breakers[key] = CircuitBreaker(self._failure_threshold, self._recovery_timeout)
+            breaker.record_failure(time.time())
+
+    def record_retry_after(self, url: str, seconds: float):
+        """
+        Pause requests in url's endpoint category for seconds, as asked by a
+        Retry-After header. Unlike record_error this does not escalate: the
+        server said exactly how long to wait.
+        """
+        endpoint_category = self._get_endpoint_category(url)
+        with self._category_lock(endpoint_category):
+            retry_at = time.time() + seconds
+            if retry_at > self._retry_after_until.get(endpoint_category, 0.0):
+                self._retry_after_until[endpoint_category] = retry_at
+
+    def observe_response(
+        self,
+        url: str,
+        status_code: Optional[int],
+        latency: Optional[float] = None,
+        headers: Optional[Mapping[str, str]] = None
+    ):
+        """
+        Feed a response's status, latency (seconds) and headers to the
+        adaptive controller; status_code None reports a timeout. Does
+        nothing unless the limiter is adaptive.
+        """
+        if self._adaptive is None:
+            return
+        endpoint_category = self._get_endpoint_category(url)
+        with self._category_lock(endpoint_category):
+            configured = self._endpoint_limits.get(endpoint_category, self._endpoint_limits['default'])
+            self._adaptive.observe(endpoint_category, configured, time.time(), status_code, latency, headers)
+
+    def record_error(self, url: str, status_code: Optional[int] = None):
+        """
+        Record a failed request for category-wide exponential backoff (used
+        by clients that do not retry; retrying clients back off per request).
+        """
+        endpoint_category = self._get_endpoint_category(url)
+        with self._category_lock(endpoint_category):
             self._error_counts[endpoint_category] += 1
             self._last_error_time[endpoint_category] = time.time()
 
-    def cache_response(self, url: str, method: str, response: Any):
-        """Cache a successful response."""
+    def cache_response(
+        self,
+        url: str,
+        method: str,
+        response: Any,
+        size: int = 0,
+        ttl: Optional[float] = None,
+        validators: Optional[Dict[str, str]] = None,
+        raw: Optional[bytes] = None
+    ):
+        """
+        Cache a successful response.
+
+        size (bytes) counts toward the cache's byte bound. ttl overrides the
+        endpoint category's TTL for this entry. validators holds the
+        response's ETag / Last-Modified headers so the entry can be
+        revalidated with a conditional request once it expires. raw is the
+        body as received; it is what cache_raw mode keeps in memory and saves
+        the persistent cache from re-encoding the response.
+        """
         if method.upper() == 'GET':
             cache_key = self._get_cache_key(url, method)
-            self._cache_response(cache_key, response)
+            if ttl is None:
+                ttl = self._cache_ttls.get(self._get_endpoint_category(url))
+            value = RawJSON(raw) if self._cache_raw and raw is not None else response
+            self._cache.set(cache_key, value, ttl=ttl, size=size, validators=validators or None)
+            if self._persistent_cache is not None:
+                self._persistent_cache.set(cache_key, response, validators or None, body=raw)
+
+    def get_revalidation(self, url: str, method: str = 'GET') -> Optional[Tuple[Any, Dict[str, str]]]:
+        """
+        Return (cached_response, conditional_headers) for an expired cached
+        response that can be revalidated, or None.
+        """
+        cache_key = self._get_cache_key(url, method)
+        entry = self._cache.get_stale(cache_key)
+        if entry is not None and entry.validators:
+            response, validators = self._decoded(entry.value), entry.validators
+        elif self._persistent_cache is not None:
+            stale = self._persistent_cache.get_stale(cache_key)
+            if stale is None:
+                return None
+            response, validators = stale
+        else:
+            return None
+
+        headers = {}
+        if validators.get('ETag'):
+            headers['If-None-Match'] = validators['ETag']
+        if validators.get('Last-Modified'):
+            headers['If-Modified-Since'] = validators['Last-Modified']
+        return (response, headers) if headers else None
+
+    def refresh_cached_response(
+        self,
+        url: str,
+        response: Any,
+        method: str = 'GET',
+        ttl: Optional[float] = None,
+        validators: Optional[Dict[str, str]] = None
+    ):
+        """Mark a revalidated (304 Not Modified) response fresh again."""
+        cache_key = self._get_cache_key(url, method)
+        if ttl is None:
+            ttl = self._cache_ttls.get(self._get_endpoint_category(url))
+        if not self._cache.refresh(cache_key, ttl):
+            # Revalidated from the persistent cache: bring it back into memory
+            value = RawJSON(dumps(response)) if self._cache_raw else response
+            self._cache.set(
+                cache_key,
+                value,
+                ttl=ttl,
+                size=len(value) if isinstance(value, RawJSON) else 0,
+                validators=validators or None
+            )
+        if self._persistent_cache is not None:
+            self._persistent_cache.touch(cache_key)
 
     def get_stats(self) -> Dict[str, Any]:
         """Get usage statistics."""
+        cache_stats = self._cache.stats()
+        # Outside self._lock: the scheduler takes its own lock before the limiter's
+        scheduler_stats = self.scheduler.stats()
+        with self._circuit_lock:
+            now = time.time()
+            circuits = {key: breaker.snapshot(now) for key, breaker in self._breakers.items()}
         with self._lock:
-            # Clean old requests for accurate counts
-            self._clean_old_requests(self._global_requests, 60)
-
+            now = time.time()
             return {
+                'engine': self._engine.name,
                 'total_requests': self._total_requests,
                 'blocked_requests': self._blocked_requests,
-                'current_rpm': len(self._global_requests),
-                'cache_size': len(self._cache),
+                'revalidated_requests': self._revalidated_requests,
+                'current_rpm': self._engine.count('global', self._global_limit, self._window, now),
+                'cache_size': cache_stats['entries'],
+                'cache_bytes': cache_stats['bytes'],
+                'cache_hits': cache_stats['hits'],
+                'cache_misses': cache_stats['misses'],
+                'cache_evictions': cache_stats['evictions'],
+                'cache_ttl': self._cache.default_ttl,
+                'cache_ttls': dict(self._cache_ttls),
+                'cache_raw': self._cache_raw,
+                'json_backend': get_backend().name,
+                'persistent_cache_size': len(self._persistent_cache) if self._persistent_cache is not None else 0,
                 'error_counts': dict(self._error_counts),
+                'circuits': circuits,
+                'scheduler': scheduler_stats,
+                'adaptive_limits': self._adaptive.snapshot() if self._adaptive is not None else {},
                 'efficiency': (1 - self._blocked_requests / max(1, self._total_requests + self._blocked_requests)) * 100
             }
 
     def clear_cache(self):
         """Clear the response cache."""
-        with self._lock:
-            self._cache.clear()
+        self._cache.clear()
+        if self._persistent_cache is not None:
+            self._persistent_cache.clear()
 
 
-# Global rate limiter instance
-_rate_limiter = RateLimiter()
+# Global rate limiter instance; E2_RATE_LIMIT_ENGINE=shared makes every process on the host share its budgets,
+# E2_RATE_LIMIT_ADAPTIVE=1 adapts the endpoint limits to the server's responses
+_rate_limiter = RateLimiter(
+    engine=os.getenv("E2_RATE_LIMIT_ENGINE") or 'sliding_window',
+    adaptive=os.getenv("E2_RATE_LIMIT_ADAPTIVE", "").lower() in ("1", "true", "yes")
+)
 
 
 def get_rate_limiter() -> RateLimiter:
@@ -0,0 +1,99 @@
+"""
+Retry policy for failed API requests.
+
+RetryPolicy decides whether a failed request is worth retrying (timeouts,
+network errors, 429 and 5xx responses) and how long to wait first: the
+server's Retry-After when it sends one, otherwise "decorrelated jitter"
+backoff (each delay drawn between base_delay and three times the previous
+one, capped at max_delay), so many clients retrying at once spread out
+instead of hitting the API in lockstep. Retries stop after max_attempts or
+when the next wait would push the call past its total latency budget.
+"""
+
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Iterable, Optional
+
+import httpx
+
+RETRYABLE_STATUSES = (429, 500, 502, 503, 504)
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date), or None."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, retry_at.timestamp() - time.time())
+
+
+class RetryPolicy:
+    """
+    When and how long to wait before retrying a failed request.
+
+    max_attempts counts the first try. budget caps the seconds from the first
+    attempt to the start of the last retry (None for no cap); a Retry-After
+    longer than the remaining budget ends the retries.
+    """
+
+    def __init__(
+        self,
+        max_attempts: int = 3,
+        base_delay: float = 0.5,
+        max_delay: float = 30.0,
+        budget: Optional[float] = 60.0,
+        retry_statuses: Iterable[int] = RETRYABLE_STATUSES,
+        respect_retry_after: bool = True
+    ):
+        self.max_attempts = max_attempts
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.budget = budget
+        self.retry_statuses = frozenset(retry_statuses)
+        self.respect_retry_after = respect_retry_after
+
+    def is_retryable(self, error: BaseException) -> bool:
+        """Timeouts, connection failures and retryable HTTP statuses."""
+        if isinstance(error, httpx.HTTPStatusError):
+            return error.response.status_code in self.retry_statuses
+        return isinstance(error, (httpx.TimeoutException, httpx.NetworkError, httpx.RemoteProtocolError))
+
+    def retry_after(self, error: BaseException) -> Optional[float]:
+        """The Retry-After delay sent with a failed response, if any."""
+        if not self.respect_retry_after or not isinstance(error, httpx.HTTPStatusError):
+            return None
+        return parse_retry_after(error.response.headers.get("Retry-After"))
+
+    def jitter(self, previous_delay: float) -> float:
+        """Next decorrelated-jitter delay after previous_delay (0 for the first retry)."""
+        upper = max(self.base_delay, previous_delay * 3)
+        return min(self.max_delay, random.uniform(self.base_delay, upper))
+
+    def next_delay(
+        self,
+        error: BaseException,
+        attempt: int,
+        previous_delay: float,
+        elapsed: float
+    ) -> Optional[float]:
+        """
+        Seconds to wait before retrying after attempt number attempt failed
+        with error, elapsed seconds into the call, or None to give up.
+        """
+        if attempt >= self.max_attempts or not self.is_retryable(error):
+            return None
+        delay = self.retry_after(error)
+        if delay is None:
+            delay = self.jitter(previous_delay)
+        if self.budget is not None and elapsed + delay > self.budget:
+            return None
+        return delay
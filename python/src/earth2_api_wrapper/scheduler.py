@@ -0,0 +1,298 @@
+"""
+Priority scheduling for requests waiting on the rate limiter.
+
+When the budget is exhausted, waiting requests are released in priority
+order instead of whichever sleeper wakes first: every 'interactive' request
+goes before any 'normal' one, which goes before 'batch' work. Within a class
+requests are ordered by start-time fair queuing over their tags, so two bulk
+scans tagged differently share the class's turns in proportion to their
+weights instead of one starving the other. A request only waits behind
+higher-ranked ones whose own endpoint category has room, so a saturated
+category does not hold up the rest.
+
+Waiting requests are kept in one queue per endpoint category. Requests in
+a category share its availability, so only each category's first request
+is compared across categories and woken when the queues move; the rest
+sleep until they reach the front.
+
+Priority and tag come from the current context:
+
+    with scheduling("batch", tag="nightly-scan"):
+        for landfield in client.iter_market(country="AU"):
+            ...
+"""
+
+import asyncio
+import bisect
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional, Tuple, TypeVar, Union
+
+if TYPE_CHECKING:
+    from .rate_limiter import RateLimiter, Reservation
+
+T = TypeVar("T")
+
+PRIORITIES = {"interactive": 0, "normal": 1, "batch": 2}
+
+_scheduling: ContextVar[Tuple[int, Optional[str]]] = ContextVar(
+    "earth2_scheduling", default=(PRIORITIES["normal"], None)
+)
+
+
+def _priority_rank(priority: Union[str, int]) -> int:
+    if isinstance(priority, int):
+        return priority
+    try:
+        return PRIORITIES[priority]
+    except KeyError:
+        raise ValueError(f"Unknown priority {priority!r} (choose from {', '.join(PRIORITIES)})") from None
+
+
+@contextmanager
+def scheduling(priority: Union[str, int] = "normal", tag: Optional[str] = None) -> Iterator[None]:
+    """Run requests made in this context with the given priority class and fairness tag."""
+    token = _scheduling.set((_priority_rank(priority), tag))
+    try:
+        yield
+    finally:
+        _scheduling.reset(token)
+
+
+def current_scheduling() -> Tuple[int, Optional[str]]:
+    """(priority rank, tag) of the current context."""
+    return _scheduling.get()
+
+
+def propagate(fn: Callable[..., T]) -> Callable[..., T]:
+    """fn wrapped to run with the caller's priority and tag, e.g. when handed to a worker thread."""
+    priority, tag = current_scheduling()
+
+    def run(*args: Any, **kwargs: Any) -> T:
+        with scheduling(priority, tag):
+            return fn(*args, **kwargs)
+    return run
+
+
+class _Ticket:
+    __slots__ = ('key', 'url', 'category', 'rank', 'start', 'wake', 'enqueued_at', 'reserve', 'reservation')
+
+    def __init__(
+        self,
+        key: Tuple[int, float, int],
+        url: str,
+        category: str,
+        start: float,
+        wake: Callable[[], Any],
+        reserve: bool
+    ):
+        self.key = key
+        self.url = url
+        self.category = category
+        self.rank = key[0]
+        self.start = start
+        self.wake = wake
+        self.enqueued_at = time.monotonic()
+        self.reserve = reserve
+        self.reservation: Optional["Reservation"] = None
+
+    def __lt__(self, other: "_Ticket") -> bool:
+        return self.key < other.key
+
+
+class RequestScheduler:
+    """
+    Orders requests that have to wait for a rate limit slot.
+
+    Tags weigh 1.0 unless set_weight() says otherwise; a tag with weight 2
+    gets twice the turns of a weight-1 tag in the same priority class.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Waiting tickets per endpoint category, each queue sorted by dispatch order
+        self._queues: Dict[str, List[_Ticket]] = {}
+        self._seq = itertools.count()
+        self._weights: Dict[str, float] = {}
+        self._virtual_time: Dict[int, float] = {}
+        self._tag_finish: Dict[Tuple[int, Optional[str]], float] = {}
+        self._dispatched: Dict[int, int] = {}
+        self._max_wait: Dict[int, float] = {}
+
+    def set_weight(self, tag: str, weight: float):
+        """Share of turns for tag relative to other tags of the same priority (default 1.0)."""
+        if weight <= 0:
+            raise ValueError("weight must be positive")
+        self._weights[tag] = weight
+
+    def outranked(self, limiter: "RateLimiter") -> bool:
+        """
+        Whether a request from the current context would go behind a queued
+        one of equal or higher priority that can take a slot now.
+        """
+        if not self._queues:
+            return False
+        rank = current_scheduling()[0]
+        with self._lock:
+            # A category's first ticket is its highest-ranked one
+            categories = [queue[0].category for queue in self._queues.values() if queue[0].rank <= rank]
+        return any(limiter._category_wait(category) <= 0 for category in categories)
+
+    def _enqueue(self, url: str, category: str, wake: Callable[[], Any], reserve: bool) -> _Ticket:
+        rank, tag = current_scheduling()
+        with self._lock:
+            start = max(self._virtual_time.get(rank, 0.0), self._tag_finish.get((rank, tag), 0.0))
+            finish = start + 1.0 / self._weights.get(tag or "", 1.0)
+            self._tag_finish[(rank, tag)] = finish
+            ticket = _Ticket((rank, finish, next(self._seq)), url, category, start, wake, reserve)
+            bisect.insort(self._queues.setdefault(category, []), ticket)
+        return ticket
+
+    def _turn(self, ticket: _Ticket, limiter: "RateLimiter") -> Optional[float]:
+        """
+        0.0 if ticket may go now (it is dequeued, holding its reservation
+        if it asked for one), else seconds until its own slot opens, or None
+        to wait until a higher-ranked request moves.
+        """
+        with self._lock:
+            if self._queues[ticket.category][0] is not ticket:
+                # Same category, same availability: the request ahead goes first
+                return None
+            for category, queue in self._queues.items():
+                # Each category's availability is looked up once per pass
+                if category != ticket.category and queue[0] < ticket and limiter._category_wait(category) <= 0:
+                    # A higher-ranked request can go first
+                    return None
+            if ticket.reserve:
+                ticket.reservation, _, wait = limiter._try_reserve(ticket.url)
+                if ticket.reservation is None:
+                    return max(wait, 0.001)
+            else:
+                wait = limiter._category_wait(ticket.category)
+                if wait > 0:
+                    return wait
+            self._dispatch(ticket)
+            return 0.0
+
+    def _dispatch(self, ticket: _Ticket):
+        self._remove(ticket)
+        rank = ticket.rank
+        self._virtual_time[rank] = max(self._virtual_time.get(rank, 0.0), ticket.start)
+        self._dispatched[rank] = self._dispatched.get(rank, 0) + 1
+        waited = time.monotonic() - ticket.enqueued_at
+        self._max_wait[rank] = max(self._max_wait.get(rank, 0.0), waited)
+        if len(self._tag_finish) > 1000:
+            # Tags that are behind the virtual clock carry no credit; forget them
+            self._tag_finish = {
+                key: finish for key, finish in self._tag_finish.items()
+                if finish > self._virtual_time.get(key[0], 0.0)
+            }
+
+    def _remove(self, ticket: _Ticket):
+        """Take ticket out of its category's queue if it is still there (call with self._lock held)."""
+        queue = self._queues.get(ticket.category)
+        if queue is None:
+            return
+        index = bisect.bisect_left(queue, ticket)
+        if index < len(queue) and queue[index] is ticket:
+            del queue[index]
+            if not queue:
+                del self._queues[ticket.category]
+
+    def _abandon(self, ticket: _Ticket):
+        with self._lock:
+            self._remove(ticket)
+
+    def _wake_heads(self):
+        """Wake each category's first ticket; the others are woken once they reach the front."""
+        with self._lock:
+            heads = [queue[0] for queue in self._queues.values()]
+        for ticket in heads:
+            ticket.wake()
+
+    def _wait_delay(self, ticket: _Ticket, limiter: "RateLimiter", deadline: Optional[float]) -> Optional[float]:
+        """_turn(), capped at the deadline; raises if the deadline has passed or the slot opens after it."""
+        delay = self._turn(ticket, limiter)
+        if delay == 0.0 or deadline is None:
+            return delay
+        remaining = deadline - time.monotonic()
+        if remaining <= 0 or (delay is not None and delay > remaining):
+            from .rate_limiter import RateLimitExceeded
+            retry_after = limiter.time_until_available(ticket.url)
+            raise RateLimitExceeded(
+                f"Rate limit exceeded: no slot for {limiter._get_endpoint_category(ticket.url)} "
+                f"within {deadline - ticket.enqueued_at:.1f}s",
+                retry_after=retry_after or None
+            )
+        return remaining if delay is None else delay
+
+    def wait_turn(
+        self,
+        limiter: "RateLimiter",
+        url: str,
+        timeout: Optional[float] = None,
+        reserve: bool = False
+    ) -> Optional["Reservation"]:
+        """
+        Block until it is this request's turn and its rate limit slot is open.
+        With reserve the slot is taken (see RateLimiter.reserve) and returned.
+        Raises RateLimitExceeded after timeout seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        event = threading.Event()
+        ticket = self._enqueue(url, limiter._get_endpoint_category(url), event.set, reserve)
+        try:
+            while True:
+                delay = self._wait_delay(ticket, limiter, deadline)
+                if delay == 0.0:
+                    return ticket.reservation
+                event.wait(delay)
+                event.clear()
+        finally:
+            self._abandon(ticket)
+            self._wake_heads()
+
+    async def wait_turn_async(
+        self,
+        limiter: "RateLimiter",
+        url: str,
+        timeout: Optional[float] = None,
+        reserve: bool = False
+    ) -> Optional["Reservation"]:
+        """Awaitable version of wait_turn()."""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        loop = asyncio.get_running_loop()
+        event = asyncio.Event()
+        ticket = self._enqueue(
+            url, limiter._get_endpoint_category(url), lambda: loop.call_soon_threadsafe(event.set), reserve
+        )
+        try:
+            while True:
+                delay = self._wait_delay(ticket, limiter, deadline)
+                if delay == 0.0:
+                    return ticket.reservation
+                try:
+                    await asyncio.wait_for(event.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                event.clear()
+        finally:
+            self._abandon(ticket)
+            self._wake_heads()
+
+    def stats(self) -> Dict[str, Any]:
+        """Queued and dispatched requests and the longest wait, per priority class."""
+        names = {rank: name for name, rank in PRIORITIES.items()}
+        with self._lock:
+            queued: Dict[str, int] = {}
+            for ticket in itertools.chain.from_iterable(self._queues.values()):
+                name = names.get(ticket.rank, str(ticket.rank))
+                queued[name] = queued.get(name, 0) + 1
+            return {
+                'queued': queued,
+                'dispatched': {names.get(rank, str(rank)): count for rank, count in self._dispatched.items()},
+                'max_wait': {names.get(rank, str(rank)): wait for rank, wait in self._max_wait.items()},
+            }
@@ -0,0 +1,90 @@
+"""
+Request coalescing ("single-flight") for identical in-flight calls.
+
+When several callers ask for the same key at once, only the first one runs the
+call; the others wait for it and receive the same result or exception. Keys
+are forgotten as soon as the call finishes, so later callers start a new one
+(typically answered from the response cache).
+"""
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class _Call:
+    __slots__ = ('done', 'result', 'error')
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Thread-based single-flight group."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+        self.shared = 0  # Calls answered by another caller's request
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        """Run fn() unless a call for key is already in flight, in which case share its outcome."""
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if call is None:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as error:
+            call.error = error
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+
+
+class AsyncSingleFlight:
+    """asyncio single-flight group (one per event loop)."""
+
+    def __init__(self):
+        self._calls: Dict[str, "asyncio.Future[Any]"] = {}
+        self.shared = 0
+
+    async def do(self, key: str, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """Await fn() unless a call for key is already in flight, in which case share its outcome."""
+        future = self._calls.get(key)
+        if future is not None:
+            self.shared += 1
+            # Shield so a cancelled follower doesn't cancel the leader's call
+            return await asyncio.shield(future)
+
+        future = asyncio.get_running_loop().create_future()
+        self._calls[key] = future
+        try:
+            result = await fn()
+            future.set_result(result)
+            return result
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as error:
+            future.set_exception(error)
+            # Mark retrieved so an unshared failure doesn't log "exception was never retrieved"
+            future.exception()
+            raise
+        finally:
+            del self._calls[key]
@@ -0,0 +1,140 @@
+"""
+HTTP connection pooling for the Earth2 clients.
+
+ConnectionSettings bundles the httpx pool limits, timeouts and HTTP/2 switch
+used to build a client's transport. shared_transport() hands out one pooled
+transport per settings value, so any number of Earth2Client instances (each
+with its own cookies) reuse the same keep-alive / TLS connections to the
+Earth2 hosts instead of handshaking again. HTTP/2 needs the optional `h2`
+package (`pip install earth2-api-wrapper[http2]`).
+"""
+
+import threading
+from typing import Dict, NamedTuple, Optional
+
+import httpx
+from httpx._utils import get_environment_proxies
+
+# Hosts the clients talk to; keep-alive limits are sized for all of them
+EARTH2_HOSTS = ("r.earth2.io", "app.earth2.io", "resources.earth2.io", "auth.earth2.io")
+
+
+def _require_h2():
+    try:
+        import h2  # noqa: F401
+    except ImportError:
+        raise ImportError(
+            "HTTP/2 requires the h2 package. Install it with: pip install earth2-api-wrapper[http2]"
+        ) from None
+
+
+class ConnectionSettings(NamedTuple):
+    """
+    Connection pool, protocol and timeout settings.
+
+    httpx caps idle keep-alive connections across all hosts, so
+    keepalive_per_host is applied as keepalive_per_host * len(EARTH2_HOSTS).
+    Timeouts are in seconds; pool_timeout is how long a request waits for a
+    free connection when max_connections are busy.
+    """
+
+    max_connections: int = 20
+    keepalive_per_host: int = 5
+    keepalive_expiry: float = 30.0
+    http2: bool = False
+    connect_timeout: float = 10.0
+    read_timeout: float = 30.0
+    write_timeout: float = 30.0
+    pool_timeout: float = 30.0
+
+    def limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.keepalive_per_host * len(EARTH2_HOSTS),
+            keepalive_expiry=self.keepalive_expiry,
+        )
+
+    def timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(
+            connect=self.connect_timeout,
+            read=self.read_timeout,
+            write=self.write_timeout,
+            pool=self.pool_timeout,
+        )
+
+    def create_transport(self) -> httpx.HTTPTransport:
+        """A new pooled transport with these limits."""
+        if self.http2:
+            _require_h2()
+        return httpx.HTTPTransport(http2=self.http2, limits=self.limits())
+
+    def create_async_transport(self) -> httpx.AsyncHTTPTransport:
+        """A new pooled asyncio transport with these limits."""
+        if self.http2:
+            _require_h2()
+        return httpx.AsyncHTTPTransport(http2=self.http2, limits=self.limits())
+
+    def _proxy_mounts(self) -> Dict[str, Optional[httpx.BaseTransport]]:
+        """
+        Transports for the HTTP(S)_PROXY / ALL_PROXY / NO_PROXY environment,
+        which httpx skips once a client is given an explicit transport.
+        """
+        return {
+            pattern: None if proxy is None else httpx.HTTPTransport(
+                http2=self.http2, limits=self.limits(), proxy=proxy
+            )
+            for pattern, proxy in get_environment_proxies().items()
+        }
+
+    def create_client(self, transport: Optional[httpx.BaseTransport] = None) -> httpx.Client:
+        """
+        An httpx.Client using these settings, over transport if given (e.g.
+        a shared one). Proxies from the environment are honoured either way.
+        """
+        if self.http2:
+            _require_h2()
+        if transport is None:
+            return httpx.Client(timeout=self.timeout(), limits=self.limits(), http2=self.http2)
+        return httpx.Client(timeout=self.timeout(), transport=transport, mounts=self._proxy_mounts())
+
+    def create_async_client(self) -> httpx.AsyncClient:
+        """An httpx.AsyncClient using these settings (proxies from the environment are honoured)."""
+        if self.http2:
+            _require_h2()
+        return httpx.AsyncClient(timeout=self.timeout(), limits=self.limits(), http2=self.http2)
+
+
+class _SharedTransport(httpx.BaseTransport):
+    """Pooled transport shared by several clients; closing one client leaves the pool open."""
+
+    def __init__(self, transport: httpx.HTTPTransport):
+        self.transport = transport
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        return self.transport.handle_request(request)
+
+    def close(self):
+        pass
+
+
+_shared_lock = threading.Lock()
+_shared_transports: Dict[ConnectionSettings, _SharedTransport] = {}
+
+
+def shared_transport(settings: Optional[ConnectionSettings] = None) -> httpx.BaseTransport:
+    """The process-wide pooled transport for settings (created on first use)."""
+    settings = settings or ConnectionSettings()
+    with _shared_lock:
+        transport = _shared_transports.get(settings)
+        if transport is None:
+            transport = _shared_transports[settings] = _SharedTransport(settings.create_transport())
+        return transport
+
+
+def close_shared_transports():
+    """Close every shared transport's connections (they are recreated on next use)."""
+    with _shared_lock:
+        transports = list(_shared_transports.values())
+        _shared_transports.clear()
+    for transport in transports:
+        transport.transport.close()
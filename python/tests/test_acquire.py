@@ -0,0 +1,99 @@
+"""Waiting for a rate limit slot with acquire() and the clients' wait_for_rate_limit mode (offline)."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from earth2_api_wrapper.client import Earth2Client
+from earth2_api_wrapper.rate_limiter import RateLimitExceeded, RateLimiter
+
+URL = "https://r.earth2.io/landfields/00000000-0000-0000-0000-000000000000"
+WINDOW = 0.3
+
+
+def _limiter() -> RateLimiter:
+    """One 'property' request per WINDOW seconds."""
+    limiter = RateLimiter()
+    limiter._window = WINDOW
+    limiter._endpoint_limits['property'] = 1
+    return limiter
+
+
+def test_acquire_returns_at_once_when_there_is_room():
+    limiter = _limiter()
+    started = time.monotonic()
+    limiter.acquire(URL)
+    assert time.monotonic() - started < 0.05
+
+
+def test_acquire_sleeps_until_the_window_has_room():
+    limiter = _limiter()
+    limiter.record_request(URL)
+    started = time.monotonic()
+    limiter.acquire(URL)
+
+    assert WINDOW * 0.8 < time.monotonic() - started < WINDOW * 3
+    assert limiter.time_until_available(URL) == 0
+
+
+def test_acquire_raises_when_the_slot_opens_after_the_timeout():
+    limiter = _limiter()
+    limiter.record_request(URL)
+    with pytest.raises(RateLimitExceeded) as excinfo:
+        limiter.acquire(URL, timeout=WINDOW / 10)
+    assert excinfo.value.retry_after is not None and 0 < excinfo.value.retry_after <= WINDOW
+
+
+def test_acquire_async_sleeps_without_blocking_the_loop():
+    limiter = _limiter()
+    limiter.record_request(URL)
+    ticks = 0
+
+    async def tick():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    async def run():
+        ticker = asyncio.ensure_future(tick())
+        await limiter.acquire_async(URL)
+        ticker.cancel()
+
+    asyncio.run(run())
+    assert ticks > 5
+
+
+def _client(limiter: RateLimiter, **kwargs) -> Earth2Client:
+    def handler(request: httpx.Request) -> httpx.Response:
+        return httpx.Response(200, json={"url": str(request.url)})
+
+    return Earth2Client(client=httpx.Client(transport=httpx.MockTransport(handler)), rate_limiter=limiter, **kwargs)
+
+
+def test_client_waits_for_a_slot_instead_of_raising():
+    limiter = _limiter()
+    with _client(limiter, wait_for_rate_limit=True) as client:
+        client.get_property("a")
+        started = time.monotonic()
+        client.get_property("b")
+    assert time.monotonic() - started > WINDOW * 0.8
+
+
+def test_client_raises_without_wait_mode():
+    limiter = _limiter()
+    with _client(limiter) as client:
+        client.get_property("a")
+        with pytest.raises(RateLimitExceeded):
+            client.get_property("b")
+
+
+def test_client_wait_is_bounded_by_max_rate_limit_wait():
+    limiter = _limiter()
+    limiter._window = 60
+    with _client(limiter, wait_for_rate_limit=True, max_rate_limit_wait=0.1) as client:
+        client.get_property("a")
+        with pytest.raises(RateLimitExceeded):
+            client.get_property("b")
@@ -0,0 +1,105 @@
+"""AIMD adaptive per-category limits, alone and driven by client responses (offline, via httpx.MockTransport)."""
+
+import httpx
+import pytest
+
+from earth2_api_wrapper.adaptive import AdaptiveController
+from earth2_api_wrapper.client import Earth2Client
+from earth2_api_wrapper.rate_limiter import RateLimitExceeded, RateLimiter
+from earth2_api_wrapper.retry import RetryPolicy
+
+
+def test_healthy_responses_raise_the_limit_up_to_the_ceiling():
+    controller = AdaptiveController(increase=5.0)
+    assert controller.limit("search", 10) == 10
+    controller.observe("search", 10, now=0.0, status_code=200)
+    assert controller._states["search"].limit == pytest.approx(10.5)
+
+    for _ in range(1000):
+        controller.observe("search", 10, now=0.0, status_code=200)
+    assert controller.limit("search", 10) == 20
+    capped = AdaptiveController(ceilings={"search": 12})
+    for _ in range(1000):
+        capped.observe("search", 10, now=0.0, status_code=200)
+    assert capped.limit("search", 10) == 12
+
+
+def test_overload_halves_the_limit_once_per_cooldown():
+    controller = AdaptiveController(cooldown=5.0, min_limit=2.0)
+    controller.observe("search", 40, now=100.0, status_code=429)
+    controller.observe("search", 40, now=101.0, status_code=503)
+    assert controller.limit("search", 40) == 20
+    controller.observe("search", 40, now=106.0, status_code=None)
+    assert controller.limit("search", 40) == 10
+    for second in range(120, 200, 10):
+        controller.observe("search", 40, now=float(second), status_code=429)
+    assert controller.limit("search", 40) == 2
+    assert controller.snapshot()["search"]["decreases"] == 10
+
+
+def test_latency_spikes_cut_the_limit_after_warmup():
+    controller = AdaptiveController(warmup=3, latency_factor=3.0)
+    controller.observe("user", 40, now=100.0, status_code=200, latency=2.0)
+    controller.observe("user", 40, now=100.0, status_code=200, latency=0.1)
+    before = controller._states["user"].limit
+    controller.observe("user", 40, now=100.0, status_code=200, latency=0.1)
+    # Three times the moving average (about 1.3s) is a spike
+    controller.observe("user", 40, now=100.0, status_code=200, latency=5.0)
+    assert controller._states["user"].limit == pytest.approx((before + 5 / before) * 0.5)
+
+    ignoring = AdaptiveController(warmup=0, latency_factor=None)
+    ignoring.observe("user", 40, now=0.0, status_code=200, latency=50.0)
+    assert ignoring.snapshot()["user"]["decreases"] == 0
+
+
+def test_rate_limit_headers_hold_or_cut_the_limit():
+    controller = AdaptiveController()
+    controller.observe("search", 30, now=0.0, status_code=200, headers={"RateLimit-Remaining": "5"})
+    assert controller.snapshot()["search"]["increases"] == 1
+    controller.observe("search", 30, now=0.0, status_code=200,
+                       headers={"RateLimit-Limit": "100, 100;w=60", "RateLimit-Remaining": "9"})
+    assert controller.snapshot()["search"]["increases"] == 1
+    controller.observe("search", 30, now=100.0, status_code=200, headers={"X-RateLimit-Remaining": "0"})
+    assert controller.snapshot()["search"]["decreases"] == 1
+
+
+def test_client_errors_are_no_signal():
+    controller = AdaptiveController()
+    controller.observe("property", 60, now=0.0, status_code=404)
+    assert controller.snapshot()["property"]["increases"] == controller.snapshot()["property"]["decreases"] == 0
+
+
+def test_decrease_must_be_a_fraction():
+    with pytest.raises(ValueError):
+        AdaptiveController(decrease=1.5)
+
+
+def test_client_responses_drive_the_limiters_limit():
+    statuses = [429, 200, 200]
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        if "/slow/" in request.url.path:
+            raise httpx.ReadTimeout("slow", request=request)
+        return httpx.Response(statuses.pop(0), json={})
+
+    # A small increase keeps the successes below from raising the limit past the next integer
+    limiter = RateLimiter(adaptive=AdaptiveController(cooldown=0.0, increase=0.1))
+    limiter._endpoint_limits['property'] = 4
+    with Earth2Client(
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        rate_limiter=limiter,
+        retry_policy=RetryPolicy(max_attempts=1),
+    ) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            client.get_property("a")
+        assert limiter.get_stats()["adaptive_limits"]["property"]["limit"] == 2
+
+        # The halved limit is enforced: one more request fits in the window
+        client.get_property("b")
+        with pytest.raises(RateLimitExceeded):
+            client.get_property("c")
+
+        limiter._endpoint_limits['resources'] = 10
+        with pytest.raises(httpx.ReadTimeout):
+            client.get_resources("slow")
+    assert limiter.get_stats()["adaptive_limits"]["resources"]["limit"] == 5
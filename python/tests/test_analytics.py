@@ -0,0 +1,108 @@
+"""Vectorized MarketBatch analytics over a scanned market (offline, via httpx.MockTransport)."""
+
+import math
+
+import httpx
+import pytest
+
+from earth2_api_wrapper.analytics import MarketBatch
+from earth2_api_wrapper.client import Earth2Client
+from earth2_api_wrapper.rate_limiter import RateLimiter
+from earth2_api_wrapper.retry import RetryPolicy
+
+np = pytest.importorskip("numpy")
+
+# id, country, tier, tileClass, tileCount, price (price per tile in the comment)
+LISTINGS = [
+    ("a", "AU", "1", 1, 10, 100),  # 10
+    ("b", "AU", "1", 1, 5, 45),  # 9
+    ("c", "AU", "2", None, 4, 48),  # 12
+    ("d", "US", "1", 2, 2, 22),  # 11
+    ("e", "US", "1", 2, 1, 5000),  # 5000
+    ("f", "US", "1", 2, 0, 5),  # no tiles
+    ("g", None, None, None, 1, 8),  # 8
+]
+
+
+def _landfield(id, country, tier, tile_class, tile_count, price):  # noqa: A002
+    landfield = {"id": id, "country": country, "tileCount": tile_count, "price": price}
+    if tier is not None:
+        landfield["tier"] = tier
+    if tile_class is not None:
+        landfield["tileClass"] = tile_class
+    return landfield
+
+
+@pytest.fixture
+def requests_made():
+    return []
+
+
+@pytest.fixture
+def client(requests_made):
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests_made.append(request.url)
+        page = int(request.url.params["page"])
+        landfields = [_landfield(*listing) for listing in LISTINGS] if page == 1 else []
+        return httpx.Response(200, json={"landfields": landfields, "count": len(LISTINGS)})
+
+    with Earth2Client(
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        rate_limiter=RateLimiter(),
+        retry_policy=RetryPolicy(max_attempts=1),
+    ) as client:
+        yield client
+
+
+@pytest.fixture
+def batch(client):
+    return MarketBatch.from_landfields(client.iter_market())
+
+
+def test_columns_from_a_scan(batch):
+    assert len(batch) == 7
+    assert batch.tile_count.tolist() == [10, 5, 4, 2, 1, 0, 1]
+    assert batch.tier.tolist() == [1, 1, 2, 1, 1, 1, -1]
+    assert math.isnan(batch.price_per_tile[5])
+    assert batch.country_labels == ["AU", "US", ""]
+
+
+def test_price_per_tile_stats_skip_listings_without_tiles(batch):
+    stats = batch.price_per_tile_stats()
+    assert stats["count"] == 6
+    assert (stats["min"], stats["max"]) == (8.0, 5000.0)
+    assert stats["percentiles"][50] == pytest.approx(10.5)
+    assert batch.price_per_tile_stats(batch.mask(country="FR")) == {"count": 0}
+
+
+def test_masks_combine_filters(batch):
+    assert batch.mask(country="AU", tier=1).tolist() == [True, True, False, False, False, False, False]
+    assert np.flatnonzero(batch.mask(tile_count="2-10")).tolist() == [0, 1, 2, 3]
+    assert not batch.mask(tile_count="750-").any()
+
+
+def test_outliers_are_flagged_on_a_log_scale(batch):
+    assert np.flatnonzero(batch.outliers()).tolist() == [4]
+
+
+def test_floors_per_group(batch):
+    assert batch.floors() == [
+        {"country": "AU", "tier": 1, "tileClass": 1, "floor_price_per_tile": 9.0, "count": 2, "id": "b"},
+        {"country": "AU", "tier": 2, "tileClass": None, "floor_price_per_tile": 12.0, "count": 1, "id": "c"},
+        {"country": "US", "tier": 1, "tileClass": 2, "floor_price_per_tile": 11.0, "count": 2, "id": "d"},
+        {"country": None, "tier": None, "tileClass": None, "floor_price_per_tile": 8.0, "count": 1, "id": "g"},
+    ]
+    assert [(row["country"], row["count"], row["id"]) for row in batch.floors(by=("country",))] == [
+        ("AU", 3, "b"), ("US", 2, "d"), (None, 1, "g"),
+    ]
+
+
+def test_floor_lookups_are_answered_from_the_scan(client, batch, requests_made):
+    scanned = len(requests_made)
+    floor = client.get_market_floor({"country": "US", "landfieldTier": "1", "tileClass": "2"}, scan=batch)
+    assert floor["count"] == 2
+    assert [landfield["id"] for landfield in floor["landfields"]] == ["d", "e"]
+
+    floors = client.get_market_floors([{"country": "AU", "landfieldTier": "1"}, {"country": "FR"}], scan=batch)
+    assert [row["floor_price_per_tile"] for row in floors["data"]] == [9.0, None]
+    assert len(requests_made) == scanned
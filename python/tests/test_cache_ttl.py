@@ -0,0 +1,73 @@
+"""Per-category cache TTLs and per-call cache_ttl overrides (offline, via httpx.MockTransport)."""
+
+import httpx
+
+from earth2_api_wrapper.cache import SQLiteCache
+from earth2_api_wrapper.client import Earth2Client
+from earth2_api_wrapper.rate_limiter import RateLimiter
+from earth2_api_wrapper.retry import RetryPolicy
+
+
+def _client(calls, limiter: RateLimiter) -> Earth2Client:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"path": request.url.path})
+
+    return Earth2Client(
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        rate_limiter=limiter,
+        retry_policy=RetryPolicy(max_attempts=1),
+    )
+
+
+def _age(limiter: RateLimiter, seconds: float):
+    """Make every in-memory cache entry `seconds` older."""
+    for entry in limiter._cache._entries.values():
+        entry.stored_at -= seconds
+
+
+def test_category_ttl_only_applies_to_its_category():
+    calls = []
+    limiter = RateLimiter()
+    with _client(calls, limiter) as client:
+        client.set_cache_ttl(60)
+        client.set_cache_ttl(3600, "property")
+        client.get_property("a")
+        client.get_landing_metrics()
+        _age(limiter, 120)
+        client.get_property("a")
+        client.get_landing_metrics()
+
+    assert calls == ["/landfields/a", "/landing/metrics", "/landing/metrics"]
+    assert limiter.get_cache_ttl("property") == 3600
+    assert limiter.get_cache_ttl("leaderboard") == 60
+
+
+def test_per_call_ttl_bypasses_older_entries_and_sets_the_new_entry_ttl():
+    calls = []
+    limiter = RateLimiter()
+    with _client(calls, limiter) as client:
+        client.get_property("a")
+        _age(limiter, 10)
+        client.get_property("a")
+        client.get_property("a", cache_ttl=5)
+        assert len(calls) == 2
+        # The refetched entry keeps the 5s TTL for later calls without an override
+        _age(limiter, 6)
+        client.get_property("a")
+
+    assert calls == ["/landfields/a"] * 3
+
+
+def test_category_ttls_are_restored_from_the_persistent_cache(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    first = RateLimiter()
+    first.use_persistent_cache(SQLiteCache(path))
+    first.set_cache_ttl(30)
+    first.set_cache_ttl(900, "leaderboard")
+
+    second = RateLimiter()
+    second.use_persistent_cache(SQLiteCache(path))
+    assert second.get_cache_ttl() == 30
+    assert second.get_cache_ttl("leaderboard") == 900
+    assert second.get_stats()["cache_ttls"] == {"leaderboard": 900}
@@ -0,0 +1,127 @@
+"""Incremental marketplace change detection with MarketChangeFeed (offline, via httpx.MockTransport)."""
+
+import json
+from typing import Optional
+
+import httpx
+import pytest
+
+from earth2_api_wrapper import cli
+from earth2_api_wrapper.changefeed import MarketChangeFeed
+from earth2_api_wrapper.client import Earth2Client
+from earth2_api_wrapper.rate_limiter import RateLimiter
+from earth2_api_wrapper.retry import RetryPolicy
+
+
+class _Market:
+    """A mutable marketplace ({id: price}) served in pages; fail_page answers 404."""
+
+    def __init__(self, prices: dict):
+        self.prices = dict(prices)
+        self.fail_page: Optional[int] = None
+        self.requests = 0
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests += 1
+        page, items = int(request.url.params["page"]), int(request.url.params["items"])
+        if page == self.fail_page:
+            return httpx.Response(404)
+        listings = [{"id": key, "price": price, "tileCount": 1} for key, price in self.prices.items()]
+        return httpx.Response(200, json={"landfields": listings[(page - 1) * items:page * items]})
+
+
+def _client(market: _Market) -> Earth2Client:
+    return Earth2Client(
+        client=httpx.Client(transport=httpx.MockTransport(market)),
+        rate_limiter=RateLimiter(),
+        retry_policy=RetryPolicy(max_attempts=1),
+    )
+
+
+def _ids(listings) -> list:
+    return sorted(listing["id"] for listing in listings)
+
+
+def test_successive_scans_report_only_changes():
+    market = _Market({"a": 10, "b": 20, "c": 30})
+    with _client(market) as client:
+        feed = MarketChangeFeed(client, page_size=2, country="AU")
+        first = feed.scan()
+        assert _ids(first["added"]) == ["a", "b", "c"] and first["scanned"] == 3
+
+        assert feed.scan() == {"added": [], "repriced": [], "removed": [], "scanned": 3}
+
+        market.prices.update({"b": "25", "d": 40})
+        del market.prices["a"]
+        changes = feed.scan()
+
+    assert _ids(changes["added"]) == ["d"]
+    assert changes["repriced"] == [{"id": "b", "price": "25", "tileCount": 1}]
+    assert changes["removed"] == ["a"]
+    # Every scan went to the network instead of the response cache
+    assert market.requests == 6
+
+
+def test_equal_prices_in_other_notations_are_not_repriced():
+    market = _Market({"a": 10})
+    with _client(market) as client:
+        feed = MarketChangeFeed(client)
+        feed.scan()
+        market.prices["a"] = "10.0"
+        assert feed.scan()["repriced"] == []
+
+
+def test_listings_repeated_across_pages_are_counted_once():
+    with _client(_Market({})) as client:
+        feed = MarketChangeFeed(client)
+        changes = feed.diff([{"id": "a", "price": 1}, {"id": "b", "price": 2}, {"id": "a", "price": 1}, {"price": 3}])
+    assert _ids(changes["added"]) == ["a", "b"] and changes["scanned"] == 2
+
+
+def test_a_failed_scan_leaves_the_index_untouched():
+    market = _Market({"a": 10, "b": 20, "c": 30})
+    with _client(market) as client:
+        feed = MarketChangeFeed(client, page_size=2)
+        feed.scan()
+        market.fail_page = 2
+        with pytest.raises(httpx.HTTPStatusError):
+            feed.scan()
+        market.fail_page = None
+        changes = feed.scan()
+
+    assert changes["removed"] == [] and changes["added"] == []
+    assert sorted(feed.index) == ["a", "b", "c"]
+
+
+def test_the_index_is_persisted_per_filter_set(tmp_path):
+    path = str(tmp_path / "index.json")
+    market = _Market({"a": 10, "b": 20})
+    with _client(market) as client:
+        MarketChangeFeed(client, index_path=path, country="AU").scan()
+        market.prices["c"] = 30
+
+        resumed = MarketChangeFeed(client, index_path=path, country="AU")
+        assert resumed.scanned_at is not None
+        assert _ids(resumed.scan()["added"]) == ["c"]
+
+        # An index written for other filters is ignored
+        other = MarketChangeFeed(client, index_path=path, country="US")
+        assert other.index == {} and other.scanned_at is None
+
+    with open(path, encoding="utf-8") as fh:
+        assert json.load(fh)["filters"] == {"country": "AU"}
+
+
+def test_cli_reports_changes_as_json(tmp_path, monkeypatch):
+    from typer.testing import CliRunner
+
+    market = _Market({"a": 10})
+    monkeypatch.setattr(cli, "_client_from_env", lambda: _client(market))
+    args = ["market-changes", "--country", "AU", "--index", str(tmp_path / "index.json"), "--json"]
+    runner = CliRunner()
+    assert runner.invoke(cli.app, args).exit_code == 0
+    market.prices["a"] = 12
+
+    result = runner.invoke(cli.app, args)
+    assert result.exit_code == 0, result.output
+    assert json.loads(result.output)["repriced"] == [{"id": "a", "price": 12, "tileCount": 1}]
@@ -0,0 +1,132 @@
+"""Circuit breaker states and how the client fails fast on an open circuit (offline, via httpx.MockTransport)."""
+
+import time
+
+import httpx
+import pytest
+
+from earth2_api_wrapper.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker, CircuitOpenError
+from earth2_api_wrapper.client import Earth2Client
+from earth2_api_wrapper.rate_limiter import RateLimiter
+from earth2_api_wrapper.retry import RetryPolicy
+
+PROPERTY_ID = "00000000-0000-0000-0000-000000000000"
+THRESHOLD = 3
+
+
+def test_breaker_opens_at_the_threshold_and_probes_after_recovery():
+    breaker = CircuitBreaker(failure_threshold=THRESHOLD, recovery_timeout=10.0)
+    for _ in range(THRESHOLD - 1):
+        breaker.record_failure(0.0)
+    assert breaker.state == CLOSED and breaker.allow(0.0) == 0.0
+
+    breaker.record_failure(1.0)
+    assert breaker.state == OPEN
+    assert breaker.allow(5.0) == pytest.approx(6.0)
+
+    # Recovery time has passed: one probe goes through, the next caller waits for it
+    assert breaker.wait(11.0) == 0.0
+    assert breaker.allow(11.0) == 0.0
+    assert breaker.state == HALF_OPEN
+    assert breaker.wait(11.5) > 0 and breaker.allow(11.5) > 0
+
+    breaker.record_success()
+    assert breaker.state == CLOSED and breaker.failures == 0
+
+
+def test_failed_probe_reopens_the_circuit():
+    breaker = CircuitBreaker(failure_threshold=THRESHOLD, recovery_timeout=10.0)
+    for _ in range(THRESHOLD):
+        breaker.record_failure(0.0)
+    assert breaker.allow(10.0) == 0.0
+
+    breaker.record_failure(10.5)
+    assert breaker.state == OPEN
+    assert breaker.allow(11.0) == pytest.approx(9.5)
+    assert breaker.snapshot(11.0)['times_opened'] == 2
+
+
+def test_wait_does_not_take_a_probe():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=10.0)
+    breaker.record_failure(0.0)
+    for _ in range(3):
+        assert breaker.wait(10.0) == 0.0
+    assert breaker.state == OPEN
+    assert breaker.allow(10.0) == 0.0
+
+
+class _Server:
+    """Returns 503 until healthy is set."""
+
+    def __init__(self):
+        self.calls = 0
+        self.healthy = False
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if self.healthy:
+            return httpx.Response(200, json={"id": PROPERTY_ID})
+        return httpx.Response(503)
+
+
+def _client(server: _Server, limiter: RateLimiter, **kwargs) -> Earth2Client:
+    return Earth2Client(
+        client=httpx.Client(transport=httpx.MockTransport(server)),
+        rate_limiter=limiter,
+        retry_policy=RetryPolicy(max_attempts=1),
+        **kwargs
+    )
+
+
+def _open_circuit(client: Earth2Client):
+    for _ in range(THRESHOLD):
+        with pytest.raises(httpx.HTTPStatusError):
+            client.get_property(PROPERTY_ID)
+
+
+def test_open_circuit_fails_without_sending_or_reserving():
+    server = _Server()
+    limiter = RateLimiter(failure_threshold=THRESHOLD)
+    client = _client(server, limiter)
+    _open_circuit(client)
+    used = limiter._engine.count('endpoint:property', 60, limiter._window, time.time())
+
+    with pytest.raises(CircuitOpenError) as excinfo:
+        client.get_property(PROPERTY_ID)
+
+    assert excinfo.value.retry_after is not None and excinfo.value.retry_after > 0
+    assert server.calls == THRESHOLD
+    assert limiter._engine.count('endpoint:property', 60, limiter._window, time.time()) == used
+    assert limiter.get_stats()['circuits']['property']['state'] == OPEN
+
+
+def test_open_circuit_fails_before_waiting_for_a_slot():
+    server = _Server()
+    limiter = RateLimiter(failure_threshold=THRESHOLD)
+    client = _client(server, limiter, wait_for_rate_limit=True)
+    _open_circuit(client)
+    # No slot for a minute: a waiting call would block instead of failing fast
+    limiter._endpoint_limits['property'] = THRESHOLD
+
+    started = time.monotonic()
+    with pytest.raises(CircuitOpenError):
+        client.get_property(PROPERTY_ID)
+    assert time.monotonic() - started < 1
+    assert limiter.get_stats()['scheduler']['queued'] == {}
+
+
+def test_cached_responses_are_served_while_open():
+    server = _Server()
+    server.healthy = True
+    limiter = RateLimiter(failure_threshold=THRESHOLD)
+    client = _client(server, limiter)
+    assert client.get_property(PROPERTY_ID) == {"id": PROPERTY_ID}
+
+    server.healthy = False
+    for _ in range(THRESHOLD):
+        with pytest.raises(httpx.HTTPStatusError):
+            client.get_property("11111111-1111-1111-1111-111111111111")
+    with pytest.raises(CircuitOpenError):
+        client.get_property("22222222-2222-2222-2222-222222222222")
+
+    assert client.get_property(PROPERTY_ID) == {"id": PROPERTY_ID}
@@ -0,0 +1,112 @@
+"""JSON decoding backends and raw-body caching (offline, via httpx.MockTransport)."""
+
+import json
+
+import httpx
+import pytest
+
+from earth2_api_wrapper import decoding
+from earth2_api_wrapper.client import Earth2Client
+from earth2_api_wrapper.decoding import RawJSON, StdlibBackend, create_backend, get_backend, set_backend
+from earth2_api_wrapper.rate_limiter import RateLimiter
+from earth2_api_wrapper.retry import RetryPolicy
+
+DOCUMENT = {"landfields": [{"id": "a", "description": "Café", "price": 1.5, "tileCount": 3}], "count": 1}
+
+
+@pytest.fixture(autouse=True)
+def automatic_backend():
+    yield
+    set_backend(None)
+
+
+def _can_import(name: str) -> bool:
+    try:
+        create_backend(name)
+    except ImportError:
+        return False
+    return True
+
+
+def _installed(name: str):
+    try:
+        return create_backend(name)
+    except ImportError:
+        pytest.skip(f"{name} is not installed")
+
+
+@pytest.mark.parametrize("name", list(decoding.BACKENDS))
+def test_backends_round_trip_and_raise_value_errors(name):
+    backend = _installed(name)
+    encoded = backend.dumps(DOCUMENT)
+    assert isinstance(encoded, bytes)
+    assert json.loads(encoded) == DOCUMENT
+    assert backend.loads(encoded) == DOCUMENT
+    assert backend.loads(encoded.decode()) == DOCUMENT
+    assert backend.loads(memoryview(encoded)) == DOCUMENT
+    with pytest.raises(ValueError):
+        backend.loads(b'{"truncated": ')
+
+
+def test_backends_are_chosen_by_name_or_automatically():
+    set_backend("json")
+    assert get_backend().name == "json"
+    set_backend(None)
+    installed = [name for name in decoding.BACKENDS if name == "json" or _can_import(name)]
+    assert get_backend().name == installed[0]
+    with pytest.raises(ValueError):
+        set_backend("yaml")
+
+
+class _Counting(StdlibBackend):
+    name = "counting"
+
+    def __init__(self):
+        self.decoded = 0
+
+    def loads(self, data):
+        self.decoded += 1
+        return super().loads(data)
+
+
+def _client(limiter: RateLimiter, calls: list) -> Earth2Client:
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url)
+        return httpx.Response(200, content=json.dumps(DOCUMENT).encode())
+
+    return Earth2Client(
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        rate_limiter=limiter,
+        retry_policy=RetryPolicy(max_attempts=1),
+    )
+
+
+def test_client_decodes_with_the_active_backend():
+    backend = _Counting()
+    set_backend(backend)
+    limiter = RateLimiter()
+    with _client(limiter, []) as client:
+        assert client.search_market(country="AU") == DOCUMENT
+        client.search_market(country="AU")
+
+    # The cached copy is reused as decoded
+    assert backend.decoded == 1
+    assert limiter.get_stats()["json_backend"] == "counting"
+
+
+def test_cache_raw_keeps_bytes_and_decodes_a_fresh_copy_per_hit():
+    backend = _Counting()
+    set_backend(backend)
+    limiter = RateLimiter(cache_raw=True)
+    calls = []
+    with _client(limiter, calls) as client:
+        first = client.search_market(country="AU")
+        first["landfields"].clear()
+        second = client.search_market(country="AU")
+
+    assert second == DOCUMENT
+    assert len(calls) == 1
+    assert backend.decoded == 2
+    (entry,) = limiter._cache._entries.values()
+    assert isinstance(entry.value, RawJSON)
+    assert limiter.get_stats()["cache_bytes"] == len(json.dumps(DOCUMENT).encode())
@@ -0,0 +1,95 @@
+"""Streaming market export to Parquet/Arrow files (offline, via httpx.MockTransport)."""
+
+import httpx
+import pytest
+
+from earth2_api_wrapper import cli
+from earth2_api_wrapper.client import Earth2Client
+from earth2_api_wrapper.export import MarketWriter, export_market, market_columns
+from earth2_api_wrapper.rate_limiter import RateLimiter
+from earth2_api_wrapper.retry import RetryPolicy
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+ipc = pytest.importorskip("pyarrow.ipc")
+
+
+def _listing(i: int) -> dict:
+    return {
+        "id": f"lf-{i}", "description": f"Listing {i}", "location": "Sydney", "country": "AU",
+        "tier": "1", "tileClass": 2, "tileCount": str(i + 1), "price": str(10.0 * (i + 1)),
+    }
+
+
+def _client(total: int, pages: list) -> Earth2Client:
+    def handler(request: httpx.Request) -> httpx.Response:
+        page, items = int(request.url.params["page"]), int(request.url.params["items"])
+        pages.append(page)
+        ids = range((page - 1) * items, min(page * items, total))
+        return httpx.Response(200, json={"landfields": [_listing(i) for i in ids], "count": total})
+
+    return Earth2Client(
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        rate_limiter=RateLimiter(),
+        retry_policy=RetryPolicy(max_attempts=1),
+    )
+
+
+def test_columns_are_typed_and_missing_values_stay_null():
+    columns = market_columns([
+        {"id": "a", "tier": "2", "tileCount": "4", "price": "10"},
+        {"id": "b", "tileCount": 0, "price": None},
+    ])
+    assert columns["tier"] == [2, None]
+    assert columns["tileCount"] == [4, 0]
+    assert columns["price"] == [10.0, 0.0]
+    assert columns["price_per_tile"] == [2.5, None]
+
+
+def test_export_writes_one_row_group_per_page(tmp_path):
+    path = str(tmp_path / "market.parquet")
+    pages = []
+    with _client(12, pages) as client:
+        assert export_market(client, path, page_size=5, country="AU") == 12
+
+    parquet = pq.ParquetFile(path)
+    assert parquet.metadata.num_row_groups == 3
+    table = parquet.read()
+    assert table.schema.field("tileCount").type == pa.int32()
+    assert table.schema.field("tier").type == pa.int8()
+    assert table.column("id").to_pylist() == [f"lf-{i}" for i in range(12)]
+    assert table.column("price_per_tile").to_pylist() == [10.0] * 12
+    assert sorted(pages) == [1, 2, 3]
+
+
+def test_arrow_format_is_taken_from_the_extension(tmp_path):
+    path = str(tmp_path / "market.arrow")
+    with _client(7, []) as client:
+        assert export_market(client, path, page_size=5, limit=6) == 6
+
+    reader = ipc.open_file(path)
+    assert reader.num_record_batches == 2
+    assert reader.read_all().num_rows == 6
+
+
+def test_unknown_format_is_rejected(tmp_path):
+    with pytest.raises(ValueError):
+        MarketWriter(str(tmp_path / "market.csv"), format="csv")
+
+
+def test_empty_market_writes_an_empty_file(tmp_path):
+    path = str(tmp_path / "market.parquet")
+    with _client(0, []) as client:
+        assert export_market(client, path) == 0
+    assert pq.read_table(path).num_rows == 0
+
+
+def test_cli_command_exports_the_market(tmp_path, monkeypatch):
+    from typer.testing import CliRunner
+
+    path = str(tmp_path / "market.parquet")
+    monkeypatch.setattr(cli, "_client_from_env", lambda: _client(3, []))
+    result = CliRunner().invoke(cli.app, ["market-export", path, "--country", "AU", "--page-size", "2"])
+
+    assert result.exit_code == 0, result.output
+    assert pq.read_table(path).num_rows == 3
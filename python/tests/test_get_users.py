@@ -0,0 +1,122 @@
+"""Concurrent get_users: de-duplication, ordering, per-ID errors and bounded concurrency (offline)."""
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+import httpx
+
+from earth2_api_wrapper.async_client import AsyncEarth2Client
+from earth2_api_wrapper.client import Earth2Client
+from earth2_api_wrapper.rate_limiter import RateLimiter
+from earth2_api_wrapper.retry import RetryPolicy
+
+
+class _Users:
+    """Answers user_info/<id> after `delay` seconds, 404 for 'missing', and tracks concurrent requests."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.requested = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def _enter(self, request: httpx.Request) -> str:
+        user_id = request.url.path.rsplit("/", 1)[-1]
+        with self._lock:
+            self.requested.append(user_id)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        return user_id
+
+    def _leave(self, user_id: str) -> httpx.Response:
+        with self._lock:
+            self.active -= 1
+        if user_id == "missing":
+            return httpx.Response(404)
+        return httpx.Response(200, json={"id": user_id})
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        user_id = self._enter(request)
+        time.sleep(self.delay)
+        return self._leave(user_id)
+
+    async def handle_async(self, request: httpx.Request) -> httpx.Response:
+        user_id = self._enter(request)
+        await asyncio.sleep(self.delay)
+        return self._leave(user_id)
+
+
+def _client(users: _Users, limiter: Optional[RateLimiter] = None) -> Earth2Client:
+    return Earth2Client(
+        client=httpx.Client(transport=httpx.MockTransport(users)),
+        rate_limiter=limiter or RateLimiter(),
+        retry_policy=RetryPolicy(max_attempts=1),
+    )
+
+
+def test_duplicates_are_fetched_once_and_order_is_kept():
+    users = _Users()
+    with _client(users) as client:
+        result = client.get_users(["b", "a", "b", "c", "a"])
+
+    assert [user["id"] for user in result["data"]] == ["b", "a", "c"]
+    assert result["errors"] == {}
+    assert sorted(users.requested) == ["a", "b", "c"]
+
+
+def test_failed_ids_are_reported_per_id():
+    users = _Users()
+    with _client(users) as client:
+        result = client.get_users(["a", "missing", "b"])
+
+    assert [user["id"] for user in result["data"]] == ["a", "b"]
+    assert list(result["errors"]) == ["missing"]
+    assert "404" in result["errors"]["missing"]
+
+
+def test_lookups_run_concurrently_up_to_max_workers():
+    users = _Users(delay=0.05)
+    with _client(users) as client:
+        client.get_users([str(i) for i in range(8)], max_workers=3)
+    assert users.peak == 3
+
+
+def test_lookups_wait_for_the_user_budget_instead_of_failing():
+    limiter = RateLimiter()
+    limiter._window = 0.2
+    limiter._endpoint_limits['user'] = 2
+    users = _Users()
+    started = time.monotonic()
+    with _client(users, limiter) as client:
+        result = client.get_users([str(i) for i in range(5)])
+
+    assert len(result["data"]) == 5 and result["errors"] == {}
+    # Five lookups at two per window need at least two more windows
+    assert time.monotonic() - started >= 0.35
+
+
+def test_no_ids():
+    with _client(_Users()) as client:
+        assert client.get_users([]) == {"data": [], "errors": {}}
+
+
+def test_async_get_users_dedupes_reports_errors_and_bounds_concurrency():
+    users = _Users(delay=0.02)
+
+    async def run():
+        client = AsyncEarth2Client(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(users.handle_async)),
+            rate_limiter=RateLimiter(),
+            retry_policy=RetryPolicy(max_attempts=1),
+        )
+        async with client:
+            return await client.get_users(["c", "missing", "a", "c", "b", "d", "e"], max_concurrency=2)
+
+    result = asyncio.run(run())
+    assert [user["id"] for user in result["data"]] == ["c", "a", "b", "d", "e"]
+    assert list(result["errors"]) == ["missing"]
+    assert sorted(users.requested) == ["a", "b", "c", "d", "e", "missing"]
+    assert users.peak == 2
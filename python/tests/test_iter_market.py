@@ -0,0 +1,150 @@
+"""Paging, limits, prefetch and rate limit budget of iter_market (offline, via httpx.MockTransport)."""
+
+import asyncio
+import threading
+import time
+from typing import Optional
+
+import httpx
+
+from earth2_api_wrapper.async_client import AsyncEarth2Client
+from earth2_api_wrapper.client import Earth2Client
+from earth2_api_wrapper.rate_limiter import RateLimiter
+from earth2_api_wrapper.retry import RetryPolicy
+
+
+class _Market:
+    """A marketplace of `total` listings, paged by the page/items query parameters."""
+
+    def __init__(self, total: int, report_count: bool = True):
+        self.total = total
+        self.report_count = report_count
+        self.pages = []
+        self._lock = threading.Lock()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        page, items = int(request.url.params["page"]), int(request.url.params["items"])
+        with self._lock:
+            self.pages.append(page)
+        ids = range((page - 1) * items, min(page * items, self.total))
+        body = {"landfields": [{"id": f"lf-{i}", "price": i, "tileCount": 1} for i in ids]}
+        if self.report_count:
+            body["count"] = self.total
+        return httpx.Response(200, json=body)
+
+    async def handle_async(self, request: httpx.Request) -> httpx.Response:
+        return self(request)
+
+
+def _client(market: _Market, limiter: Optional[RateLimiter] = None) -> Earth2Client:
+    return Earth2Client(
+        client=httpx.Client(transport=httpx.MockTransport(market)),
+        rate_limiter=limiter or RateLimiter(),
+        retry_policy=RetryPolicy(max_attempts=1),
+    )
+
+
+def _wait_until(condition, timeout: float = 2.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.005)
+    return condition()
+
+
+def test_every_page_is_yielded_in_order():
+    market = _Market(12, report_count=False)
+    with _client(market) as client:
+        ids = [landfield["id"] for landfield in client.iter_market(country="AU", page_size=5)]
+
+    assert ids == [f"lf-{i}" for i in range(12)]
+    # The short third page ends the scan
+    assert market.pages == [1, 2, 3]
+
+
+def test_count_ends_the_scan_on_a_full_last_page():
+    market = _Market(10)
+    with _client(market) as client:
+        assert len(list(client.iter_market(page_size=5))) == 10
+    assert market.pages == [1, 2]
+
+
+def test_limit_and_start_page():
+    market = _Market(100)
+    with _client(market) as client:
+        ids = [landfield["id"] for landfield in client.iter_market(page_size=5, start_page=3, limit=7)]
+
+    assert ids == [f"lf-{i}" for i in range(10, 17)]
+    assert market.pages == [3, 4]
+
+
+def test_stopping_early_fetches_no_more_pages():
+    market = _Market(100)
+    with _client(market) as client:
+        listings = client.iter_market(page_size=5)
+        for _ in range(6):
+            next(listings)
+        listings.close()
+    assert market.pages == [1, 2]
+
+
+def test_prefetch_requests_the_next_page_while_the_caller_works():
+    market = _Market(15)
+    with _client(market) as client:
+        listings = client.iter_market(page_size=5, prefetch=True)
+        # Starts once the caller has moved past the page's first listing
+        next(listings)
+        next(listings)
+        assert _wait_until(lambda: market.pages == [1, 2])
+        ids = [landfield["id"] for landfield in listings]
+
+    assert len(ids) == 13
+    assert market.pages == [1, 2, 3]
+
+
+def test_without_prefetch_pages_are_fetched_on_demand():
+    market = _Market(15)
+    with _client(market) as client:
+        listings = client.iter_market(page_size=5)
+        next(listings)
+        next(listings)
+        time.sleep(0.05)
+        assert market.pages == [1]
+        listings.close()
+
+
+def test_pages_wait_for_the_search_budget():
+    limiter = RateLimiter()
+    limiter._window = 0.2
+    limiter._endpoint_limits['search'] = 2
+    market = _Market(15)
+    started = time.monotonic()
+    with _client(market, limiter) as client:
+        assert len(list(client.iter_market(page_size=5))) == 15
+
+    assert market.pages == [1, 2, 3]
+    assert time.monotonic() - started >= 0.15
+
+
+def test_async_iter_market_pages_and_prefetches():
+    market = _Market(12)
+
+    async def run():
+        client = AsyncEarth2Client(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(market.handle_async)),
+            rate_limiter=RateLimiter(),
+            retry_policy=RetryPolicy(max_attempts=1),
+        )
+        async with client:
+            ids = [landfield["id"] async for landfield in client.iter_market(page_size=5, prefetch=True)]
+            listings = client.iter_market(page_size=5, start_page=2, limit=3)
+            limited = [landfield["id"] async for landfield in listings]
+            await listings.aclose()
+            return ids, limited
+
+    ids, limited = asyncio.run(run())
+    assert ids == [f"lf-{i}" for i in range(12)]
+    assert limited == ["lf-5", "lf-6", "lf-7"]
+    # Page 2 came from the cache the second time round
+    assert market.pages == [1, 2, 3]
@@ -0,0 +1,86 @@
+"""In-memory LRU/TTL response cache, on its own and behind the client (offline)."""
+
+import time
+
+import httpx
+
+from earth2_api_wrapper.cache import LRUCache
+from earth2_api_wrapper.client import Earth2Client
+from earth2_api_wrapper.rate_limiter import RateLimiter
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = LRUCache(max_entries=3)
+    for key in "abc":
+        cache.set(key, key)
+    cache.get("a")
+    cache.set("d", "d")
+
+    assert cache.get("b") is None
+    assert [cache.get(key) for key in "acd"] == ["a", "c", "d"]
+    assert cache.stats()['evictions'] == 1
+
+
+def test_byte_bound_evicts_until_it_fits():
+    cache = LRUCache(max_entries=100, max_bytes=100)
+    for key in "abcd":
+        cache.set(key, key, size=40)
+
+    assert len(cache) == 2
+    assert cache.stats()['bytes'] == 80
+    # Replacing an entry swaps its size rather than adding to it
+    cache.set("d", "d", size=10)
+    assert cache.stats()['bytes'] == 50
+
+
+def test_entries_expire_after_their_ttl():
+    cache = LRUCache(default_ttl=60)
+    now = time.time()
+    cache.set("default", 1, stored_at=now - 61)
+    cache.set("own-ttl", 2, ttl=120, stored_at=now - 61)
+
+    assert cache.get("default") is None
+    assert cache.get("own-ttl") == 2
+    # max_age overrides the entry's TTL, and a stale entry without validators is dropped
+    assert cache.get("own-ttl", max_age=30) is None
+    assert len(cache) == 0
+    assert cache.stats()['expirations'] == 2
+
+
+def test_expired_entries_with_validators_are_kept_for_revalidation():
+    cache = LRUCache(default_ttl=1)
+    cache.set("etag", {"v": 1}, stored_at=time.time() - 5, validators={"ETag": '"1"'})
+
+    assert cache.get("etag") is None
+    entry = cache.get_stale("etag")
+    assert entry is not None and entry.value == {"v": 1}
+    assert cache.refresh("etag")
+    assert cache.get("etag") == {"v": 1}
+
+
+def test_hit_and_miss_counters():
+    cache = LRUCache()
+    cache.set("a", 1)
+    cache.get("a")
+    cache.get("a")
+    cache.get("b")
+    stats = cache.stats()
+    assert (stats['hits'], stats['misses'], stats['entries']) == (2, 1, 1)
+
+
+def test_client_answers_repeated_calls_from_the_cache():
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url.path)
+        return httpx.Response(200, json={"path": request.url.path})
+
+    limiter = RateLimiter(cache_max_entries=2)
+    with Earth2Client(client=httpx.Client(transport=httpx.MockTransport(handler)), rate_limiter=limiter) as client:
+        for property_id in ("a", "a", "b", "c", "a"):
+            client.get_property(property_id)
+
+    # "a" was evicted by "b" and "c", so its last call went to the network again
+    assert calls == ["/landfields/a", "/landfields/b", "/landfields/c", "/landfields/a"]
+    stats = limiter.get_stats()
+    assert (stats['cache_hits'], stats['cache_evictions'], stats['cache_size']) == (1, 2, 2)
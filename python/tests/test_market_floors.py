@@ -0,0 +1,136 @@
+"""Floor price grids and concurrent get_market_floors lookups (offline, via httpx.MockTransport)."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+
+from earth2_api_wrapper.async_client import AsyncEarth2Client
+from earth2_api_wrapper.client import Earth2Client
+from earth2_api_wrapper.rate_limiter import RateLimiter
+from earth2_api_wrapper.retry import RetryPolicy
+
+
+class _Floors:
+    """Marketplace floor lookups: 404 for country XX, otherwise two listings, tracking concurrency."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.queries = []
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def _enter(self, request: httpx.Request) -> dict:
+        params = dict(request.url.params)
+        with self._lock:
+            self.queries.append(params)
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        return params
+
+    def _leave(self, params: dict) -> httpx.Response:
+        with self._lock:
+            self.active -= 1
+        if params.get("country") == "XX":
+            return httpx.Response(404)
+        landfields = [
+            {"id": "cheap", "price": "30", "tileCount": "10"},
+            {"id": "dear", "price": "50", "tileCount": "5"},
+            {"id": "empty", "price": "1", "tileCount": "0"},
+        ]
+        return httpx.Response(200, json={"landfields": landfields, "count": 3})
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        params = self._enter(request)
+        time.sleep(self.delay)
+        return self._leave(params)
+
+    async def handle_async(self, request: httpx.Request) -> httpx.Response:
+        params = self._enter(request)
+        await asyncio.sleep(self.delay)
+        return self._leave(params)
+
+
+def _client(floors: _Floors) -> Earth2Client:
+    return Earth2Client(
+        client=httpx.Client(transport=httpx.MockTransport(floors)),
+        rate_limiter=RateLimiter(),
+        retry_policy=RetryPolicy(max_attempts=1),
+    )
+
+
+def test_grid_only_splits_tier_one_by_tile_class():
+    grid = Earth2Client.market_floor_grid(["AU", None], tiers=("1", "2"), tile_classes=("1", "2"))
+    assert grid == [
+        {"country": "AU", "landfieldTier": "1", "tileClass": "1"},
+        {"country": "AU", "landfieldTier": "1", "tileClass": "2"},
+        {"country": "AU", "landfieldTier": "2"},
+        {"landfieldTier": "1", "tileClass": "1"},
+        {"landfieldTier": "1", "tileClass": "2"},
+        {"landfieldTier": "2"},
+    ]
+    assert len(Earth2Client.market_floor_grid(["AU"], tile_counts=("1-5", "6-"))) == 12
+
+
+def test_floor_lookup_sorts_by_price_per_tile():
+    floors = _Floors()
+    with _client(floors) as client:
+        client.get_market_floor({"country": "AU", "landfieldTier": "2", "tileClass": "3"})
+
+    assert floors.queries == [
+        {"items": "24", "page": "1", "search": "", "sorting": "price_per_tile", "country": "AU", "landfieldTier": "2"}
+    ]
+
+
+def test_floors_are_deduplicated_and_reported_per_segment():
+    floors = _Floors()
+    segments = [
+        {"country": "AU", "landfieldTier": 2, "tileClass": 1},
+        {"country": "XX", "landfieldTier": "1"},
+        # Same query as the first: tileClass only applies to tier 1
+        {"country": "AU", "landfieldTier": "2", "tileClass": "4"},
+        {"country": "US", "landfieldTier": "1", "tileClass": "1", "tileCount": ""},
+    ]
+    with _client(floors) as client:
+        result = client.get_market_floors(segments)
+
+    assert len(floors.queries) == 3
+    assert result["data"] == [
+        {"country": "AU", "tileCount": None, "landfieldTier": "2", "tileClass": None,
+         "count": 3, "floor_price_per_tile": 3.0, "id": "cheap"},
+        {"country": "US", "tileCount": None, "landfieldTier": "1", "tileClass": "1",
+         "count": 3, "floor_price_per_tile": 3.0, "id": "cheap"},
+    ]
+    assert list(result["errors"]) == ["country=XX&landfieldTier=1"]
+
+
+def test_floor_lookups_are_cached_and_bounded():
+    floors = _Floors(delay=0.03)
+    segments = Earth2Client.market_floor_grid(["AU", "US"], tiers=("1",))
+    with _client(floors) as client:
+        client.get_market_floors(segments, max_workers=3)
+        client.get_market_floor(segments[0])
+
+    assert floors.peak == 3
+    assert len(floors.queries) == 10
+
+
+def test_async_floors_match_the_sync_client():
+    floors = _Floors(delay=0.01)
+    segments = Earth2Client.market_floor_grid(["AU", "XX"], tiers=("1",), tile_classes=("1", "2", "3"))
+
+    async def run():
+        client = AsyncEarth2Client(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(floors.handle_async)),
+            rate_limiter=RateLimiter(),
+            retry_policy=RetryPolicy(max_attempts=1),
+        )
+        async with client:
+            return await client.get_market_floors(segments, max_concurrency=2)
+
+    result = asyncio.run(run())
+    assert [row["tileClass"] for row in result["data"]] == ["1", "2", "3"]
+    assert len(result["errors"]) == 3
+    assert floors.peak == 2
@@ -0,0 +1,96 @@
+"""Typed response models: field lookup, coercion, lazy caching and slots."""
+
+import pytest
+
+from earth2_api_wrapper.conversions import to_bool
+from earth2_api_wrapper.models import Field, Landfield, LeaderboardRow, Model, UserInfo
+
+
+def test_landfield_fields_are_coerced():
+    landfield = Landfield({
+        "id": "lf-1", "description": "Opera House", "country": "AU",
+        "landfieldTier": "1", "tileClass": 2, "tileCount": "10", "price": "250.5",
+    })
+
+    assert landfield.id == "lf-1"
+    assert (landfield.tier, landfield.tile_class, landfield.tile_count) == (1, 2, 10)
+    assert landfield.price == 250.5
+    assert landfield.price_per_tile == pytest.approx(25.05)
+    assert landfield.thumbnail is None
+
+
+def test_missing_values_stay_none_or_default():
+    landfield = Landfield({"tileCount": None, "price": ""})
+    assert landfield.tier is None
+    assert landfield.tile_count is None
+    assert landfield.price == 0.0
+    assert landfield.price_per_tile is None
+
+
+def test_json_api_objects_are_read_from_their_attributes():
+    landfield = Landfield({"id": "lf-2", "attributes": {"price": 10, "tileCount": 5}})
+    assert landfield.id == "lf-2"
+    assert landfield.price_per_tile == 2.0
+    assert landfield.get("price") == 10
+    assert landfield.get("missing", "default") == "default"
+
+
+def test_first_present_key_wins():
+    assert LeaderboardRow({"position": 3, "name": "someone"}).rank == 3
+    assert LeaderboardRow({"rank": 1, "position": 3}).rank == 1
+    assert LeaderboardRow({"countryName": "Australia"}).name == "Australia"
+
+
+def test_wrap_skips_non_objects():
+    wrapped = Landfield.wrap([{"id": "a"}, None, "b", {"id": "c"}])
+    assert [landfield.id for landfield in wrapped] == ["a", "c"]
+    assert Landfield.wrap(None) == []
+
+
+def test_fields_are_converted_once_and_only_when_read():
+    calls = []
+
+    def convert(value):
+        calls.append(value)
+        return value * 2
+
+    class Counted(Model):
+        __slots__ = ()
+        doubled = Field("value", convert=convert)
+        untouched = Field(convert=convert)
+
+    counted = Counted({"value": 21, "untouched": 1})
+    assert calls == []
+    assert counted.doubled == 42
+    assert counted.doubled == 42
+    assert calls == [21]
+
+
+def test_models_have_no_instance_dict():
+    landfield = Landfield({"id": "a"})
+    assert not hasattr(landfield, "__dict__")
+    with pytest.raises(AttributeError):
+        landfield.extra = 1
+
+
+def test_to_dict_converts_every_field():
+    user = UserInfo({"id": "u1", "username": "someone", "followers": "12", "verified": "false"})
+    result = user.to_dict()
+    assert result["id"] == "u1"
+    assert result["followers"] == 12
+    assert result["verified"] is False
+    assert result["following"] is None
+
+
+@pytest.mark.parametrize("raw, expected", [
+    (True, True), (False, False), (1, True), (0, False), (0.0, False),
+    ("true", True), ("True", True), ("1", True), ("yes", True),
+    ("false", False), ("False", False), ("0", False), ("", False), ("no", False),
+])
+def test_verified_flag_parses_strings_and_numbers(raw, expected):
+    assert to_bool(raw) is expected
+    assert UserInfo({"verified": raw}).verified is expected
+
+
+def test_null_verified_flag_stays_none():
+    assert UserInfo({"verified": None}).verified is None
@@ -0,0 +1,103 @@
+"""SQLiteCache storage, expiry and eviction, and reuse of its entries by a later client (offline)."""
+
+import httpx
+
+from earth2_api_wrapper.cache import SQLiteCache
+from earth2_api_wrapper.client import Earth2Client
+from earth2_api_wrapper.rate_limiter import RateLimiter
+
+PROPERTY_ID = "00000000-0000-0000-0000-000000000000"
+
+
+def _totals(cache: SQLiteCache):
+    """(entries, bytes) as tracked by the triggers and as counted from the table."""
+    tracked = cache._conn.execute("SELECT entries, bytes FROM totals").fetchone()
+    counted = cache._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+    return tracked, counted
+
+
+def test_entries_survive_reopening(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    cache = SQLiteCache(path)
+    cache.set("GET:a", {"id": "a"})
+    cache.close()
+
+    stored_at, response = SQLiteCache(path).get("GET:a", ttl=60)
+    assert response == {"id": "a"}
+
+
+def test_expired_entries_are_dropped_unless_revalidatable(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "responses.sqlite3"))
+    cache.set("GET:plain", {"id": "plain"})
+    cache.set("GET:etag", {"id": "etag"}, validators={"ETag": '"v1"'})
+
+    assert cache.get("GET:plain", ttl=0) is None
+    assert cache.get("GET:etag", ttl=0) is None
+    assert cache.get_stale("GET:plain") is None
+    assert cache.get_stale("GET:etag") == ({"id": "etag"}, {"ETag": '"v1"'})
+    assert len(cache) == 1
+
+
+def test_oldest_entries_are_evicted_past_the_entry_bound(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "responses.sqlite3"), max_entries=3)
+    for i in range(5):
+        cache.set(f"GET:{i}", {"i": i})
+
+    assert len(cache) == 3
+    assert cache.get("GET:0", ttl=60) is None and cache.get("GET:1", ttl=60) is None
+    assert cache.get("GET:4", ttl=60) is not None
+
+
+def test_oldest_entries_are_evicted_past_the_byte_bound(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "responses.sqlite3"), max_bytes=100)
+    body = b'{"padding":"' + b"x" * 20 + b'"}'  # 34 bytes
+    for i in range(5):
+        cache.set(f"GET:{i}", None, body=body)
+
+    tracked, counted = _totals(cache)
+    assert tracked == counted == (2, 68)
+    assert cache.get("GET:3", ttl=60) is not None
+
+
+def test_totals_follow_inserts_overwrites_and_deletes(tmp_path):
+    path = str(tmp_path / "responses.sqlite3")
+    first, second = SQLiteCache(path), SQLiteCache(path)
+    first.set("GET:a", {"id": "a"})
+    second.set("GET:b", {"id": "b"})
+    second.set("GET:a", {"id": "a", "name": "a longer body"})
+    first.get("GET:b", ttl=0)
+
+    tracked, counted = _totals(first)
+    assert tracked == counted == (1, len(b'{"id":"a","name":"a longer body"}'))
+    first.clear()
+    assert _totals(second) == ((0, 0), (0, 0))
+
+
+def test_bodies_are_stored_as_blobs(tmp_path):
+    cache = SQLiteCache(str(tmp_path / "responses.sqlite3"))
+    cache.set("GET:encoded", {"id": "a"})
+    cache.set("GET:raw", None, body='{"id":"b"}')
+
+    types = {row[0] for row in cache._conn.execute("SELECT typeof(body) FROM responses")}
+    assert types == {"blob"}
+    assert cache.get("GET:raw", ttl=60)[1] == {"id": "b"}
+
+
+def test_a_later_client_is_answered_from_disk(tmp_path):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(request.url)
+        return httpx.Response(200, json={"id": PROPERTY_ID})
+
+    def client() -> Earth2Client:
+        limiter = RateLimiter()
+        limiter.use_persistent_cache(SQLiteCache.in_directory(str(tmp_path)))
+        return Earth2Client(client=httpx.Client(transport=httpx.MockTransport(handler)), rate_limiter=limiter)
+
+    with client() as first:
+        assert first.get_property(PROPERTY_ID) == {"id": PROPERTY_ID}
+    # A new limiter (as in the next CLI run) has an empty memory cache
+    with client() as second:
+        assert second.get_property(PROPERTY_ID) == {"id": PROPERTY_ID}
+    assert len(calls) == 1
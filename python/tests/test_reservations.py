@@ -0,0 +1,171 @@
+"""Reservation accounting in RateLimiter and in the client's request path (offline, via httpx.MockTransport)."""
+
+import time
+
+import httpx
+import pytest
+
+from earth2_api_wrapper.client import Earth2Client
+from earth2_api_wrapper.limiter_engines import SharedEngine
+from earth2_api_wrapper.rate_limiter import RateLimitExceeded, RateLimiter
+from earth2_api_wrapper.retry import RetryPolicy
+
+URL = "https://r.earth2.io/landfields/00000000-0000-0000-0000-000000000000"
+PROPERTY_LIMIT = 3
+
+
+def _limiter() -> RateLimiter:
+    limiter = RateLimiter()
+    limiter._endpoint_limits = {category: 1000 for category in limiter._endpoint_limits}
+    limiter._endpoint_limits['property'] = PROPERTY_LIMIT
+    return limiter
+
+
+def _counts(limiter: RateLimiter):
+    """Requests counted in the (burst, global, property) windows."""
+    now = time.time()
+    engine = limiter._engine
+    return (
+        engine.count('burst', limiter._burst_limit, limiter._burst_window, now),
+        engine.count('global', limiter._global_limit, limiter._window, now),
+        engine.count('endpoint:property', PROPERTY_LIMIT, limiter._window, now),
+    )
+
+
+def _client(limiter: RateLimiter, handler) -> Earth2Client:
+    return Earth2Client(
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        rate_limiter=limiter,
+        # One attempt, and no category-wide backoff after a failure
+        retry_policy=RetryPolicy(max_attempts=1),
+    )
+
+
+def test_reserve_counts_every_window_until_released():
+    limiter = _limiter()
+    reservation = limiter.reserve(URL)
+    assert _counts(limiter) == (1, 1, 1)
+
+    limiter.release(reservation)
+    assert _counts(limiter) == (0, 0, 0)
+    assert limiter.get_stats()['total_requests'] == 0
+
+
+def test_commit_keeps_the_slot_and_tallies_the_request():
+    limiter = _limiter()
+    reservation = limiter.reserve(URL)
+    limiter.commit(reservation)
+    # Settled reservations ignore further commits and releases
+    limiter.commit(reservation)
+    limiter.release(reservation)
+
+    assert _counts(limiter) == (1, 1, 1)
+    assert limiter.get_stats()['total_requests'] == 1
+
+
+def test_reservations_stop_at_the_endpoint_limit():
+    limiter = _limiter()
+    reservations = [limiter.reserve(URL) for _ in range(PROPERTY_LIMIT)]
+    with pytest.raises(RateLimitExceeded) as excinfo:
+        limiter.reserve(URL)
+    assert excinfo.value.retry_after is not None and excinfo.value.retry_after > 0
+    assert limiter.get_stats()['blocked_requests'] == 1
+
+    limiter.release(reservations[0])
+    limiter.reserve(URL)
+
+
+def test_burst_refusal_gives_the_endpoint_slot_back():
+    limiter = _limiter()
+    limiter._burst_limit = 1
+    limiter.reserve(URL)
+    with pytest.raises(RateLimitExceeded, match="Burst limit"):
+        limiter.reserve(URL)
+
+    assert _counts(limiter) == (1, 1, 1)
+
+
+@pytest.mark.parametrize("engine", ["gcra", "shared"])
+def test_releasing_an_expired_reservation_frees_nothing(engine, tmp_path):
+    limiter = RateLimiter(engine=SharedEngine(str(tmp_path / "ratelimit.sqlite3")) if engine == "shared" else engine)
+    limiter._burst_limit = 2
+    limiter._burst_window = 0.2
+    expired = limiter.reserve(URL)
+    time.sleep(0.25)
+    limiter.reserve(URL)
+    limiter.reserve(URL)
+
+    # The first slot was already free again, so releasing it must not admit a third request
+    limiter.release(expired)
+    with pytest.raises(RateLimitExceeded, match="Burst limit"):
+        limiter.reserve(URL)
+
+
+def test_client_commits_reservation_on_success():
+    limiter = _limiter()
+    with _client(limiter, lambda request: httpx.Response(200, json={"id": "a"})) as client:
+        assert client.get_property("00000000-0000-0000-0000-000000000000") == {"id": "a"}
+
+    assert _counts(limiter) == (1, 1, 1)
+    assert limiter.get_stats()['total_requests'] == 1
+
+
+def test_client_releases_reservation_on_connect_error():
+    limiter = _limiter()
+
+    def refuse(request: httpx.Request) -> httpx.Response:
+        raise httpx.ConnectError("connection refused", request=request)
+
+    with _client(limiter, refuse) as client:
+        for _ in range(PROPERTY_LIMIT + 1):
+            with pytest.raises(httpx.ConnectError):
+                client.get_property("00000000-0000-0000-0000-000000000000")
+
+    # Requests that never reached the server don't use up the budget
+    assert _counts(limiter) == (0, 0, 0)
+    assert limiter.get_stats()['total_requests'] == 0
+
+
+def test_client_keeps_reservation_when_request_was_sent():
+    limiter = _limiter()
+
+    def fail(request: httpx.Request) -> httpx.Response:
+        raise httpx.ReadError("connection reset", request=request)
+
+    with _client(limiter, fail) as client:
+        with pytest.raises(httpx.ReadError):
+            client.get_property("00000000-0000-0000-0000-000000000000")
+
+    assert _counts(limiter) == (1, 1, 1)
+
+
+def _auth_count(limiter: RateLimiter) -> int:
+    return limiter._engine.count('endpoint:auth', limiter._endpoint_limits['auth'], limiter._window, time.time())
+
+
+@pytest.mark.parametrize("error, kept", [(httpx.ConnectError, 0), (httpx.ReadError, 1)])
+def test_authenticate_reserves_its_slot(error, kept):
+    limiter = _limiter()
+
+    def fail(request: httpx.Request) -> httpx.Response:
+        raise error("login failed", request=request)
+
+    with _client(limiter, fail) as client:
+        result = client.authenticate("user@example.com", "password")
+
+    assert not result["success"]
+    # An attempt that reached the server keeps its slot; one that never connected gives it back
+    assert _auth_count(limiter) == kept
+
+
+def test_authenticate_is_refused_once_the_auth_budget_is_used():
+    limiter = _limiter()
+    limiter._endpoint_limits['auth'] = 2
+    for _ in range(2):
+        limiter.reserve("https://app.earth2.io/login")
+
+    with _client(limiter, lambda request: httpx.Response(500)) as client:
+        result = client.authenticate("user@example.com", "password")
+
+    assert not result["success"]
+    assert result["message"].startswith("Authentication rate limited")
@@ -0,0 +1,139 @@
+"""Retry decisions, jittered backoff, Retry-After and the retry budget (offline, via httpx.MockTransport)."""
+
+import random
+import time
+from email.utils import formatdate
+
+import httpx
+import pytest
+
+from earth2_api_wrapper.client import Earth2Client
+from earth2_api_wrapper.rate_limiter import RateLimiter
+from earth2_api_wrapper.retry import RetryPolicy, parse_retry_after
+
+URL = "https://r.earth2.io/landfields/a"
+
+
+def _status_error(status: int, headers=None) -> httpx.HTTPStatusError:
+    request = httpx.Request("GET", URL)
+    response = httpx.Response(status, headers=headers, request=request)
+    return httpx.HTTPStatusError(f"{status}", request=request, response=response)
+
+
+@pytest.mark.parametrize("value, expected", [
+    ("3", 3.0), (" 2.5 ", 2.5), ("-4", 0.0), ("soon", None), ("", None), (None, None),
+    (formatdate(0, usegmt=True), 0.0),
+])
+def test_parse_retry_after(value, expected):
+    assert parse_retry_after(value) == expected
+
+
+def test_parse_retry_after_http_date():
+    assert 8 < parse_retry_after(formatdate(time.time() + 10, usegmt=True)) <= 10
+
+
+def test_retryable_failures():
+    policy = RetryPolicy()
+    assert policy.is_retryable(_status_error(503))
+    assert policy.is_retryable(_status_error(429))
+    assert not policy.is_retryable(_status_error(404))
+    assert policy.is_retryable(httpx.ReadTimeout("slow"))
+    assert policy.is_retryable(httpx.ConnectError("refused"))
+    assert not policy.is_retryable(ValueError("bad json"))
+    assert not RetryPolicy(retry_statuses=(503,)).is_retryable(_status_error(429))
+
+
+def test_jitter_stays_between_the_base_and_three_times_the_previous_delay():
+    random.seed(1)
+    policy = RetryPolicy(base_delay=0.5, max_delay=4.0)
+    assert policy.jitter(0.0) == 0.5
+    delay = 0.0
+    for _ in range(200):
+        next_delay = policy.jitter(delay)
+        assert 0.5 <= next_delay <= min(4.0, max(0.5, delay * 3))
+        delay = next_delay
+    # The delays are spread out rather than a fixed sequence
+    assert len({round(policy.jitter(1.0), 3) for _ in range(20)}) > 10
+
+
+def test_next_delay_honours_attempts_retry_after_and_budget():
+    policy = RetryPolicy(max_attempts=3, base_delay=0.1, budget=5.0)
+    assert policy.next_delay(_status_error(503), 1, 0.0, 0.0) == pytest.approx(0.1)
+    assert policy.next_delay(_status_error(503), 3, 0.0, 0.0) is None
+    assert policy.next_delay(_status_error(404), 1, 0.0, 0.0) is None
+    assert policy.next_delay(_status_error(429, {"Retry-After": "2"}), 1, 0.0, 0.0) == 2.0
+    # The server's wait would overrun the budget
+    assert policy.next_delay(_status_error(429, {"Retry-After": "2"}), 1, 0.0, 3.5) is None
+    ignoring = RetryPolicy(base_delay=0.1, respect_retry_after=False)
+    assert ignoring.next_delay(_status_error(429, {"Retry-After": "2"}), 1, 0.0, 0.0) == pytest.approx(0.1)
+
+
+class _Flaky:
+    """Answers with the queued responses (or raises queued exceptions), then 200."""
+
+    def __init__(self, *outcomes):
+        self.outcomes = list(outcomes)
+        self.times = []
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.times.append(time.monotonic())
+        if self.outcomes:
+            outcome = self.outcomes.pop(0)
+            if isinstance(outcome, Exception):
+                raise outcome
+            return outcome
+        return httpx.Response(200, json={"ok": True})
+
+
+def _client(server: _Flaky, policy: RetryPolicy, limiter=None) -> Earth2Client:
+    return Earth2Client(
+        client=httpx.Client(transport=httpx.MockTransport(server)),
+        rate_limiter=limiter or RateLimiter(),
+        retry_policy=policy,
+    )
+
+
+def test_client_retries_server_errors_and_network_failures():
+    server = _Flaky(httpx.Response(503), httpx.ConnectError("refused"))
+    with _client(server, RetryPolicy(base_delay=0.01, max_delay=0.02)) as client:
+        assert client.get_property("a") == {"ok": True}
+        assert client.get_rate_limit_stats()["retried_requests"] == 2
+    assert len(server.times) == 3
+
+
+def test_client_does_not_retry_client_errors():
+    server = _Flaky(httpx.Response(404))
+    with _client(server, RetryPolicy(base_delay=0.01)) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            client.get_property("a")
+    assert len(server.times) == 1
+
+
+def test_client_gives_up_after_max_attempts():
+    server = _Flaky(*(httpx.Response(502) for _ in range(5)))
+    with _client(server, RetryPolicy(max_attempts=3, base_delay=0.01, max_delay=0.01)) as client:
+        with pytest.raises(httpx.HTTPStatusError):
+            client.get_property("a")
+    assert len(server.times) == 3
+
+
+def test_client_waits_for_retry_after():
+    server = _Flaky(httpx.Response(429, headers={"Retry-After": "0.2"}))
+    with _client(server, RetryPolicy(base_delay=0.01)) as client:
+        assert client.get_property("a") == {"ok": True}
+
+    assert server.times[1] - server.times[0] >= 0.19
+
+
+def test_client_stops_when_retry_after_exceeds_the_budget_and_pauses_the_category():
+    server = _Flaky(httpx.Response(503, headers={"Retry-After": "30"}))
+    limiter = RateLimiter()
+    with _client(server, RetryPolicy(base_delay=0.01, budget=1.0), limiter) as client:
+        started = time.monotonic()
+        with pytest.raises(httpx.HTTPStatusError):
+            client.get_property("a")
+        assert time.monotonic() - started < 0.5
+
+    assert len(server.times) == 1
+    # The whole 'property' category is paused, not just this request
+    assert 29 < limiter.time_until_available("https://r.earth2.io/landfields/b") <= 30
@@ -0,0 +1,127 @@
+"""ETag / Last-Modified revalidation of expired cache entries (offline, via httpx.MockTransport)."""
+
+import asyncio
+
+import httpx
+
+from earth2_api_wrapper.async_client import AsyncEarth2Client
+from earth2_api_wrapper.cache import SQLiteCache
+from earth2_api_wrapper.client import Earth2Client
+from earth2_api_wrapper.rate_limiter import RateLimiter
+from earth2_api_wrapper.retry import RetryPolicy
+
+
+class _Server:
+    """Serves version `version` of a document, answering 304 to conditional requests for it."""
+
+    def __init__(self, validator: str = "ETag"):
+        self.validator = validator
+        self.version = 1
+        self.requests = []
+
+    def _tag(self) -> str:
+        return f'"v{self.version}"' if self.validator == "ETag" else f"Tue, 0{self.version} Oct 2026 00:00:00 GMT"
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        conditional = request.headers.get("If-None-Match") or request.headers.get("If-Modified-Since")
+        self.requests.append(conditional)
+        if conditional == self._tag():
+            return httpx.Response(304, headers={self.validator: self._tag()})
+        return httpx.Response(200, json={"version": self.version}, headers={self.validator: self._tag()})
+
+    async def handle_async(self, request: httpx.Request) -> httpx.Response:
+        return self(request)
+
+
+def _client(server: _Server, limiter: RateLimiter) -> Earth2Client:
+    return Earth2Client(
+        client=httpx.Client(transport=httpx.MockTransport(server)),
+        rate_limiter=limiter,
+        retry_policy=RetryPolicy(max_attempts=1),
+    )
+
+
+def _expire(limiter: RateLimiter):
+    for entry in limiter._cache._entries.values():
+        entry.stored_at -= 3600
+
+
+def test_expired_entry_is_revalidated_with_if_none_match():
+    server, limiter = _Server(), RateLimiter()
+    with _client(server, limiter) as client:
+        assert client.get_leaderboard_players() == {"version": 1}
+        _expire(limiter)
+        assert client.get_leaderboard_players() == {"version": 1}
+        # The 304 made the entry fresh again
+        assert client.get_leaderboard_players() == {"version": 1}
+
+    assert server.requests == [None, '"v1"']
+    stats = limiter.get_stats()
+    assert (stats["total_requests"], stats["revalidated_requests"]) == (1, 1)
+
+
+def test_last_modified_is_sent_as_if_modified_since():
+    server, limiter = _Server("Last-Modified"), RateLimiter()
+    with _client(server, limiter) as client:
+        client.get_leaderboard_players()
+        _expire(limiter)
+        client.get_leaderboard_players()
+
+    assert server.requests == [None, "Tue, 01 Oct 2026 00:00:00 GMT"]
+    assert limiter.get_stats()["revalidated_requests"] == 1
+
+
+def test_changed_document_replaces_the_cached_copy():
+    server, limiter = _Server(), RateLimiter()
+    with _client(server, limiter) as client:
+        client.get_leaderboard_players()
+        server.version = 2
+        _expire(limiter)
+        assert client.get_leaderboard_players() == {"version": 2}
+        _expire(limiter)
+        client.get_leaderboard_players()
+
+    assert server.requests == [None, '"v1"', '"v2"']
+    stats = limiter.get_stats()
+    assert (stats["total_requests"], stats["revalidated_requests"]) == (2, 1)
+
+
+def test_entries_from_the_persistent_cache_are_revalidated(tmp_path):
+    server = _Server()
+    cache = SQLiteCache(str(tmp_path / "responses.sqlite3"))
+
+    def limiter() -> RateLimiter:
+        limiter = RateLimiter()
+        limiter.use_persistent_cache(cache)
+        return limiter
+
+    with _client(server, limiter()) as client:
+        client.get_leaderboard_players()
+    cache._conn.execute("UPDATE responses SET stored_at = stored_at - 3600")
+
+    second = limiter()
+    with _client(server, second) as client:
+        assert client.get_leaderboard_players() == {"version": 1}
+        assert client.get_leaderboard_players() == {"version": 1}
+
+    assert server.requests == [None, '"v1"']
+    assert second.get_stats()["revalidated_requests"] == 1
+
+
+def test_async_client_revalidates():
+    server, limiter = _Server(), RateLimiter()
+
+    async def run():
+        client = AsyncEarth2Client(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(server.handle_async)),
+            rate_limiter=limiter,
+            retry_policy=RetryPolicy(max_attempts=1),
+        )
+        async with client:
+            await client.get_leaderboard_players()
+            _expire(limiter)
+            return await client.get_leaderboard_players()
+
+    assert asyncio.run(run()) == {"version": 1}
+    assert server.requests == [None, '"v1"']
+    assert limiter.get_stats()["revalidated_requests"] == 1
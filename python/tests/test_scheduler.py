@@ -0,0 +1,117 @@
+"""Priority order and timeouts of requests waiting for a rate limit slot."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+
+from earth2_api_wrapper.rate_limiter import RateLimitExceeded, RateLimiter
+from earth2_api_wrapper.scheduler import scheduling
+
+URL = "https://r.earth2.io/landfields/00000000-0000-0000-0000-000000000000"
+SEARCH_URL = "https://r.earth2.io/marketplace?country=AU"
+
+
+def _limiter(window: float) -> RateLimiter:
+    """One 'property' request per window; everything else effectively unlimited."""
+    limiter = RateLimiter()
+    limiter._window = window
+    limiter._endpoint_limits = {category: 1000 for category in limiter._endpoint_limits}
+    limiter._endpoint_limits['property'] = 1
+    return limiter
+
+
+def _queued(limiter: RateLimiter) -> int:
+    return sum(limiter.get_stats()['scheduler']['queued'].values())
+
+
+def _wait_until(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+def test_waiting_requests_are_released_in_priority_order():
+    limiter = _limiter(window=0.3)
+    limiter.reserve(URL)
+    order = []
+
+    def request(priority: str):
+        with scheduling(priority):
+            limiter.reserve(URL, wait=True, timeout=5)
+        order.append(priority)
+
+    # Queued lowest priority first
+    threads = []
+    for priority in ("batch", "normal", "interactive"):
+        threads.append(threading.Thread(target=request, args=(priority,)))
+        threads[-1].start()
+        _wait_until(lambda: _queued(limiter) == len(threads))
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert order == ["interactive", "normal", "batch"]
+    assert limiter.get_stats()['scheduler']['dispatched'] == {"interactive": 1, "normal": 1, "batch": 1}
+
+
+def test_saturated_category_does_not_hold_up_others():
+    limiter = _limiter(window=0.5)
+    limiter.reserve(URL)
+
+    def request():
+        with scheduling("interactive"):
+            limiter.reserve(URL, wait=True, timeout=5)
+
+    waiter = threading.Thread(target=request)
+    waiter.start()
+    _wait_until(lambda: _queued(limiter) == 1)
+
+    # The interactive waiter's category has no room, so a batch search goes ahead
+    with scheduling("batch"):
+        limiter.reserve(SEARCH_URL)
+    assert _queued(limiter) == 1
+    waiter.join(timeout=5)
+    assert limiter.get_stats()['scheduler']['dispatched'] == {"interactive": 1}
+
+
+def test_wait_times_out_and_leaves_the_queue():
+    limiter = _limiter(window=60)
+    limiter.reserve(URL)
+    started = time.monotonic()
+    with pytest.raises(RateLimitExceeded) as excinfo:
+        limiter.reserve(URL, wait=True, timeout=0.1)
+
+    # The slot opens long after the deadline, so it gives up without sleeping
+    assert time.monotonic() - started < 0.1
+    assert excinfo.value.retry_after is not None and excinfo.value.retry_after > 50
+    assert _queued(limiter) == 0
+
+
+def test_async_wait_times_out_and_leaves_the_queue():
+    limiter = _limiter(window=60)
+    limiter.reserve(URL)
+    with pytest.raises(RateLimitExceeded):
+        asyncio.run(limiter.reserve_async(URL, wait=True, timeout=0.1))
+    assert _queued(limiter) == 0
+
+
+def test_wait_gives_up_at_the_deadline():
+    limiter = _limiter(window=0.5)
+    limiter.reserve(URL)
+
+    def request():
+        with scheduling("interactive"):
+            limiter.reserve(URL, wait=True, timeout=5)
+
+    # A higher-priority waiter takes the next slot, so this one runs out its whole timeout
+    holder = threading.Thread(target=request)
+    holder.start()
+    _wait_until(lambda: _queued(limiter) == 1)
+
+    started = time.monotonic()
+    with scheduling("batch"), pytest.raises(RateLimitExceeded):
+        limiter.reserve(URL, wait=True, timeout=0.2)
+    assert 0.15 < time.monotonic() - started < 0.5
+    holder.join(timeout=5)
@@ -0,0 +1,64 @@
+"""Cross-process accounting of the SQLite-backed 'shared' limiter engine."""
+
+import multiprocessing
+
+import pytest
+
+from earth2_api_wrapper.limiter_engines import SharedEngine
+from earth2_api_wrapper.rate_limiter import RateLimitExceeded, RateLimiter
+
+URL = "https://r.earth2.io/landfields/00000000-0000-0000-0000-000000000000"
+BURST_LIMIT = 100
+PROCESSES = 8
+ATTEMPTS = 40
+
+
+def _shared_limiter(path: str) -> RateLimiter:
+    limiter = RateLimiter(engine=SharedEngine(path))
+    # A long burst window: no slot refills while the test runs
+    limiter._burst_limit = BURST_LIMIT
+    limiter._burst_window = 1000
+    limiter._global_limit = 1000
+    limiter._endpoint_limits = {category: 1000 for category in limiter._endpoint_limits}
+    return limiter
+
+
+def _reserve_all(path: str, barrier, results):
+    limiter = _shared_limiter(path)
+    barrier.wait()
+    granted = 0
+    for _ in range(ATTEMPTS):
+        try:
+            limiter.reserve(URL)
+            granted += 1
+        except RateLimitExceeded:
+            pass
+    results.put(granted)
+
+
+@pytest.mark.skipif("fork" not in multiprocessing.get_all_start_methods(), reason="needs fork()")
+def test_reservations_never_exceed_limit_across_processes(tmp_path):
+    path = str(tmp_path / "ratelimit.sqlite3")
+    SharedEngine(path)._db()  # Create the schema before the processes race for it
+    context = multiprocessing.get_context("fork")
+    barrier = context.Barrier(PROCESSES)
+    results = context.Queue()
+    processes = [context.Process(target=_reserve_all, args=(path, barrier, results)) for _ in range(PROCESSES)]
+    for process in processes:
+        process.start()
+    granted = sum(results.get(timeout=30) for _ in processes)
+    for process in processes:
+        process.join(timeout=30)
+
+    assert granted == BURST_LIMIT
+
+
+def test_release_returns_slot_to_other_processes(tmp_path):
+    path = str(tmp_path / "ratelimit.sqlite3")
+    first, second = _shared_limiter(path), _shared_limiter(path)
+    reservations = [first.reserve(URL) for _ in range(BURST_LIMIT)]
+    with pytest.raises(RateLimitExceeded):
+        second.reserve(URL)
+
+    first.release(reservations[-1])
+    second.reserve(URL)
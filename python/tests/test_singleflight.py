@@ -0,0 +1,132 @@
+"""Coalescing of identical in-flight requests, including how errors are shared (offline, via httpx.MockTransport)."""
+
+import asyncio
+import threading
+import time
+
+import httpx
+
+from earth2_api_wrapper.async_client import AsyncEarth2Client
+from earth2_api_wrapper.client import Earth2Client
+from earth2_api_wrapper.rate_limiter import RateLimiter
+from earth2_api_wrapper.retry import RetryPolicy
+
+PROPERTY_ID = "00000000-0000-0000-0000-000000000000"
+URL = f"https://r.earth2.io/landfields/{PROPERTY_ID}"
+FOLLOWERS = 4
+
+
+def _wait_until(condition, timeout: float = 5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "timed out"
+        time.sleep(0.005)
+
+
+class _GatedHandler:
+    """MockTransport handler that holds the first request until released, then answers with `first`."""
+
+    def __init__(self, first: httpx.Response):
+        self.first = first
+        self.calls = 0
+        self.entered = threading.Event()
+        self.release = threading.Event()
+
+    def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.calls += 1
+        if self.calls > 1:
+            return httpx.Response(200, json={"id": PROPERTY_ID})
+        self.entered.set()
+        self.release.wait(5)
+        return self.first
+
+
+def _client(handler, **kwargs) -> Earth2Client:
+    return Earth2Client(
+        client=httpx.Client(transport=httpx.MockTransport(handler)),
+        rate_limiter=RateLimiter(),
+        # One attempt, and no category-wide backoff after a failure
+        retry_policy=RetryPolicy(max_attempts=1),
+        **kwargs
+    )
+
+
+def test_followers_share_the_leaders_error():
+    handler = _GatedHandler(httpx.Response(500))
+    client = _client(handler)
+    outcomes = []
+
+    def fetch():
+        try:
+            outcomes.append(client.get_property(PROPERTY_ID))
+        except Exception as error:
+            outcomes.append(error)
+
+    threads = [threading.Thread(target=fetch) for _ in range(FOLLOWERS + 1)]
+    threads[0].start()
+    assert handler.entered.wait(5)
+    for thread in threads[1:]:
+        thread.start()
+    _wait_until(lambda: client._single_flight is not None and client._single_flight.shared == FOLLOWERS)
+    handler.release.set()
+    for thread in threads:
+        thread.join(timeout=5)
+
+    assert handler.calls == 1
+    assert len(outcomes) == FOLLOWERS + 1
+    assert all(isinstance(outcome, httpx.HTTPStatusError) for outcome in outcomes)
+    assert client.get_rate_limit_stats()['coalesced_requests'] == FOLLOWERS
+    # The key is forgotten once the call fails, so the next call fetches again
+    assert client.get_property(PROPERTY_ID) == {"id": PROPERTY_ID}
+    assert handler.calls == 2
+
+
+def test_waiting_call_does_not_share_a_non_waiting_flight():
+    handler = _GatedHandler(httpx.Response(429))
+    client = _client(handler)
+    outcomes = {}
+
+    def fetch(wait: bool):
+        try:
+            outcomes[wait] = client._get_json(URL, wait=wait)
+        except Exception as error:
+            outcomes[wait] = error
+
+    leader = threading.Thread(target=fetch, args=(False,))
+    leader.start()
+    assert handler.entered.wait(5)
+    # Joining the held non-waiting flight would block until it is released
+    fetch(True)
+    handler.release.set()
+    leader.join(timeout=5)
+
+    # The waiting call ran its own request instead of receiving the leader's 429
+    assert outcomes[True] == {"id": PROPERTY_ID}
+    assert isinstance(outcomes[False], httpx.HTTPStatusError)
+    assert handler.calls == 2
+    assert client._single_flight is not None and client._single_flight.shared == 0
+
+
+def test_async_followers_share_the_leaders_error():
+    calls = 0
+
+    async def handler(request: httpx.Request) -> httpx.Response:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.05)
+        return httpx.Response(503)
+
+    async def run():
+        client = AsyncEarth2Client(
+            client=httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+            rate_limiter=RateLimiter(),
+            retry_policy=RetryPolicy(max_attempts=1),
+        )
+        async with client:
+            return await asyncio.gather(
+                *(client.get_property(PROPERTY_ID) for _ in range(FOLLOWERS + 1)), return_exceptions=True
+            )
+
+    outcomes = asyncio.run(run())
+    assert calls == 1
+    assert all(isinstance(outcome, httpx.HTTPStatusError) for outcome in outcomes)
@@ -0,0 +1,72 @@
+"""Connection settings, shared transports and environment proxies."""
+
+import httpcore
+import httpx
+
+from earth2_api_wrapper.client import Earth2Client
+from earth2_api_wrapper.transport import ConnectionSettings, shared_transport
+
+EARTH2_URL = httpx.URL("https://r.earth2.io/landing/metrics")
+
+
+def _pool(client: httpx.Client, url: httpx.URL = EARTH2_URL):
+    transport = client._transport_for_url(url)
+    return getattr(transport, "transport", transport)._pool
+
+
+def test_client_uses_the_configured_limits_and_timeouts():
+    settings = ConnectionSettings(max_connections=12, keepalive_per_host=2, connect_timeout=3.0, read_timeout=4.0)
+    with settings.create_client() as client:
+        assert client.timeout.connect == 3.0 and client.timeout.read == 4.0
+        pool = _pool(client)
+        assert pool._max_connections == 12
+        assert pool._max_keepalive_connections == 8
+
+
+def test_default_connect_timeout():
+    with ConnectionSettings().create_client() as client:
+        assert client.timeout.connect == 10.0
+        assert client.timeout.read == 30.0
+
+
+def test_environment_proxies_are_honoured(monkeypatch):
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example:3128")
+    monkeypatch.setenv("NO_PROXY", "resources.earth2.io")
+    settings = ConnectionSettings()
+    for client in (settings.create_client(), settings.create_client(shared_transport(settings))):
+        with client:
+            assert isinstance(_pool(client), httpcore.HTTPProxy)
+            assert not isinstance(_pool(client, httpx.URL("https://resources.earth2.io/v1")), httpcore.HTTPProxy)
+
+
+def test_async_client_honours_environment_proxies(monkeypatch):
+    monkeypatch.setenv("HTTPS_PROXY", "http://proxy.example:3128")
+    client = ConnectionSettings().create_async_client()
+    assert isinstance(client._transport_for_url(EARTH2_URL)._pool, httpcore.AsyncHTTPProxy)
+
+
+def test_no_proxy_without_environment(monkeypatch):
+    for name in ("HTTP_PROXY", "HTTPS_PROXY", "ALL_PROXY", "http_proxy", "https_proxy", "all_proxy"):
+        monkeypatch.delenv(name, raising=False)
+    with ConnectionSettings().create_client() as client:
+        assert isinstance(_pool(client), httpcore.ConnectionPool)
+
+
+def test_shared_connections_outlive_a_closed_client():
+    settings = ConnectionSettings(max_connections=3)
+    first = Earth2Client(connection=settings, share_connections=True)
+    second = Earth2Client(connection=settings, share_connections=True)
+    assert first._client._transport is second._client._transport
+    assert first._client._transport is shared_transport(settings)
+
+    first.close()
+    # The pool behind the shared transport is still usable by the other client
+    assert not second._client.is_closed
+    assert shared_transport(settings) is second._client._transport
+    second.close()
+
+
+def test_separate_clients_get_separate_pools():
+    first, second = Earth2Client(), Earth2Client()
+    with first, second:
+        assert first._client._transport is not second._client._transport